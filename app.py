@@ -2,6 +2,10 @@ from src import app
 from os import environ
 
 if __name__ == '__main__':
+    # 科目カタログを読み込み、全ての組み合わせの時間割結果を事前に構築する
+    from src.views.main import warm_result_cache
+    warm_result_cache()
+
     app.run(
         host='0.0.0.0',
         port=int(environ.get('PORT', 8080)),
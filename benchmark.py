@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""
+時間割構築のベンチマーク（合成カタログ）
+Timetable Builder Benchmark with a Synthetic Catalog
+
+データベースを使わずに合成した科目カタログで build_timetable_result を実行し、
+科目数に対して処理時間が線形に増えることを確認する。
+
+使い方:
+    python benchmark.py [最大科目数]   (既定: 5000)
+"""
+
+import random
+import sys
+import time
+
+from src.catalog import CourseRecord, build_catalog, set_catalog
+from src.conflicts import get_quarter_mask, get_slot_mask
+from src.translations.field_values import CourseCategoryEnum, MajorEnum, OfferingCategoryEnum
+
+# ベンチマーク対象のセメスタと組み合わせ
+SEMESTER = 5
+MAJOR1_ID = MajorEnum.IS
+MAJOR2_ID = MajorEnum.NC
+
+# 1つの科目数あたりの計測回数
+REPEAT = 5
+
+
+def build_synthetic_records(course_count, seed=0):
+    """
+    合成した科目レコードのリストを作成する
+
+    同名の科目・複数メジャーに所属する科目（共有科目）・集中講義を一定の割合で含める。
+
+    Args:
+        course_count: 科目数
+        seed: 乱数のシード
+
+    Returns:
+        list: CourseRecordのリスト（時間割コード順）
+    """
+    rng = random.Random(seed)
+    major_ids = list(MajorEnum)
+    category_ids = list(CourseCategoryEnum)
+    offering_category_ids = list(OfferingCategoryEnum)
+
+    records = []
+    for index in range(course_count):
+        # 約1割は集中講義（曜日・時限なし）
+        if rng.random() < 0.1:
+            schedules = ()
+        else:
+            schedules = tuple(
+                (rng.randint(1, 5), rng.randint(1, 6)) for _ in range(rng.randint(1, 2))
+            )
+
+        # 約2割は2つのメジャーに所属
+        majors = rng.sample(major_ids, 2 if rng.random() < 0.2 else 1)
+        offering_category_id = rng.choice(offering_category_ids)
+
+        records.append(CourseRecord(
+            timetable_code=f"B{index:07d}",
+            # 科目名は重複させる（同名科目の処理を含めるため）
+            course_title=f"科目{index % max(course_count // 3, 1)}",
+            credits=rng.choice([1, 2, 2, 4]),
+            syllabus_url='',
+            offering_category_id=offering_category_id,
+            instructor_name='教員',
+            classroom_name='教室',
+            class_format_name='',
+            course_type_name='',
+            schedules=schedules,
+            semesters=(SEMESTER,),
+            course_categories=tuple((major_id, rng.choice(category_ids)) for major_id in majors),
+            slot_mask=get_slot_mask(schedules),
+            quarter_mask=get_quarter_mask(offering_category_id),
+        ))
+
+    return records
+
+
+def measure(course_count):
+    """
+    指定した科目数の合成カタログで build_timetable_result の実行時間を計測する
+
+    Args:
+        course_count: 科目数
+
+    Returns:
+        float: 1回あたりの実行時間（秒、最小値）
+    """
+    from src.views.main import build_timetable_result
+
+    set_catalog(build_catalog(build_synthetic_records(course_count)))
+
+    timings = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        build_timetable_result(SEMESTER, MAJOR1_ID, MAJOR2_ID)
+        timings.append(time.perf_counter() - start)
+
+    return min(timings)
+
+
+def main():
+    max_course_count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+
+    # 科目数を倍々に増やして計測
+    course_counts = []
+    course_count = max_course_count
+    while course_count >= 500 and len(course_counts) < 4:
+        course_counts.insert(0, course_count)
+        course_count //= 2
+
+    print(f"{'科目数':>8} {'時間(ms)':>10} {'科目あたり(µs)':>16}")
+    for course_count in course_counts:
+        elapsed = measure(course_count)
+        print(f"{course_count:>8} {elapsed * 1000:>10.2f} {elapsed / course_count * 1e6:>16.2f}")
+
+    set_catalog(None)
+
+
+if __name__ == '__main__':
+    main()
@@ -9,6 +9,7 @@ Development Files and Folders Cleanup Script
 - docs/extracted/ (抽出済みCSVフォルダ)
 - modeltimetable.db (データベースファイル)
 - migrations/ (マイグレーションフォルダ)
+- docs/export_jobs/ (一括出力ジョブの状態と成果物)
 """
 
 import os
@@ -73,6 +74,7 @@ def main():
     print("  - docs/extracted/    (抽出済みCSVフォルダ)")
     print("  - modeltimetable.db  (データベースファイル)")
     print("  - migrations/        (マイグレーションフォルダ)")
+    print("  - docs/export_jobs/  (一括出力ジョブの状態と成果物)")
     print()
 
     print("\n" + "=" * 70)
@@ -86,6 +88,7 @@ def main():
         ("folder", "docs/extracted"),
         ("file", "src/modeltimetable.db"),
         ("folder", "migrations"),
+        ("folder", "docs/export_jobs"),
     ]
 
     # 削除実行
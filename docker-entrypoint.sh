@@ -11,4 +11,4 @@ python setup.py
 
 python example.py
 
-exec python app.py
\ No newline at end of file
+exec gunicorn -c gunicorn.conf.py
\ No newline at end of file
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""
+gunicornの設定
+Gunicorn Configuration
+
+ワーカー数・スレッド数などは環境変数で変更できる。
+"""
+
+import os
+
+# 待ち受けアドレス
+bind = f"{os.environ.get('FLASK_HOST', '0.0.0.0')}:{os.environ.get('PORT', 8080)}"
+
+# アプリケーション（マスタープロセスで読み込み、フォーク前にキャッシュを構築する）
+wsgi_app = 'wsgi:app'
+preload_app = True
+
+# ワーカーはデータベースを読み取り専用で開く（既定で有効）
+# SQLITE_IN_MEMORYが有効な場合は、ワーカーごとにデータベースをメモリ上にコピーして使う（既定で無効）
+# サーバーのプロセスにのみ設定するため、セットアップ・マイグレーションは書き込み可能な接続を使う
+raw_env = [
+    f"SERVING_SQLITE_READ_ONLY={os.environ.get('SQLITE_READ_ONLY', 'True')}",
+    f"SERVING_SQLITE_IN_MEMORY={os.environ.get('SQLITE_IN_MEMORY', 'False')}",
+]
+
+# ワーカープロセス数（既定: CPUコア数）とワーカーあたりのスレッド数
+workers = int(os.environ.get('WEB_CONCURRENCY', os.cpu_count() or 1))
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+
+# タイムアウト（秒、一括出力などの長いリクエストを考慮）
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+
+# 一定数のリクエストごとにワーカーを再起動する（0の場合は再起動しない）
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 0))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 0))
+
+# ログ（標準出力・標準エラー出力）
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG', '-')
+errorlog = '-'
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
+
+
+def post_fork(server, worker):
+    """
+    フォーク後、マスタープロセスから引き継いだデータベース接続を使わないようにする
+    （SQLITE_IN_MEMORYが有効な場合は、ワーカーごとにデータベースをメモリ上にコピーする）
+    """
+    from src import app, db, memory_database
+
+    with app.app_context():
+        db.engine.dispose(close=False)
+
+    if memory_database is not None:
+        memory_database.load()
@@ -4,7 +4,7 @@ Execute all setup tasks in the correct order
 """
 
 import sys
-from setup import seed, extractor, convert, insert
+from setup import seed, extractor, convert, insert, create_indexes
 from src.config import CSV_FILE, extract_year_from_filename
 
 
@@ -31,21 +31,25 @@ def main(csv_file=None):
 
     try:
         # Step 1: Seed master data
-        print("\n[1/4] Seeding master data...")
+        print("\n[1/5] Seeding master data...")
         seed()
 
         # Step 2: Extract CSV data
-        print("\n[2/4] Extracting CSV data...")
+        print("\n[2/5] Extracting CSV data...")
         extractor(csv_file)
 
         # Step 3: Convert CSV data
-        print("\n[3/4] Converting CSV data...")
+        print("\n[3/5] Converting CSV data...")
         convert()
 
         # Step 4: Insert CSV data
-        print("\n[4/4] Inserting CSV data...")
+        print("\n[4/5] Inserting CSV data...")
         insert()
 
+        # Step 5: Create indexes and check query plans
+        print("\n[5/5] Creating indexes...")
+        create_indexes()
+
         print("\n" + "=" * 60)
         print(f"Setup process completed successfully for {year_display}!")
         print("=" * 60)
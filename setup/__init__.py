@@ -6,10 +6,12 @@ from setup.seed_master_data import seed
 from setup.csv_extractor import extractor
 from setup.csv_converter import convert
 from setup.insert_csv_data import insert
+from setup.create_indexes import create_indexes
 
 __all__ = [
     'seed',
     'extractor',
     'convert',
     'insert',
+    'create_indexes',
 ]
\ No newline at end of file
@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+インデックスの作成と実行計画の確認スクリプト
+Create Indexes and Check Query Plans
+
+モデルに定義したインデックスを作成し（既存の場合はスキップ）、
+よく使うクエリがテーブル全体の走査にならないことを EXPLAIN QUERY PLAN で確認する。
+"""
+
+import sys
+from app import app
+from src import db
+from src.database import checkpoint_database
+
+
+# 確認するクエリ: (説明, SQL, パラメータ, 使われるべきインデックス名)
+QUERY_PLAN_CHECKS = [
+    (
+        '所属メジャー（メジャーID）',
+        'SELECT timetable_code, course_category_id FROM affiliated_major WHERE major_id = :major_id',
+        {'major_id': 1},
+        'ix_affiliated_major_major_id',
+    ),
+    (
+        '開講曜限（曜日・時限）',
+        'SELECT timetable_code FROM course_schedule WHERE day_id = :day_id AND period = :period',
+        {'day_id': 1, 'period': 1},
+        'ix_course_schedule_day_id_period',
+    ),
+    (
+        '科目（開講区分）',
+        'SELECT timetable_code FROM course WHERE offering_category_id = :offering_category_id',
+        {'offering_category_id': 1},
+        'ix_course_offering_category_id',
+    ),
+    (
+        '学年（時間割コード）',
+        'SELECT grade_name FROM grade_year WHERE timetable_code = :timetable_code',
+        {'timetable_code': ''},
+        'sqlite_autoindex_grade_year_1',
+    ),
+]
+
+
+def create_model_indexes() -> None:
+    """モデルに定義した全てのインデックスを作成する（既存の場合はスキップ）"""
+    print("インデックスを作成中...")
+    for table in db.metadata.sorted_tables:
+        for index in sorted(table.indexes, key=lambda index: index.name):
+            index.create(bind=db.engine, checkfirst=True)
+            print(f"  {index.name}")
+
+
+def explain_query_plan(sql: str, params: dict) -> list:
+    """
+    クエリの実行計画を取得する
+
+    Args:
+        sql: SQL
+        params: パラメータ
+
+    Returns:
+        list: 実行計画の各行の説明（detail列）
+    """
+    rows = db.session.execute(db.text(f"EXPLAIN QUERY PLAN {sql}"), params).all()
+    return [row[-1] for row in rows]
+
+
+def check_query_plans() -> list:
+    """
+    よく使うクエリが想定したインデックスを使うことを確認する
+
+    Returns:
+        list: 想定と異なる実行計画になったクエリの説明のリスト（空の場合は全て成功）
+    """
+    print("\n実行計画を確認中...")
+    failures = []
+    for description, sql, params, index_name in QUERY_PLAN_CHECKS:
+        plan = explain_query_plan(sql, params)
+        uses_index = any(index_name in detail for detail in plan)
+        full_scan = any(detail.startswith('SCAN') for detail in plan)
+
+        if uses_index and not full_scan:
+            print(f"  ✓ {description}: {' / '.join(plan)}")
+        else:
+            print(f"  ✗ {description}: {' / '.join(plan)}（想定: {index_name}）")
+            failures.append(description)
+    return failures
+
+
+def create_indexes():
+    """メイン処理"""
+    with app.app_context():
+        print("=" * 60)
+        print("インデックス作成開始")
+        print("=" * 60)
+
+        try:
+            create_model_indexes()
+
+            # 読み取り専用（immutable）で開くワーカーから参照できるよう、WALをデータベースファイルに書き戻す
+            checkpoint_database(db.engine)
+
+            failures = check_query_plans()
+            if failures:
+                raise RuntimeError(f"テーブル全体を走査するクエリがあります: {', '.join(failures)}")
+
+            print("\n" + "=" * 60)
+            print("✓ インデックス作成完了")
+            print("=" * 60)
+
+        except Exception as e:
+            print(f"\n✗ エラーが発生しました: {e}", file=sys.stderr)
+            raise
+
+
+if __name__ == "__main__":
+    try:
+        create_indexes()
+    except Exception:
+        sys.exit(1)
@@ -9,10 +9,15 @@ import sys
 import csv
 from app import app
 from src import db
+from src.database import checkpoint_database
+from src.query import calculate_semester
+from src.conflicts import get_quarter_mask, get_slot_mask, iter_slots
 from src.models import (
     Course,
     CourseSchedule,
     GradeYear,
+    CourseSemester,
+    CourseConflict,
     AffiliatedMajor,
     CourseClassroom,
     InstructorMaster,
@@ -170,6 +175,93 @@ def import_grade_years(csv_path: str) -> None:
     print(f"学年: {count}件追加")
 
 
+def build_course_semesters() -> None:
+    """
+    科目セメスタを学年と開講区分から再構築
+
+    学年の最小値と開講区分IDからセメスタを計算し、course_semesterテーブルに登録する。
+    派生データのため、既存の行は全て削除してから作り直す。
+    """
+    print("\n科目セメスタを構築中...")
+    CourseSemester.query.delete()
+
+    # 科目ごとに学年の最小値を集計
+    min_grades = {}
+    for grade in GradeYear.query.all():
+        grade_value = int(grade.grade_name)
+        current = min_grades.get(grade.timetable_code)
+        if current is None or grade_value < current:
+            min_grades[grade.timetable_code] = grade_value
+
+    count = 0
+    for course in Course.query.order_by(Course.timetable_code).all():
+        # 学年または開講区分がない科目はどのセメスタにも属さない
+        min_grade = min_grades.get(course.timetable_code)
+        if min_grade is None or course.offering_category_id is None:
+            continue
+
+        for semester in sorted(calculate_semester(min_grade, course.offering_category_id)):
+            course_semester = CourseSemester(
+                timetable_code=course.timetable_code,  # pyright: ignore[reportCallIssue]
+                semester=semester  # pyright: ignore[reportCallIssue]
+            )
+            db.session.add(course_semester)
+            count += 1
+
+    print(f"科目セメスタ: {count}件追加")
+
+
+def build_course_conflicts() -> None:
+    """
+    科目重複（同時履修不可の科目の組）をセメスタごとに再構築
+
+    同じセメスタの科目のうち、開講曜限とクォーターが共に重なる組を
+    course_conflictテーブルに登録する。重複の判定はメジャーの組み合わせに
+    依存しないため、インポート時に一度だけ計算する。
+    """
+    print("\n科目重複を構築中...")
+    CourseConflict.query.delete()
+
+    # 科目ごとの曜日・時限マスクとクォーターマスク
+    slot_masks = {}
+    quarter_masks = {}
+    for course in Course.query.all():
+        schedules = [(schedule.day_id, schedule.period) for schedule in course.schedules]
+        slot_masks[course.timetable_code] = get_slot_mask(schedules)
+        quarter_masks[course.timetable_code] = get_quarter_mask(course.offering_category_id)
+
+    # セメスタごとの科目
+    codes_by_semester = {}
+    for course_semester in CourseSemester.query.all():
+        codes_by_semester.setdefault(course_semester.semester, []).append(course_semester.timetable_code)
+
+    count = 0
+    for semester, codes in sorted(codes_by_semester.items()):
+        # 曜日・時限ごとに科目をまとめ、同じ曜日・時限の科目の組のクォーターを判定
+        codes_by_slot = {}
+        for code in sorted(codes):
+            for slot in iter_slots(slot_masks[code]):
+                codes_by_slot.setdefault(slot, []).append(code)
+
+        pairs = set()
+        for slot_codes in codes_by_slot.values():
+            for i, code1 in enumerate(slot_codes):
+                for code2 in slot_codes[i + 1:]:
+                    if quarter_masks[code1] & quarter_masks[code2]:
+                        pairs.add((code1, code2))
+
+        for code1, code2 in sorted(pairs):
+            conflict = CourseConflict(
+                semester=semester,  # pyright: ignore[reportCallIssue]
+                timetable_code1=code1,  # pyright: ignore[reportCallIssue]
+                timetable_code2=code2  # pyright: ignore[reportCallIssue]
+            )
+            db.session.add(conflict)
+            count += 1
+
+    print(f"科目重複: {count}件追加")
+
+
 def import_affiliated_majors(csv_path: str) -> None:
     """所属メジャーをインポート"""
     print("\n所属メジャーをインポート中...")
@@ -255,9 +347,16 @@ def insert():
             import_affiliated_majors(f'{converted_dir}/affiliated_major.csv')
             import_course_classrooms(f'{converted_dir}/course_classroom.csv')
 
+            # 派生テーブルを構築（科目・開講曜限・学年データ依存）
+            build_course_semesters()
+            build_course_conflicts()
+
             # コミット
             db.session.commit()
 
+            # 読み取り専用（immutable）で開くワーカーから参照できるよう、WALをデータベースファイルに書き戻す
+            checkpoint_database(db.engine)
+
             print("\n" + "=" * 60)
             print("✓ CSVデータインポート完了")
             print("=" * 60)
@@ -269,6 +368,8 @@ def insert():
             print(f"科目: {Course.query.count()}件")
             print(f"開講曜限: {CourseSchedule.query.count()}件")
             print(f"学年: {GradeYear.query.count()}件")
+            print(f"科目セメスタ: {CourseSemester.query.count()}件")
+            print(f"科目重複: {CourseConflict.query.count()}件")
             print(f"所属メジャー: {AffiliatedMajor.query.count()}件")
             print(f"科目教室: {CourseClassroom.query.count()}件")
 
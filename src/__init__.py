@@ -2,6 +2,8 @@ from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 import os
+from src.database import InMemoryDatabase, build_database_uri, register_sqlite_pragmas
+from src.solver import validate_objective
 
 
 dir_name = os.path.dirname(__file__)
@@ -15,6 +17,9 @@ app = Flask(
 )
 app.config.from_object('src.config')
 
+# 重複の自動解決の目的関数を検証（不正な場合は起動時にエラーにする）
+validate_objective(app.config['AUTO_RESOLVE_OBJECTIVE'])
+
 
 # データベースのインスタンスを作成
 db: SQLAlchemy = SQLAlchemy()
@@ -22,13 +27,30 @@ migrate: Migrate = Migrate()
 
 basedir = os.path.abspath(os.path.dirname(__file__))
 db_name = os.environ.get("FLASK_DB_NAME", "modeltimetable.db")
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///' + os.path.join(basedir, db_name)
+app.config['SQLALCHEMY_DATABASE_URI'] = build_database_uri(
+    os.path.join(basedir, db_name),
+    read_only=app.config['SQLITE_READ_ONLY'],
+    immutable=app.config['SQLITE_IMMUTABLE'],
+)
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
+# データベースをメモリ上にコピーして使う場合は、接続をコピーに向ける（読み取り専用）
+memory_database = None
+if app.config['SQLITE_IN_MEMORY']:
+    memory_database = InMemoryDatabase(os.path.join(basedir, db_name))
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {'creator': memory_database.connect}
+
 # データベースの初期化
 db.init_app(app)
 migrate.init_app(app, db)
 
+# 接続ごとにSQLiteのPRAGMAを適用
+with app.app_context():
+    register_sqlite_pragmas(
+        db.engine, app.config,
+        read_only=app.config['SQLITE_READ_ONLY'] or memory_database is not None,
+    )
+
 
 import src.views
 import src.models
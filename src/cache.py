@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+LRUキャッシュ
+LRU Cache with Bounded Memory
+"""
+
+import sys
+import threading
+from collections import OrderedDict
+
+
+def estimate_size(value) -> int:
+    """
+    オブジェクトのおおよそのメモリ使用量（バイト）を見積もる
+
+    辞書・リスト・タプル・セットは中身まで辿り、同じオブジェクトは1回だけ数える。
+
+    Args:
+        value: 対象のオブジェクト
+
+    Returns:
+        int: 概算バイト数
+    """
+    seen = set()
+    total = 0
+    stack = [value]
+
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+
+    return total
+
+
+class LRUCache:
+    """
+    エントリ数と概算バイト数で上限を設けたLRUキャッシュ
+
+    上限を超えた場合は最も長く参照されていないエントリから破棄する。
+    ヒット・ミス・破棄の回数を記録する。
+    """
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 32 * 1024 * 1024, sizeof=estimate_size):
+        """
+        Args:
+            max_entries: 最大エントリ数
+            max_bytes: 最大バイト数（概算）
+            sizeof: 値のバイト数を見積もる関数
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        """
+        キャッシュから値を取得（見つかった場合は最近使用したものとして扱う）
+
+        Args:
+            key: キー
+            default: 見つからない場合の値
+
+        Returns:
+            キャッシュされた値またはdefault
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value) -> None:
+        """
+        キャッシュに値を登録（上限を超える場合は古いエントリを破棄）
+
+        Args:
+            key: キー
+            value: 値
+        """
+        size = self._sizeof(value)
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+
+            # 1件で上限を超える値はキャッシュしない
+            if size > self.max_bytes or self.max_entries <= 0:
+                return
+
+            self._entries[key] = (value, size)
+            self._bytes += size
+
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """全てのエントリを破棄（統計は保持）"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        """
+        キャッシュの統計情報を取得
+
+        Returns:
+            dict: ヒット数・ミス数・破棄数・エントリ数・概算バイト数と上限
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+"""
+科目カタログ（読み取り専用のインメモリスナップショット）
+Course Catalog Snapshot
+
+データセットは年度CSVから生成され、デプロイ間で変化しないため、
+起動時に全科目と関連データを一度だけ読み込み、リクエスト処理では
+SQLAlchemyを経由せずにこのスナップショットを参照する。
+"""
+
+import hashlib
+import threading
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Optional, Tuple
+from src.conflicts import courses_conflict, get_quarter_mask, get_slot_mask
+
+
+@dataclass(frozen=True, slots=True)
+class CourseRecord:
+    """科目の読み取り専用レコード"""
+    timetable_code: str
+    course_title: str
+    credits: int
+    syllabus_url: str
+    offering_category_id: Optional[int]
+    instructor_name: str
+    classroom_name: str
+    class_format_name: str
+    course_type_name: str
+    # 開講曜限 ((曜日ID, 時限), ...)
+    schedules: Tuple[Tuple[int, int], ...]
+    # 該当するセメスタ
+    semesters: Tuple[int, ...]
+    # 所属メジャーごとの履修区分 ((メジャーID, 履修区分ID), ...)
+    course_categories: Tuple[Tuple[int, Optional[int]], ...]
+    # 曜日・時限マスク（30ビット）とクォーターマスク（4ビット）
+    slot_mask: int
+    quarter_mask: int
+
+    def get_course_category_id(self, major_id: int) -> Optional[int]:
+        """
+        指定メジャーにおける履修区分IDを取得
+
+        Args:
+            major_id: メジャーID
+
+        Returns:
+            履修区分ID（所属していない場合はNone）
+        """
+        for affiliated_major_id, course_category_id in self.course_categories:
+            if affiliated_major_id == major_id:
+                return course_category_id
+        return None
+
+
+@dataclass(frozen=True, slots=True)
+class Catalog:
+    """
+    科目カタログ
+
+    各辞書は構築後に変更しないこと（全リクエストで共有される）。
+    """
+    # データセットのバージョン（内容のハッシュ）
+    version: str
+    # 時間割コード → 科目
+    courses: Dict[str, CourseRecord]
+    # (セメスタ, メジャーID) → 科目（時間割コード順）
+    courses_by_semester_major: Dict[Tuple[int, int], Tuple[CourseRecord, ...]]
+    # (曜日ID, 時限) → 科目（時間割コード順）
+    courses_by_slot: Dict[Tuple[int, int], Tuple[CourseRecord, ...]]
+    # セメスタ → 時間割コード → 同時履修不可の科目の時間割コード（科目重複グラフ）
+    conflict_graph: Dict[int, Dict[str, FrozenSet[str]]]
+
+    def get_course(self, timetable_code: str) -> Optional[CourseRecord]:
+        """時間割コードから科目を取得"""
+        return self.courses.get(timetable_code)
+
+    def get_courses_by_semester_and_major(self, semester: int, major_id: int) -> Tuple[CourseRecord, ...]:
+        """セメスタとメジャーに該当する科目を取得"""
+        return self.courses_by_semester_major.get((semester, major_id), ())
+
+    def get_courses_by_slot(self, day_id: int, period: int) -> Tuple[CourseRecord, ...]:
+        """曜日・時限に開講される科目を取得"""
+        return self.courses_by_slot.get((day_id, period), ())
+
+    def get_conflicting_courses(self, semester: int, timetable_code: str) -> FrozenSet[str]:
+        """指定セメスタで同時履修不可の科目の時間割コードを取得"""
+        return self.conflict_graph.get(semester, {}).get(timetable_code, frozenset())
+
+    def courses_conflict(self, timetable_code1: str, timetable_code2: str) -> bool:
+        """2つの科目が同時履修不可かを判定（どちらかが存在しない場合はFalse）"""
+        course1 = self.courses.get(timetable_code1)
+        course2 = self.courses.get(timetable_code2)
+        if course1 is None or course2 is None:
+            return False
+        return courses_conflict(course1, course2)
+
+
+def build_course_record(course) -> CourseRecord:
+    """
+    科目オブジェクト（ORM）から読み取り専用レコードを作成
+
+    Args:
+        course: 科目オブジェクト
+
+    Returns:
+        CourseRecord
+    """
+    instructor_name = course.main_instructor.instructor_name if course.main_instructor else ''
+    if instructor_name and course.has_multiple_instructors == 1:
+        instructor_name += ' 他'
+
+    schedules = tuple((schedule.day_id, schedule.period) for schedule in course.schedules)
+
+    return CourseRecord(
+        timetable_code=course.timetable_code,
+        course_title=course.course_title,
+        credits=course.credits,
+        syllabus_url=course.syllabus_url or '',
+        offering_category_id=course.offering_category_id,
+        instructor_name=instructor_name,
+        classroom_name=', '.join(cc.classroom.classroom_name for cc in course.course_classrooms),
+        class_format_name=course.class_format.class_format_name if course.class_format else '',
+        course_type_name=course.course_type.course_type_name if course.course_type else '',
+        schedules=schedules,
+        semesters=tuple(sorted(cs.semester for cs in course.semesters)),
+        course_categories=tuple(
+            (affiliated.major_id, affiliated.course_category_id)
+            for affiliated in course.affiliated_majors
+        ),
+        slot_mask=get_slot_mask(schedules),
+        quarter_mask=get_quarter_mask(course.offering_category_id),
+    )
+
+
+def build_catalog(records, course_conflicts=()) -> Catalog:
+    """
+    科目レコードのリストからカタログを構築
+
+    Args:
+        records: CourseRecordのリスト（時間割コード順）
+        course_conflicts: (セメスタ, 時間割コード1, 時間割コード2) のリスト
+
+    Returns:
+        Catalog
+    """
+    courses = {}
+    by_semester_major = {}
+    by_slot = {}
+
+    for record in records:
+        courses[record.timetable_code] = record
+
+        for semester in record.semesters:
+            for major_id, _ in record.course_categories:
+                by_semester_major.setdefault((semester, major_id), []).append(record)
+
+        for slot in dict.fromkeys(record.schedules):
+            by_slot.setdefault(slot, []).append(record)
+
+    conflict_graph = {}
+    for semester, code1, code2 in course_conflicts:
+        adjacency = conflict_graph.setdefault(semester, {})
+        adjacency.setdefault(code1, set()).add(code2)
+        adjacency.setdefault(code2, set()).add(code1)
+
+    # 内容からバージョンを算出（データセットが変われば変化する）
+    digest = hashlib.sha256()
+    for record in records:
+        digest.update(repr(record).encode('utf-8'))
+
+    return Catalog(
+        version=digest.hexdigest()[:16],
+        courses=courses,
+        courses_by_semester_major={key: tuple(value) for key, value in by_semester_major.items()},
+        courses_by_slot={key: tuple(value) for key, value in by_slot.items()},
+        conflict_graph={
+            semester: {code: frozenset(others) for code, others in adjacency.items()}
+            for semester, adjacency in conflict_graph.items()
+        },
+    )
+
+
+def load_catalog() -> Catalog:
+    """
+    データベースから全科目を読み込み、カタログを構築する
+
+    Returns:
+        Catalog
+    """
+    from sqlalchemy.orm import selectinload
+    from src import app
+    from src.models import Course, CourseClassroom, CourseConflict
+
+    with app.app_context():
+        courses = Course.query.options(
+            selectinload(Course.schedules),
+            selectinload(Course.semesters),
+            selectinload(Course.affiliated_majors),
+            selectinload(Course.course_classrooms).selectinload(CourseClassroom.classroom),
+            selectinload(Course.main_instructor),
+            selectinload(Course.class_format),
+            selectinload(Course.course_type),
+        ).order_by(Course.timetable_code).all()
+
+        records = [build_course_record(course) for course in courses]
+        course_conflicts = [
+            (conflict.semester, conflict.timetable_code1, conflict.timetable_code2)
+            for conflict in CourseConflict.query.all()
+        ]
+
+    return build_catalog(records, course_conflicts)
+
+
+_catalog: Optional[Catalog] = None
+_catalog_lock = threading.Lock()
+
+
+def get_catalog() -> Catalog:
+    """
+    カタログを取得（未読み込みの場合はデータベースから読み込む）
+
+    Returns:
+        Catalog
+    """
+    global _catalog
+    if _catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                _catalog = load_catalog()
+    return _catalog
+
+
+def set_catalog(catalog: Optional[Catalog]) -> None:
+    """
+    カタログを差し替える（Noneの場合は次回参照時に再読み込み）
+
+    Args:
+        catalog: 新しいカタログ
+    """
+    global _catalog
+    with _catalog_lock:
+        _catalog = catalog
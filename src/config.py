@@ -4,6 +4,15 @@ import re
 
 
 DEFAULT_THEME_NAME = "light"
+
+# 選択できるテーマ（daisyUIのテーマ名）
+AVAILABLE_THEMES = [
+    "light", "dark", "dim", "cupcake", "bumblebee",
+    "emerald", "corporate", "synthwave", "retro", "cyberpunk", "valentine",
+    "halloween", "garden", "forest", "aqua", "lofi", "pastel", "fantasy",
+    "wireframe", "black", "luxury", "dracula", "cmyk", "autumn", "business", "acid",
+    "lemonade", "night", "coffee", "winter",
+]
 DEFAULT_LANGUAGE = "ja"
 
 
@@ -15,6 +24,67 @@ SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-secret-key-change-in-productio
 # デバッグモード設定（環境変数から取得、デフォルトはFalse）
 DEBUG = os.environ.get('DEBUG', 'False').lower() in ('true', '1', 'yes')
 
+# 時間割結果キャッシュ（除外する科目を指定した結果）の上限
+RESULT_CACHE_MAX_ENTRIES = int(os.environ.get('RESULT_CACHE_MAX_ENTRIES', 512))
+RESULT_CACHE_MAX_BYTES = int(os.environ.get('RESULT_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+
+# 時間割API（/api/v1/timetable）のシリアライズ済みペイロードのキャッシュの上限
+API_PAYLOAD_CACHE_MAX_ENTRIES = int(os.environ.get('API_PAYLOAD_CACHE_MAX_ENTRIES', 256))
+API_PAYLOAD_CACHE_MAX_BYTES = int(os.environ.get('API_PAYLOAD_CACHE_MAX_BYTES', 16 * 1024 * 1024))
+
+# 時間割の一括API（/api/v1/timetables:batch）の1回あたりの最大件数
+API_BATCH_MAX_ITEMS = int(os.environ.get('API_BATCH_MAX_ITEMS', 100))
+
+# SQLiteの接続設定
+# SQLITE_READ_ONLY: データベースを読み取り専用（mode=ro）で開く（サーバーのワーカー用）
+#   gunicorn.conf.py がワーカー用に SERVING_SQLITE_READ_ONLY を設定する。セットアップ・マイグレーションでは
+#   設定されないため、常に書き込み可能な接続を使う（環境変数 SQLITE_READ_ONLY は gunicorn.conf.py のみが参照する）
+# SQLITE_IMMUTABLE: 読み取り専用の場合に immutable=1 で開く（実行中にデータベースを更新しない場合のみ）
+SQLITE_READ_ONLY = os.environ.get('SERVING_SQLITE_READ_ONLY', 'False').lower() in ('true', '1', 'yes')
+SQLITE_IMMUTABLE = os.environ.get('SQLITE_IMMUTABLE', 'True').lower() in ('true', '1', 'yes')
+SQLITE_JOURNAL_MODE = os.environ.get('SQLITE_JOURNAL_MODE', 'WAL')
+SQLITE_MMAP_SIZE = int(os.environ.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))
+# 負の値はKiB単位（-65536 = 64MiB）
+SQLITE_CACHE_SIZE = int(os.environ.get('SQLITE_CACHE_SIZE', -65536))
+SQLITE_TEMP_STORE = os.environ.get('SQLITE_TEMP_STORE', 'MEMORY')
+# SQLITE_IN_MEMORY: ワーカーの起動時にデータベースをメモリ上にコピーし、以降はコピーを読み取り専用で使う
+#   SQLITE_READ_ONLY と同様に、gunicorn.conf.py がワーカー用に SERVING_SQLITE_IN_MEMORY を設定する
+SQLITE_IN_MEMORY = os.environ.get('SERVING_SQLITE_IN_MEMORY', 'False').lower() in ('true', '1', 'yes')
+
+# 重複の自動解決（/result?auto_resolve=1）の目的関数（優先順、カンマ区切り）
+# required: 必修・必履修の単位数, credits: 単位数, major1: 第一メジャーの科目数
+AUTO_RESOLVE_OBJECTIVE = tuple(
+    name.strip()
+    for name in os.environ.get('AUTO_RESOLVE_OBJECTIVE', 'required,credits,major1').split(',')
+    if name.strip()
+)
+
+# 重複のない時間割の候補（/alternatives）の1ページあたりの件数（既定値と上限）
+ALTERNATIVES_DEFAULT_LIMIT = int(os.environ.get('ALTERNATIVES_DEFAULT_LIMIT', 20))
+ALTERNATIVES_MAX_LIMIT = int(os.environ.get('ALTERNATIVES_MAX_LIMIT', 100))
+
+# 時間割の一括出力（/export-timetables）のワーカープロセス数（既定は1で逐次出力、2以上で並列出力）
+EXPORT_WORKERS = int(os.environ.get('EXPORT_WORKERS', 1))
+
+# 一括出力ジョブ（/export-jobs）の同時実行数・実行待ちの上限・状態の保存先
+EXPORT_JOB_WORKERS = int(os.environ.get('EXPORT_JOB_WORKERS', 1))
+EXPORT_JOB_MAX_PENDING = int(os.environ.get('EXPORT_JOB_MAX_PENDING', 4))
+EXPORT_JOB_DIR = os.environ.get('EXPORT_JOB_DIR', 'docs/export_jobs')
+# 完了したジョブ（状態ファイルと成果物）の保持数と保持期間（秒）。超えたものはジョブの登録時に削除する
+EXPORT_JOB_MAX_FINISHED = int(os.environ.get('EXPORT_JOB_MAX_FINISHED', 20))
+EXPORT_JOB_MAX_AGE = int(os.environ.get('EXPORT_JOB_MAX_AGE', 7 * 24 * 60 * 60))
+
+# 重複ログ（/result で検出した重複情報のJSONL、検証用）
+CONFLICT_LOG_ENABLED = os.environ.get('CONFLICT_LOG_ENABLED', 'True').lower() in ('true', '1', 'yes')
+CONFLICT_LOG_PATH = os.environ.get('CONFLICT_LOG_PATH', 'docs/conflicts/conflicts.jsonl')
+CONFLICT_LOG_MAX_BYTES = int(os.environ.get('CONFLICT_LOG_MAX_BYTES', 10 * 1024 * 1024))
+CONFLICT_LOG_BACKUP_COUNT = int(os.environ.get('CONFLICT_LOG_BACKUP_COUNT', 5))
+CONFLICT_LOG_BATCH_SIZE = int(os.environ.get('CONFLICT_LOG_BATCH_SIZE', 100))
+CONFLICT_LOG_FLUSH_INTERVAL = float(os.environ.get('CONFLICT_LOG_FLUSH_INTERVAL', 1.0))
+
+# 言語・テーマの設定を保存するクッキーの有効期間（秒）
+PREFERENCE_COOKIE_MAX_AGE = int(os.environ.get('PREFERENCE_COOKIE_MAX_AGE', 365 * 24 * 60 * 60))
+
 # 言語設定
 SUPPORTED_LANGUAGES = {
     "ja": "日本語",
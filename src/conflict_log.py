@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+"""
+時間割の重複ログ（検証用）
+Buffered Conflict Log
+
+/result で検出した重複情報をJSONL形式のファイルに追記する。
+リクエスト処理ではキューに積むだけとし、バックグラウンドのスレッドが
+まとめて書き込む。ファイルが上限サイズを超えた場合はローテーションする。
+"""
+
+import atexit
+import json
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows（複数プロセスからの書き込みは排他制御しない）
+    fcntl = None
+
+
+class ConflictLogWriter:
+    """
+    重複ログの書き込み
+
+    記録はキューに積み、バックグラウンドのスレッドが一定件数または一定時間ごとに
+    まとめてファイルに追記する。キューが一杯の場合、記録は破棄する（リクエストを待たせない）。
+    """
+
+    def __init__(self, path, max_bytes: int = 10 * 1024 * 1024, backup_count: int = 5,
+                 batch_size: int = 100, flush_interval: float = 1.0, max_queue: int = 10000):
+        """
+        Args:
+            path: ログファイルのパス
+            max_bytes: ローテーションするファイルサイズ（0以下の場合はローテーションしない）
+            backup_count: 保持する古いログファイルの数
+            batch_size: 1回にまとめて書き込む最大件数
+            flush_interval: 書き込みまでの最大待ち時間（秒）
+            max_queue: キューに積める最大件数
+        """
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        self.written = 0
+        self.dropped = 0
+
+    def _ensure_thread(self) -> None:
+        """書き込みスレッドを起動する（fork後のプロセスでは起動し直す）"""
+        if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or self._pid != os.getpid() or not self._thread.is_alive():
+                self._pid = os.getpid()
+                self._thread = threading.Thread(target=self._run, name='conflict-log-writer', daemon=True)
+                self._thread.start()
+
+    def write(self, record: dict) -> bool:
+        """
+        記録をキューに積む（書き込みはバックグラウンドで行う）
+
+        Args:
+            record: 記録する内容（JSONに変換できる辞書）
+
+        Returns:
+            bool: キューに積めた場合はTrue（キューが一杯の場合はFalse）
+        """
+        self._ensure_thread()
+        try:
+            self._queue.put_nowait(record)
+            return True
+        except queue.Full:
+            # gthreadワーカーでは複数のリクエストスレッドから呼ばれるため、ロックを取得して数える
+            with self._lock:
+                self.dropped += 1
+            return False
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """
+        キューに積まれた記録が全て書き込まれるまで待つ
+
+        Args:
+            timeout: 最大待ち時間（秒、Noneの場合は無制限）
+        """
+        if self._thread is None or self._pid != os.getpid():
+            return
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return
+        done.wait(timeout)
+
+    def _run(self) -> None:
+        """キューから記録を取り出し、まとめて書き込む（書き込みスレッド）"""
+        while True:
+            batch = [self._queue.get()]
+            # 最初の記録から一定時間以内に届いた記録をまとめる（flushの要求が来たら直ちに書き込む）
+            deadline = time.monotonic() + self.flush_interval
+            try:
+                while len(batch) < self.batch_size and not isinstance(batch[-1], threading.Event):
+                    batch.append(self._queue.get(timeout=max(deadline - time.monotonic(), 0)))
+            except queue.Empty:
+                pass
+
+            records = [item for item in batch if not isinstance(item, threading.Event)]
+            if records:
+                try:
+                    self._write_batch(records)
+                except OSError as e:
+                    print(f"重複ログの書き込みに失敗しました: {e}")
+
+            for item in batch:
+                if isinstance(item, threading.Event):
+                    item.set()
+
+    def _write_batch(self, records) -> None:
+        """
+        記録をまとめてファイルに追記する
+
+        gunicornの各ワーカーが同じファイルに書き込むため、サイズの確認・ローテーション・追記は
+        ロックファイル（conflicts.jsonl.lock）の排他ロックを取得して行う。
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = ''.join(json.dumps(record, ensure_ascii=False) + '\n' for record in records)
+
+        with open(self.path.with_name(f"{self.path.name}.lock"), 'a') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                if self.max_bytes > 0 and self.path.exists() and self.path.stat().st_size + len(data.encode('utf-8')) > self.max_bytes:
+                    self._rotate()
+
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(data)
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+        self.written += len(records)
+
+    def _rotate(self) -> None:
+        """ログファイルをローテーションする（conflicts.jsonl → conflicts.jsonl.1 → ...）"""
+        if self.backup_count <= 0:
+            self.path.unlink(missing_ok=True)
+            return
+
+        for index in range(self.backup_count - 1, 0, -1):
+            source = self.path.with_name(f"{self.path.name}.{index}")
+            if source.exists():
+                os.replace(source, self.path.with_name(f"{self.path.name}.{index + 1}"))
+        os.replace(self.path, self.path.with_name(f"{self.path.name}.1"))
+
+
+_writer: Optional[ConflictLogWriter] = None
+_writer_lock = threading.Lock()
+
+
+def get_conflict_log_writer() -> Optional[ConflictLogWriter]:
+    """
+    重複ログの書き込みオブジェクトを取得（無効化されている場合はNone）
+
+    Returns:
+        ConflictLogWriter or None
+    """
+    global _writer
+    from src import app
+
+    if not app.config.get('CONFLICT_LOG_ENABLED', True):
+        return None
+
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                base_dir = Path(__file__).resolve().parent.parent
+                _writer = ConflictLogWriter(
+                    base_dir / app.config.get('CONFLICT_LOG_PATH', 'docs/conflicts/conflicts.jsonl'),
+                    max_bytes=app.config.get('CONFLICT_LOG_MAX_BYTES', 10 * 1024 * 1024),
+                    backup_count=app.config.get('CONFLICT_LOG_BACKUP_COUNT', 5),
+                    batch_size=app.config.get('CONFLICT_LOG_BATCH_SIZE', 100),
+                    flush_interval=app.config.get('CONFLICT_LOG_FLUSH_INTERVAL', 1.0),
+                )
+                # 終了時に残りの記録を書き込む
+                atexit.register(_writer.flush, 5.0)
+    return _writer
+
+
+def log_conflicts(conflicts, semester, semester_name, major1_id, major1_name,
+                  major2_id, major2_name, fiscal_year) -> bool:
+    """
+    重複情報を重複ログに記録する（書き込みはバックグラウンドで行う）
+
+    Args:
+        conflicts: 重複情報のリスト
+        semester: セメスタID
+        semester_name: セメスタ名
+        major1_id: 第一メジャーID
+        major1_name: 第一メジャー名
+        major2_id: 第二メジャーID
+        major2_name: 第二メジャー名
+        fiscal_year: 年度
+
+    Returns:
+        bool: 記録をキューに積んだ場合はTrue（重複がない・無効化されている・キューが一杯の場合はFalse）
+    """
+    if not conflicts:
+        return False
+
+    writer = get_conflict_log_writer()
+    if writer is None:
+        return False
+
+    # 重複する時間割コードのリストを作成
+    conflict_codes = set()
+    for conflict in conflicts:
+        for course in conflict['courses']:
+            conflict_codes.add(course['timetable_code'])
+
+    return writer.write({
+        'logged_at': datetime.now().isoformat(timespec='seconds'),
+        'semester': semester,
+        'semester_name': semester_name,
+        'major1_id': major1_id,
+        'major1_name': major1_name,
+        'major2_id': major2_id,
+        'major2_name': major2_name,
+        'fiscal_year': fiscal_year,
+        'conflict_summary': {
+            'total_conflicts': len(conflicts),
+            'total_conflict_courses': len(conflict_codes),
+            'conflict_codes_list': sorted(conflict_codes)
+        },
+        'conflicts': conflicts
+    })
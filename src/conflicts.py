@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+時間割の重複判定（ビットマスク）
+Timetable Conflict Detection with Bitmasks
+
+重複の判断基準: 開講曜限が重なっており、かつクォーターも重なっているとき
+- クォーター: 4ビット（1Q=bit0, 2Q=bit1, 3Q=bit2, 4Q=bit3）
+- 曜日・時限: 30ビット（月~金 × 1~6限、(曜日ID - 1) × 6 + (時限 - 1) ビット目）
+"""
+
+from src.translations.field_values import OfferingCategoryEnum
+
+# 時間割表の範囲（月~金、1~6限）
+TIMETABLE_DAYS = range(1, 6)
+TIMETABLE_PERIODS = range(1, 7)
+
+# 開講区分ごとのクォーターマスク
+QUARTER_MASKS = {
+    OfferingCategoryEnum.FIRST_QUARTER: 0b0001,    # 1Q
+    OfferingCategoryEnum.SECOND_QUARTER: 0b0010,   # 2Q
+    OfferingCategoryEnum.THIRD_QUARTER: 0b0100,    # 3Q
+    OfferingCategoryEnum.FOURTH_QUARTER: 0b1000,   # 4Q
+    OfferingCategoryEnum.FIRST_SEMESTER: 0b0011,   # 前期 (1Q + 2Q)
+    OfferingCategoryEnum.SECOND_SEMESTER: 0b1100,  # 後期 (3Q + 4Q)
+    OfferingCategoryEnum.FULL_YEAR: 0b1111,        # 通年
+}
+
+
+def get_quarter_mask(offering_category_id) -> int:
+    """
+    開講区分IDからクォーターマスクを取得
+
+    Args:
+        offering_category_id: 開講区分ID
+
+    Returns:
+        int: クォーターマスク（不明な開講区分は0）
+    """
+    return QUARTER_MASKS.get(offering_category_id, 0)
+
+
+def get_slot_bit(day_id: int, period: int) -> int:
+    """
+    曜日・時限に対応するビットを取得
+
+    Args:
+        day_id: 曜日ID
+        period: 時限
+
+    Returns:
+        int: ビット（時間割表の範囲外は0）
+    """
+    if day_id not in TIMETABLE_DAYS or period not in TIMETABLE_PERIODS:
+        return 0
+    return 1 << ((day_id - 1) * len(TIMETABLE_PERIODS) + (period - 1))
+
+
+def get_slot_mask(schedules) -> int:
+    """
+    開講曜限のリストから曜日・時限マスクを作成
+
+    Args:
+        schedules: (曜日ID, 時限) のリスト
+
+    Returns:
+        int: 曜日・時限マスク
+    """
+    mask = 0
+    for day_id, period in schedules:
+        mask |= get_slot_bit(day_id, period)
+    return mask
+
+
+def iter_slots(slot_mask: int):
+    """
+    曜日・時限マスクに含まれる (曜日ID, 時限) を順に返す
+
+    Args:
+        slot_mask: 曜日・時限マスク
+
+    Yields:
+        tuple: (曜日ID, 時限)
+    """
+    while slot_mask:
+        bit = slot_mask & -slot_mask
+        index = bit.bit_length() - 1
+        yield index // len(TIMETABLE_PERIODS) + 1, index % len(TIMETABLE_PERIODS) + 1
+        slot_mask ^= bit
+
+
+def courses_conflict(course1, course2) -> bool:
+    """
+    2つの科目が同時履修不可（曜日・時限とクォーターが共に重なる）かを判定
+
+    Args:
+        course1: 科目レコード（slot_mask, quarter_maskを持つ）
+        course2: 科目レコード
+
+    Returns:
+        bool: 重複する場合はTrue
+    """
+    return bool(course1.slot_mask & course2.slot_mask) and bool(course1.quarter_mask & course2.quarter_mask)
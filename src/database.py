@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""
+SQLiteの接続設定
+SQLite Connection Setup
+
+接続ごとにPRAGMA（journal_mode・mmap_size・cache_size・temp_store・query_only）を適用する。
+サーバーのワーカーは読み取り専用（mode=ro&immutable=1）で開き、
+セットアップスクリプトやマイグレーションは書き込み可能な接続を使う。
+また、データベース全体をワーカーごとのメモリ上のコピーに読み込んで使うこともできる。
+"""
+
+import os
+import sqlite3
+import threading
+
+from sqlalchemy import event
+
+
+def build_database_uri(path: str, read_only: bool = False, immutable: bool = True) -> str:
+    """
+    SQLiteのデータベースURIを作成する
+
+    Args:
+        path: データベースファイルの絶対パス
+        read_only: 読み取り専用で開く場合はTrue（mode=ro）
+        immutable: 読み取り専用の場合に、ファイルが変更されないものとして開く（immutable=1、ロックを取らない）
+
+    Returns:
+        str: SQLAlchemyのデータベースURI
+    """
+    if not read_only:
+        return f"sqlite:///{path}"
+
+    params = 'mode=ro&immutable=1' if immutable else 'mode=ro'
+    return f"sqlite:///file:{path}?{params}&uri=true"
+
+
+def apply_sqlite_pragmas(dbapi_connection, config, read_only: bool = False) -> None:
+    """
+    SQLiteの接続にPRAGMAを適用する
+
+    Args:
+        dbapi_connection: sqlite3の接続
+        config: 設定（app.config）
+        read_only: 読み取り専用の接続の場合はTrue（journal_modeは変更せず、query_onlyを有効にする）
+    """
+    cursor = dbapi_connection.cursor()
+    try:
+        # WALはデータベースファイルに記録されるため、書き込み可能な接続でのみ設定する
+        journal_mode = config.get('SQLITE_JOURNAL_MODE')
+        if journal_mode and not read_only:
+            cursor.execute(f"PRAGMA journal_mode={journal_mode}")
+
+        cursor.execute(f"PRAGMA mmap_size={int(config.get('SQLITE_MMAP_SIZE', 0))}")
+        cursor.execute(f"PRAGMA cache_size={int(config.get('SQLITE_CACHE_SIZE', -2000))}")
+
+        temp_store = config.get('SQLITE_TEMP_STORE')
+        if temp_store:
+            cursor.execute(f"PRAGMA temp_store={temp_store}")
+
+        cursor.execute(f"PRAGMA query_only={'ON' if read_only else 'OFF'}")
+    finally:
+        cursor.close()
+
+
+def register_sqlite_pragmas(engine, config, read_only: bool = False) -> None:
+    """
+    エンジンの新しい接続ごとにPRAGMAを適用するよう登録する
+
+    Args:
+        engine: SQLAlchemyのエンジン
+        config: 設定（app.config）
+        read_only: 読み取り専用のエンジンの場合はTrue
+    """
+    @event.listens_for(engine, 'connect')
+    def on_connect(dbapi_connection, connection_record):
+        apply_sqlite_pragmas(dbapi_connection, config, read_only=read_only)
+
+
+def checkpoint_database(engine) -> None:
+    """
+    WALの内容をデータベースファイルに書き戻す（セットアップの最後に実行）
+
+    読み取り専用（immutable=1）の接続はWALファイルを参照しないため、
+    書き込み後は必ずチェックポイントを実行する。
+
+    Args:
+        engine: 書き込み可能なSQLAlchemyのエンジン
+    """
+    with engine.connect() as connection:
+        connection.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+
+
+class InMemoryDatabase:
+    """
+    データベースファイルのメモリ上のコピー（読み取り専用）
+
+    sqlite3のバックアップAPIでデータベースファイルを共有キャッシュのメモリデータベースにコピーし、
+    以降の接続はそのコピーを開く。メモリデータベースはプロセスごとに存在するため、
+    フォーク後のプロセスでは読み込み直す。
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: コピー元のデータベースファイルの絶対パス
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._anchor = None  # コピーを保持する接続（閉じるとメモリデータベースが破棄される）
+        self._pid = None
+
+    @property
+    def uri(self) -> str:
+        """メモリデータベースのURI（プロセスごとに別の名前）"""
+        return f"file:modeltimetable-{os.getpid()}?mode=memory&cache=shared"
+
+    def load(self) -> None:
+        """データベースファイルをメモリ上にコピーする（ワーカーの起動時に実行）"""
+        with self._lock:
+            self._load()
+
+    def _load(self) -> None:
+        anchor = sqlite3.connect(self.uri, uri=True, check_same_thread=False)
+        source = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+        try:
+            source.backup(anchor)
+        finally:
+            source.close()
+        # フォーク前のプロセスから引き継いだ接続は、このプロセスのメモリ上のコピーを解放するだけ
+        self._anchor = anchor
+        self._pid = os.getpid()
+
+    def connect(self):
+        """
+        メモリ上のコピーへの接続を作成する（SQLAlchemyのcreatorとして使用）
+
+        読み込んでいない場合（またはフォーク後のプロセスの場合）は先に読み込む。
+
+        Returns:
+            sqlite3.Connection
+        """
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._load()
+        return sqlite3.connect(self.uri, uri=True, check_same_thread=False)
@@ -0,0 +1,360 @@
+# -*- coding: utf-8 -*-
+"""
+時間割の一括出力ジョブ
+Background Export Jobs
+
+/export-timetables をリクエスト内で同期実行せず、上限付きのスレッドプールで
+バックグラウンド実行する。ジョブの状態はローカルのJSONファイルに保存し、
+進捗の確認と成果物（ZIP）のダウンロードに使用する。
+完了したジョブは保持数・保持期間を超えたものから、ジョブの登録時に削除する。
+"""
+
+import json
+import os
+import threading
+import uuid
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Optional
+
+# ジョブの状態
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_SUCCEEDED = 'succeeded'
+JOB_FAILED = 'failed'
+
+
+class ExportJobLimitError(Exception):
+    """実行待ちのジョブが上限に達している場合の例外"""
+    pass
+
+
+def get_job_dir() -> Path:
+    """
+    ジョブの状態と成果物を保存するディレクトリを取得（存在しない場合は作成）
+
+    Returns:
+        Path: ジョブディレクトリ
+    """
+    from src import app
+
+    base_dir = Path(__file__).resolve().parent.parent
+    job_dir = base_dir / app.config.get('EXPORT_JOB_DIR', 'docs/export_jobs')
+    job_dir.mkdir(parents=True, exist_ok=True)
+    return job_dir
+
+
+def get_job_path(job_id: str) -> Path:
+    """ジョブの状態ファイルのパスを取得"""
+    return get_job_dir() / f"{job_id}.json"
+
+
+def get_artifact_path(job_id: str) -> Path:
+    """ジョブの成果物（ZIP）のパスを取得"""
+    return get_job_dir() / f"{job_id}.zip"
+
+
+def is_valid_job_id(job_id: str) -> bool:
+    """
+    ジョブIDの形式を確認（パスの指定に使うため、UUIDの16進表記のみ許可）
+
+    Args:
+        job_id: ジョブID
+
+    Returns:
+        bool: 有効な形式の場合はTrue
+    """
+    return len(job_id) == 32 and all(c in '0123456789abcdef' for c in job_id)
+
+
+def save_job(job: dict) -> None:
+    """
+    ジョブの状態を保存する（一時ファイルに書き込んでから置き換える）
+
+    Args:
+        job: ジョブの状態
+    """
+    path = get_job_path(job['job_id'])
+    temp_path = path.with_suffix('.json.tmp')
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(job, f, ensure_ascii=False, indent=2)
+    os.replace(temp_path, path)
+
+
+def load_job(job_id: str) -> Optional[dict]:
+    """
+    ジョブの状態を読み込む
+
+    Args:
+        job_id: ジョブID
+
+    Returns:
+        dict: ジョブの状態（存在しない場合はNone）
+    """
+    if not is_valid_job_id(job_id):
+        return None
+
+    path = get_job_path(job_id)
+    if not path.exists():
+        return None
+
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def delete_job(job_id: str) -> None:
+    """
+    ジョブの成果物と状態ファイルを削除する（他のプロセスが削除済みの場合は何もしない）
+
+    Args:
+        job_id: ジョブID
+    """
+    get_artifact_path(job_id).unlink(missing_ok=True)
+    get_job_path(job_id).unlink(missing_ok=True)
+
+
+def now() -> str:
+    """現在時刻（ISO 8601形式）"""
+    return datetime.now().isoformat(timespec='seconds')
+
+
+def get_boot_id() -> Optional[str]:
+    """OSの起動ID（取得できない場合はNone）"""
+    try:
+        return Path('/proc/sys/kernel/random/boot_id').read_text().strip()
+    except OSError:
+        return None
+
+
+def get_process_start_time(pid: int) -> Optional[str]:
+    """
+    プロセスの開始時刻（起動からのクロック数、取得できない場合はNone）
+
+    プロセスIDが再利用された場合に別のプロセスと区別するために使用する。
+    """
+    try:
+        stat = Path(f'/proc/{pid}/stat').read_text()
+    except OSError:
+        return None
+    # コマンド名に空白や括弧を含む場合があるため、最後の ')' より後ろを分割する
+    return stat.rsplit(')', 1)[1].split()[19]
+
+
+def get_current_owner() -> dict:
+    """現在のプロセスを表すジョブの実行者情報"""
+    pid = os.getpid()
+    return {'pid': pid, 'boot_id': get_boot_id(), 'started': get_process_start_time(pid)}
+
+
+def is_owner_alive(owner: Optional[dict]) -> bool:
+    """
+    ジョブの実行者のプロセスが生存しているかを判定する
+
+    Args:
+        owner: ジョブの実行者情報（get_current_ownerの戻り値）
+
+    Returns:
+        bool: 生存している場合はTrue（実行者情報がない場合はFalse）
+    """
+    if not owner:
+        return False
+
+    if owner.get('boot_id') != get_boot_id():
+        return False
+
+    pid = owner['pid']
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+
+    started = owner.get('started')
+    return started is None or started == get_process_start_time(pid)
+
+
+class ExportJobManager:
+    """
+    一括出力ジョブの管理
+
+    ジョブは上限付きのスレッドプールで実行し、状態の変化と進捗を
+    その都度ファイルに保存する。
+    """
+
+    def __init__(self, max_workers: int = 1, max_pending: int = 4,
+                 max_finished: int = 20, max_age: int = 7 * 24 * 60 * 60):
+        """
+        Args:
+            max_workers: 同時に実行するジョブ数
+            max_pending: 実行待ち・実行中のジョブ数の上限
+            max_finished: 保持する完了したジョブ数の上限
+            max_age: 完了したジョブの保持期間（秒）
+        """
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.max_finished = max_finished
+        self.max_age = max_age
+        self._executor = None
+        self._lock = threading.Lock()
+        self._pending = set()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='export-job')
+            self._mark_interrupted_jobs()
+        return self._executor
+
+    def _mark_interrupted_jobs(self) -> None:
+        """
+        終了したプロセスで完了しなかったジョブを失敗として記録する
+
+        他のワーカープロセスが実行中のジョブ（実行者のプロセスが生存しているもの）は変更しない。
+        """
+        for path in get_job_dir().glob('*.json'):
+            job = load_job(path.stem)
+            if job and job['status'] in [JOB_QUEUED, JOB_RUNNING] and not is_owner_alive(job.get('owner')):
+                job.update(status=JOB_FAILED, error='interrupted', finished_at=now())
+                save_job(job)
+
+    def _purge_finished_jobs(self) -> None:
+        """
+        完了したジョブのうち、保持期間を過ぎたものと保持数を超えた古いものを削除する
+
+        実行待ち・実行中のジョブは削除しない。
+        """
+        finished_jobs = []
+        for path in get_job_dir().glob('*.json'):
+            try:
+                job = load_job(path.stem)
+            except (OSError, ValueError):
+                continue  # 他のプロセスが削除中
+            if job and job['status'] in [JOB_SUCCEEDED, JOB_FAILED]:
+                finished_jobs.append(job)
+
+        # 新しい順に保持数まで残す
+        finished_jobs.sort(key=lambda job: job['finished_at'] or job['created_at'], reverse=True)
+        expires_at = datetime.now() - timedelta(seconds=self.max_age)
+        for position, job in enumerate(finished_jobs):
+            finished_at = datetime.fromisoformat(job['finished_at'] or job['created_at'])
+            if position >= self.max_finished or finished_at < expires_at:
+                delete_job(job['job_id'])
+
+    def _snapshot(self, job: dict) -> dict:
+        """ジョブの状態のコピー（実行中のスレッドが更新する辞書を外に渡さない）"""
+        with self._lock:
+            return {**job, 'files': list(job['files'])}
+
+    def submit(self, workers: Optional[int] = None) -> dict:
+        """
+        一括出力ジョブを登録する
+
+        Args:
+            workers: 出力に使うワーカープロセス数（Noneの場合は設定値）
+
+        Returns:
+            dict: 登録したジョブの状態
+
+        Raises:
+            ExportJobLimitError: 実行待ち・実行中のジョブが上限に達している場合
+        """
+        with self._lock:
+            executor = self._get_executor()
+            if len(self._pending) >= self.max_pending:
+                raise ExportJobLimitError(f'too many pending export jobs (max {self.max_pending})')
+
+            self._purge_finished_jobs()
+
+            job = {
+                'job_id': uuid.uuid4().hex,
+                'status': JOB_QUEUED,
+                'created_at': now(),
+                'started_at': None,
+                'finished_at': None,
+                'completed': 0,
+                'total': None,
+                'files': [],
+                'error': None,
+                'owner': get_current_owner(),
+            }
+            save_job(job)
+            self._pending.add(job['job_id'])
+            snapshot = {**job, 'files': []}
+
+        executor.submit(self._run, job, workers)
+        return snapshot
+
+    def _run(self, job: dict, workers: Optional[int]) -> None:
+        """ジョブを実行する（スレッドプール内で実行）"""
+        from src.views.main import export_all_timetables
+
+        self._update(job, status=JOB_RUNNING, started_at=now())
+
+        def progress(current, total, combination, filepath):
+            with self._lock:
+                job.update(completed=current, total=total)
+                job['files'].append(os.path.basename(filepath))
+            save_job(self._snapshot(job))
+
+        try:
+            exported_files = export_all_timetables(workers=workers, progress=progress)
+
+            # 成果物をZIPにまとめる
+            artifact_path = get_artifact_path(job['job_id'])
+            temp_path = artifact_path.with_suffix('.zip.tmp')
+            with zipfile.ZipFile(temp_path, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+                for filepath in exported_files:
+                    zf.write(filepath, arcname=os.path.basename(filepath))
+            os.replace(temp_path, artifact_path)
+
+            self._update(job, status=JOB_SUCCEEDED, finished_at=now())
+        except Exception as e:
+            self._update(job, status=JOB_FAILED, error=str(e), finished_at=now())
+        finally:
+            with self._lock:
+                self._pending.discard(job['job_id'])
+
+    def _update(self, job: dict, **changes) -> None:
+        """ジョブの状態を更新して保存する"""
+        with self._lock:
+            job.update(changes)
+        save_job(self._snapshot(job))
+
+    def get(self, job_id: str) -> Optional[dict]:
+        """
+        ジョブの状態を取得する
+
+        Args:
+            job_id: ジョブID
+
+        Returns:
+            dict: ジョブの状態（ファイルから読み込んだコピー、存在しない場合はNone）
+        """
+        return load_job(job_id)
+
+
+_job_manager: Optional[ExportJobManager] = None
+_job_manager_lock = threading.Lock()
+
+
+def get_job_manager() -> ExportJobManager:
+    """
+    一括出力ジョブの管理オブジェクトを取得（初回参照時に設定値から作成）
+
+    Returns:
+        ExportJobManager
+    """
+    global _job_manager
+    if _job_manager is None:
+        from src import app
+        with _job_manager_lock:
+            if _job_manager is None:
+                _job_manager = ExportJobManager(
+                    max_workers=app.config.get('EXPORT_JOB_WORKERS', 1),
+                    max_pending=app.config.get('EXPORT_JOB_MAX_PENDING', 4),
+                    max_finished=app.config.get('EXPORT_JOB_MAX_FINISHED', 20),
+                    max_age=app.config.get('EXPORT_JOB_MAX_AGE', 7 * 24 * 60 * 60),
+                )
+    return _job_manager
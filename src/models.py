@@ -1,6 +1,6 @@
 from typing import List, Optional
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, Integer, ForeignKey
+from sqlalchemy import String, Integer, ForeignKey, Index
 from src import db
 
 
@@ -154,7 +154,7 @@ class Course(db.Model):
     course_title: Mapped[str] = mapped_column(String(200))
     credits: Mapped[int] = mapped_column(Integer)
     course_category_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey('course_category_master.course_category_id'))
-    offering_category_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey('offering_category_master.offering_category_id'))
+    offering_category_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey('offering_category_master.offering_category_id'), index=True)
     class_format_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey('class_format_master.class_format_id'))
     course_type_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey('course_type_master.course_type_id'))
     main_instructor_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey('instructor_master.instructor_id'))
@@ -172,6 +172,7 @@ class Course(db.Model):
     course_instructors: Mapped[List["CourseInstructor"]] = relationship(back_populates='course')
     affiliated_majors: Mapped[List["AffiliatedMajor"]] = relationship(back_populates='course')
     grade_years: Mapped[List["GradeYear"]] = relationship(back_populates='course')
+    semesters: Mapped[List["CourseSemester"]] = relationship(back_populates='course')
 
     def __repr__(self):
         return f'<Course {self.timetable_code} {self.course_title}>'
@@ -180,6 +181,10 @@ class Course(db.Model):
 class CourseSchedule(db.Model):
     """開講曜限"""
     __tablename__ = 'course_schedule'
+    __table_args__ = (
+        # 曜日・時限から科目を引く（時間割コードまで含めてテーブルを参照しない）
+        Index('ix_course_schedule_day_id_period', 'day_id', 'period', 'timetable_code'),
+    )
 
     timetable_code: Mapped[str] = mapped_column(String(20), ForeignKey('course.timetable_code'), primary_key=True)
     day_id: Mapped[int] = mapped_column(Integer, ForeignKey('day_master.day_id'), primary_key=True)
@@ -207,6 +212,36 @@ class GradeYear(db.Model):
         return f'<GradeYear {self.timetable_code} Grade:{self.grade_name}>'
 
 
+class CourseSemester(db.Model):
+    """科目セメスタ（学年と開講区分から算出したセメスタ）"""
+    __tablename__ = 'course_semester'
+
+    timetable_code: Mapped[str] = mapped_column(String(20), ForeignKey('course.timetable_code'), primary_key=True)
+    semester: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+
+    # リレーション
+    course: Mapped["Course"] = relationship(back_populates='semesters')
+
+    def __repr__(self):
+        return f'<CourseSemester {self.timetable_code} Semester:{self.semester}>'
+
+
+class CourseConflict(db.Model):
+    """科目重複（同じセメスタで開講曜限とクォーターが重なる科目の組）"""
+    __tablename__ = 'course_conflict'
+
+    semester: Mapped[int] = mapped_column(Integer, primary_key=True)
+    timetable_code1: Mapped[str] = mapped_column(String(20), ForeignKey('course.timetable_code'), primary_key=True)
+    timetable_code2: Mapped[str] = mapped_column(String(20), ForeignKey('course.timetable_code'), primary_key=True)
+
+    # リレーション
+    course1: Mapped["Course"] = relationship(foreign_keys=[timetable_code1])
+    course2: Mapped["Course"] = relationship(foreign_keys=[timetable_code2])
+
+    def __repr__(self):
+        return f'<CourseConflict Semester:{self.semester} {self.timetable_code1} {self.timetable_code2}>'
+
+
 # =============================================================================
 # 中間テーブル
 # =============================================================================
@@ -259,6 +294,10 @@ class CourseInstructor(db.Model):
 class AffiliatedMajor(db.Model):
     """所属メジャー"""
     __tablename__ = 'affiliated_major'
+    __table_args__ = (
+        # メジャーから科目と履修区分を引く（テーブルを参照しない）
+        Index('ix_affiliated_major_major_id', 'major_id', 'timetable_code', 'course_category_id'),
+    )
 
     timetable_code: Mapped[str] = mapped_column(String(20), ForeignKey('course.timetable_code'), primary_key=True)
     major_id: Mapped[int] = mapped_column(Integer, ForeignKey('major_master.major_id'), primary_key=True)
@@ -0,0 +1,400 @@
+# -*- coding: utf-8 -*-
+"""
+時間割の重複の自動解決
+Automatic Conflict Resolution
+
+重複している科目の間の重複グラフから、重複のない科目の組み合わせのうち
+目的関数（必修単位 → 合計単位 → 第一メジャー優先 など）が最大のものを
+ビットマスクによる分枝限定法で求める。
+"""
+
+from src.conflicts import get_quarter_mask
+from src.translations.field_values import CourseCategoryEnum
+
+# 目的関数の評価項目（優先順に並べて使用する）
+OBJECTIVE_CRITERIA = {
+    # 必修・必履修の単位数
+    'required': lambda item: item['credits'] if item.get('course_category_id') in [
+        CourseCategoryEnum.REQUIRED, CourseCategoryEnum.MANDATORY
+    ] else 0,
+    # 単位数
+    'credits': lambda item: item['credits'],
+    # 第一メジャー（共有科目を含む）の科目数
+    'major1': lambda item: 1 if item.get('major_type') in ['major1', 'shared'] else 0,
+}
+
+DEFAULT_OBJECTIVE = ('required', 'credits', 'major1')
+
+
+def validate_objective(objective):
+    """
+    目的関数の評価項目名を検証する（設定の読み込み時に実行）
+
+    Args:
+        objective: 評価項目名のリスト（優先順）
+
+    Raises:
+        ValueError: 未知の評価項目名が含まれる場合
+    """
+    unknown = [name for name in objective if name not in OBJECTIVE_CRITERIA]
+    if unknown:
+        raise ValueError(
+            f"unknown AUTO_RESOLVE_OBJECTIVE criteria: {', '.join(unknown)} "
+            f"(available: {', '.join(OBJECTIVE_CRITERIA)})"
+        )
+
+
+def build_conflict_graph(conflicts):
+    """
+    重複情報から重複グラフを作成する
+
+    同じ曜日・時限にあり、クォーターが重なる科目の間を辺とする。
+
+    Args:
+        conflicts: 重複情報のリスト（detect_and_resolve_conflictsの戻り値）
+
+    Returns:
+        tuple: (items, neighbors)
+            - items: 重複している科目の表示用データのリスト（検出順）
+            - neighbors: 各科目と重複する科目のビットマスクのリスト
+    """
+    items = []
+    index_by_code = {}
+    edges = set()
+
+    for conflict in conflicts:
+        indexes = []
+        for course in conflict['courses']:
+            code = course['timetable_code']
+            if code not in index_by_code:
+                index_by_code[code] = len(items)
+                items.append(course)
+            indexes.append(index_by_code[code])
+
+        for i, index1 in enumerate(indexes):
+            for index2 in indexes[i + 1:]:
+                if get_quarter_mask(items[index1]['offering_category_id']) & get_quarter_mask(items[index2]['offering_category_id']):
+                    edges.add((index1, index2))
+
+    neighbors = [0] * len(items)
+    for index1, index2 in edges:
+        if index1 != index2:
+            neighbors[index1] |= 1 << index2
+            neighbors[index2] |= 1 << index1
+
+    return items, neighbors
+
+
+def calculate_weights(items, objective=DEFAULT_OBJECTIVE):
+    """
+    目的関数の評価項目を優先順に桁として並べ、各科目の重みを1つの整数にまとめる
+
+    上位の項目の差は、下位の項目の合計よりも常に大きくなる。
+
+    Args:
+        items: 科目の表示用データのリスト
+        objective: 評価項目名のリスト（優先順）
+
+    Returns:
+        list: 各科目の重み
+    """
+    weights = [0] * len(items)
+    for name in objective:
+        values = [OBJECTIVE_CRITERIA[name](item) for item in items]
+        base = sum(values) + 1
+        weights = [weight * base + value for weight, value in zip(weights, values)]
+
+    # 同点の場合は科目数が多い組み合わせを優先（極大な組み合わせにするため）
+    base = len(items) + 1
+    return [weight * base + 1 for weight in weights]
+
+
+def iter_components(neighbors):
+    """
+    重複グラフの連結成分をビットマスクとして順に返す
+
+    Args:
+        neighbors: 各科目と重複する科目のビットマスクのリスト
+
+    Yields:
+        int: 連結成分に含まれる科目のビットマスク
+    """
+    remaining = (1 << len(neighbors)) - 1
+    while remaining:
+        frontier = remaining & -remaining
+        component = 0
+        while frontier:
+            component |= frontier
+            bit = frontier & -frontier
+            frontier ^= bit
+            frontier |= neighbors[bit.bit_length() - 1] & remaining & ~component
+        remaining &= ~component
+        yield component
+
+
+def max_weight_independent_set(weights, neighbors, candidates):
+    """
+    重複しない科目の組み合わせのうち、重みの合計が最大のものを分枝限定法で求める
+
+    分岐の途中で候補が複数の連結成分に分かれた場合は成分ごとに解き、
+    同じ候補集合の結果はメモ化して再利用する。
+
+    Args:
+        weights: 各科目の重み
+        neighbors: 各科目と重複する科目のビットマスクのリスト
+        candidates: 対象とする科目のビットマスク
+
+    Returns:
+        int: 選択した科目のビットマスク
+    """
+    memo = {}
+
+    def mask_weight(mask):
+        total = 0
+        while mask:
+            bit = mask & -mask
+            total += weights[bit.bit_length() - 1]
+            mask ^= bit
+        return total
+
+    def solve(remaining):
+        """候補集合 remaining における最大重みの組み合わせ (重み, ビットマスク) を返す"""
+        if remaining in memo:
+            return memo[remaining]
+
+        # 重複する科目が残っていない科目は必ず選択する
+        chosen = 0
+        pivot = -1
+        pivot_key = None
+        mask = remaining
+        while mask:
+            bit = mask & -mask
+            index = bit.bit_length() - 1
+            degree = (neighbors[index] & remaining).bit_count()
+            if degree == 0:
+                chosen |= bit
+            elif pivot_key is None or (degree, weights[index]) > pivot_key:
+                pivot = index
+                pivot_key = (degree, weights[index])
+            mask ^= bit
+
+        rest = remaining & ~chosen
+        best_weight, best_mask = mask_weight(chosen), chosen
+
+        if rest:
+            components = list(iter_components_in(rest))
+            if len(components) > 1:
+                # 連結成分ごとに独立して解く
+                for component in components:
+                    weight, component_mask = solve(component)
+                    best_weight += weight
+                    best_mask |= component_mask
+            else:
+                pivot_bit = 1 << pivot
+                # 選択する場合: 重複する科目を候補から外す
+                include_weight, include_mask = solve(rest & ~pivot_bit & ~neighbors[pivot])
+                include_weight += weights[pivot]
+                include_mask |= pivot_bit
+                # 選択しない場合（上界が選択する場合以下なら探索しない）
+                exclude_weight, exclude_mask = -1, 0
+                if mask_weight(rest & ~pivot_bit) > include_weight:
+                    exclude_weight, exclude_mask = solve(rest & ~pivot_bit)
+
+                if include_weight >= exclude_weight:
+                    best_weight += include_weight
+                    best_mask |= include_mask
+                else:
+                    best_weight += exclude_weight
+                    best_mask |= exclude_mask
+
+        memo[remaining] = (best_weight, best_mask)
+        return memo[remaining]
+
+    def iter_components_in(mask):
+        while mask:
+            frontier = mask & -mask
+            component = 0
+            while frontier:
+                component |= frontier
+                bit = frontier & -frontier
+                frontier ^= bit
+                frontier |= neighbors[bit.bit_length() - 1] & mask & ~component
+            mask &= ~component
+            yield component
+
+    return solve(candidates)[1]
+
+
+def resolve_conflicts(conflicts, objective=DEFAULT_OBJECTIVE):
+    """
+    重複を自動で解決し、除外する科目を求める
+
+    Args:
+        conflicts: 重複情報のリスト（detect_and_resolve_conflictsの戻り値）
+        objective: 目的関数の評価項目名のリスト（優先順）
+
+    Returns:
+        set: 除外する科目の時間割コードのセット
+    """
+    items, neighbors = build_conflict_graph(conflicts)
+    weights = calculate_weights(items, objective)
+
+    selected = 0
+    for component in iter_components(neighbors):
+        selected |= max_weight_independent_set(weights, neighbors, component)
+
+    return {
+        item['timetable_code'] for index, item in enumerate(items)
+        if not selected >> index & 1
+    }
+
+
+def iter_component_maximal_sets(weights, neighbors, component):
+    """
+    連結成分内の重複しない科目の極大な組み合わせを、重みの合計が大きい順に1つずつ返す
+
+    成分内の科目を幅優先の順に「選択する／選択しない」で分岐する最良優先探索を行う。
+    未決定の科目のうち選択済みの科目と重複しないものを全て加えた重みを上界とし、
+    上界の大きい状態から展開する。選択しない科目は、いずれかの選択した科目と
+    重複する（またはその可能性が残っている）場合のみ許す（極大性）。
+
+    Args:
+        weights: 各科目の重み
+        neighbors: 各科目と重複する科目のビットマスクのリスト
+        component: 連結成分に含まれる科目のビットマスク
+
+    Yields:
+        tuple: (重みの合計, 選択した科目のビットマスク)
+    """
+    import heapq
+
+    def mask_weight(mask):
+        total = 0
+        while mask:
+            bit = mask & -mask
+            total += weights[bit.bit_length() - 1]
+            mask ^= bit
+        return total
+
+    # 幅優先の順に並べる（選択しない科目の極大性を早く判定できるように）
+    order = []
+    visited = 0
+    frontier = [component & -component]
+    while frontier:
+        bit = frontier.pop(0)
+        if visited & bit:
+            continue
+        visited |= bit
+        index = bit.bit_length() - 1
+        order.append(index)
+        mask = neighbors[index] & component & ~visited
+        while mask:
+            next_bit = mask & -mask
+            frontier.append(next_bit)
+            mask ^= next_bit
+
+    # undecided[k]: k番目以降の科目のビットマスク
+    undecided = [0] * (len(order) + 1)
+    for position in range(len(order) - 1, -1, -1):
+        undecided[position] = undecided[position + 1] | (1 << order[position])
+
+    def is_feasible(position, blocked, chosen, rejected):
+        """選択しない科目が、選択した科目と重複する（または今後重複し得る）かを確認する"""
+        available = undecided[position] & ~blocked
+        mask = rejected
+        while mask:
+            bit = mask & -mask
+            neighbor_mask = neighbors[bit.bit_length() - 1]
+            if not (neighbor_mask & chosen) and not (neighbor_mask & available):
+                return False
+            mask ^= bit
+        return True
+
+    # (−上界, 通し番号, 決定済みの科目数, 選択した科目, 選択した科目と重複する科目, 選択しない科目)
+    heap = [(-mask_weight(component), 0, 0, 0, 0, 0)]
+    sequence = 1
+
+    while heap:
+        negative_bound, _, position, chosen, blocked, rejected = heapq.heappop(heap)
+
+        if position == len(order):
+            yield -negative_bound, chosen
+            continue
+
+        index = order[position]
+        bit = 1 << index
+
+        # 選択する（選択済みの科目と重複しない場合のみ）
+        if not blocked & bit:
+            next_chosen = chosen | bit
+            next_blocked = blocked | neighbors[index]
+            if is_feasible(position + 1, next_blocked, next_chosen, rejected):
+                bound = mask_weight(next_chosen) + mask_weight(undecided[position + 1] & ~next_blocked)
+                heapq.heappush(heap, (-bound, sequence, position + 1, next_chosen, next_blocked, rejected))
+                sequence += 1
+
+        # 選択しない
+        next_rejected = rejected | bit
+        if is_feasible(position + 1, blocked, chosen, next_rejected):
+            bound = mask_weight(chosen) + mask_weight(undecided[position + 1] & ~blocked)
+            heapq.heappush(heap, (-bound, sequence, position + 1, chosen, blocked, next_rejected))
+            sequence += 1
+
+
+def iter_maximal_independent_sets(weights, neighbors):
+    """
+    重複しない科目の極大な組み合わせを、重みの合計が大きい順に1つずつ返す
+
+    極大な組み合わせは連結成分ごとの極大な組み合わせの直積になるため、
+    成分ごとの列挙（iter_component_maximal_sets）を必要な分だけ進めながら、
+    各成分の何番目の組み合わせを使うかの組を合計の大きい順に取り出す。
+
+    Args:
+        weights: 各科目の重み
+        neighbors: 各科目と重複する科目のビットマスクのリスト
+
+    Yields:
+        tuple: (重みの合計, 選択した科目のビットマスク)
+    """
+    import heapq
+
+    streams = [
+        iter_component_maximal_sets(weights, neighbors, component)
+        for component in iter_components(neighbors)
+    ]
+    # 成分ごとに列挙済みの組み合わせ
+    ranked = [[next(stream)] for stream in streams]
+
+    def get_ranked(component_index, rank):
+        """成分の rank 番目の組み合わせを取得（存在しない場合はNone）"""
+        sets = ranked[component_index]
+        while len(sets) <= rank:
+            next_set = next(streams[component_index], None)
+            if next_set is None:
+                return None
+            sets.append(next_set)
+        return sets[rank]
+
+    # (−重みの合計, 通し番号, 各成分の順位, 最後に進めた成分)
+    ranks = (0,) * len(streams)
+    heap = [(-sum(sets[0][0] for sets in ranked), 0, ranks, 0)]
+    sequence = 1
+
+    while heap:
+        negative_weight, _, ranks, last = heapq.heappop(heap)
+
+        selected = 0
+        for component_index, rank in enumerate(ranks):
+            selected |= ranked[component_index][rank][1]
+        yield -negative_weight, selected
+
+        # 同じ組を重複して作らないよう、最後に進めた成分以降のみ進める
+        for component_index in range(last, len(ranks)):
+            rank = ranks[component_index]
+            next_set = get_ranked(component_index, rank + 1)
+            if next_set is None:
+                continue
+            weight = -negative_weight - ranked[component_index][rank][0] + next_set[0]
+            next_ranks = ranks[:component_index] + (rank + 1,) + ranks[component_index + 1:]
+            heapq.heappush(heap, (-weight, sequence, next_ranks, component_index))
+            sequence += 1
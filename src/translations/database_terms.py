@@ -11,6 +11,8 @@ TABLES = {
     "開講曜限": "CourseSchedule",
     "曜日マスタ": "DayMaster",
     "学年": "GradeYear",
+    "科目セメスタ": "CourseSemester",
+    "科目重複": "CourseConflict",
     "メジャーマスタ": "MajorMaster",
     "科目": "Course",
     "科目教室": "CourseClassroom",
@@ -91,6 +93,8 @@ TABLE_DESCRIPTIONS = {
     "CourseSchedule": "Course schedule information with day of week and period",
     "DayMaster": "Master table for days of the week",
     "GradeYear": "Target grade/year levels for courses",
+    "CourseSemester": "Semesters derived from grade years and offering category",
+    "CourseConflict": "Pairs of courses in the same semester whose schedules and quarters overlap",
     "MajorMaster": "Master table for academic majors/programs",
     "Course": "Main course information table",
     "CourseClassroom": "Junction table linking courses to classrooms",
@@ -149,6 +149,55 @@ COURSE_TYPE_MASTER = {
 CLASSROOM_UNDECIDED = {"ja": "未定", "en": "TBD"}
 
 
+def compile_master_tables():
+    """
+    言語ごとに、マスタ名 → (ID → 名称) の平坦な辞書を作成する
+
+    Returns:
+        dict: 言語 → マスタ名 → 読み取り専用の辞書
+    """
+    from types import MappingProxyType
+
+    masters = {
+        'course_category': COURSE_CATEGORY_MASTER,
+        'offering_category': OFFERING_CATEGORY_MASTER,
+        'day': DAY_MASTER,
+        'day_short': DAY_MASTER_SHORT,
+        'major': MAJOR_MASTER,
+        'class_format': CLASS_FORMAT_MASTER,
+        'course_type': COURSE_TYPE_MASTER,
+        'semester': SEMESTERS,
+    }
+
+    langs = {lang for master in masters.values() for names in master.values() for lang in names}
+    return {
+        lang: {
+            name: MappingProxyType({
+                master_id: names[lang] for master_id, names in master.items() if lang in names
+            })
+            for name, master in masters.items()
+        }
+        for lang in langs
+    }
+
+
+# 言語ごとのマスタの名称（モジュール読み込み時に1回だけ作成）
+MASTER_TABLES = compile_master_tables()
+
+
+def get_master_tables(lang: str = 'ja') -> dict:
+    """
+    指定言語のマスタ名 → (ID → 名称) の辞書を取得
+
+    Args:
+        lang: 言語 ('ja' or 'en')
+
+    Returns:
+        dict: マスタ名 → 読み取り専用の辞書（未対応の言語は空）
+    """
+    return MASTER_TABLES.get(lang, {})
+
+
 def get_course_category_name(category_id: int, lang: str = 'ja') -> str:
     """履修区分IDから名称を取得"""
     return COURSE_CATEGORY_MASTER.get(category_id, {}).get(lang, str(category_id))
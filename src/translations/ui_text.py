@@ -136,6 +136,7 @@ CHOOSE = {
     "no_conflicts": {"ja": "時間割の重複はありません。", "en": "No schedule conflicts detected."},
     "select_priority_course": {"ja": "優先する科目を選択", "en": "Select Priority Course"},
     "apply_selections": {"ja": "選択を適用", "en": "Apply Selections"},
+    "auto_resolve": {"ja": "自動で選択", "en": "Resolve Automatically"},
     "conflicting_courses": {"ja": "重複する科目ペア", "en": "Conflicting Course Pair"},
     "schedule": {"ja": "開講曜限", "en": "Schedule"},
 }
@@ -150,6 +151,53 @@ ERROR = {
 }
 
 
+# カテゴリ名 → テキスト定義
+CATEGORIES = {
+    'nav': NAV,
+    'common': COMMON,
+    'footer': FOOTER,
+    'index': INDEX,
+    'result': RESULT,
+    'choose': CHOOSE,
+    'error': ERROR,
+}
+
+
+def compile_text_tables():
+    """
+    言語ごとに (カテゴリ名, テキストキー) → テキスト の平坦な辞書を作成する
+
+    Returns:
+        dict: 言語 → 読み取り専用の辞書
+    """
+    from types import MappingProxyType
+
+    tables = {}
+    for category, category_dict in CATEGORIES.items():
+        for key, text_dict in category_dict.items():
+            for lang, text in text_dict.items():
+                tables.setdefault(lang, {})[(category, key)] = text
+
+    return {lang: MappingProxyType(table) for lang, table in tables.items()}
+
+
+# 言語ごとのテキスト（モジュール読み込み時に1回だけ作成）
+TEXT_TABLES = compile_text_tables()
+
+
+def get_text_table(lang: str = 'ja'):
+    """
+    指定言語の (カテゴリ名, テキストキー) → テキスト の辞書を取得
+
+    Args:
+        lang: 言語 ('ja' or 'en')
+
+    Returns:
+        読み取り専用の辞書（未対応の言語は空）
+    """
+    return TEXT_TABLES.get(lang, {})
+
+
 def get_text(category: str, key: str, lang: str = 'ja') -> str:
     """
     UIテキストを取得
@@ -162,16 +210,4 @@ def get_text(category: str, key: str, lang: str = 'ja') -> str:
     Returns:
         翻訳されたテキスト
     """
-    categories = {
-        'nav': NAV,
-        'common': COMMON,
-        'footer': FOOTER,
-        'index': INDEX,
-        'result': RESULT,
-        'choose': CHOOSE,
-        'error': ERROR,
-    }
-
-    category_dict = categories.get(category.lower(), {})
-    text_dict = category_dict.get(key, {})
-    return text_dict.get(lang, key)
+    return get_text_table(lang).get((category.lower(), key), key)
@@ -13,9 +13,11 @@ from src.views import context_processors
 # ルートを登録
 from src.views import main
 from src.views import errors
+from src.views import api
 
 __all__ = [
     'context_processors',
     'main',
     'errors',
+    'api',
 ]
@@ -0,0 +1,355 @@
+# -*- coding: utf-8 -*-
+"""
+時間割結果のJSON API
+Timetable JSON API
+
+result.html と同じ時間割結果（時間割表・集中講義・単位情報・重複情報）を
+コンパクトなJSONとして返す。科目の情報は1回だけ courses に含め、
+時間割表・集中講義・重複情報からはその添字で参照する。
+"""
+import hashlib
+import json
+from flask import request, Response
+from src import app
+from src.cache import LRUCache
+from src.views.main import get_base_timetable_result, get_timetable_result, is_major_combination
+
+# APIのペイロード形式のバージョン（形式を変えた場合は上げる）
+API_PAYLOAD_VERSION = 1
+
+# 科目の表示用データのうちAPIに含める項目
+API_COURSE_FIELDS = (
+    'timetable_code', 'course_title', 'instructor_name', 'major_type',
+    'offering_category_id', 'credits', 'classroom_name', 'syllabus_url',
+    'course_category_id', 'class_format_name', 'course_type_name',
+)
+
+# シリアライズ済みのペイロードのキャッシュ（ETag → JSONのバイト列）
+_payload_cache = LRUCache(
+    max_entries=app.config.get('API_PAYLOAD_CACHE_MAX_ENTRIES', 256),
+    max_bytes=app.config.get('API_PAYLOAD_CACHE_MAX_BYTES', 16 * 1024 * 1024),
+    sizeof=len,
+)
+
+
+def parse_excluded_course_codes(excluded_courses_str):
+    """
+    カンマ区切りの除外する科目コードをセットに変換する
+
+    Args:
+        excluded_courses_str: カンマ区切りの時間割コード
+
+    Returns:
+        set: 時間割コードのセット（空文字列は除く）
+    """
+    excluded_course_codes = set(excluded_courses_str.split(',')) if excluded_courses_str else set()
+    excluded_course_codes.discard('')
+    return excluded_course_codes
+
+
+def get_applied_excluded_course_codes(semester, major1_id, major2_id, excluded_course_codes):
+    """
+    除外する科目コードのうち、時間割に含まれるもの（実際に除外されるもの）を取得する
+
+    Args:
+        semester: セメスタID
+        major1_id: 第一メジャーID
+        major2_id: 第二メジャーID
+        excluded_course_codes: 除外する科目コードのセット
+
+    Returns:
+        list: 時間割コードのリスト（昇順）
+    """
+    base_result = get_base_timetable_result(semester, major1_id, major2_id)
+    return sorted(
+        course.timetable_code for course in base_result['all_courses']
+        if course.timetable_code in excluded_course_codes
+    )
+
+
+def calculate_etag(semester, major1_id, major2_id, excluded_course_codes):
+    """
+    時間割結果のETagを計算する（データセットのバージョンと条件から決まる）
+
+    Args:
+        semester: セメスタID
+        major1_id: 第一メジャーID
+        major2_id: 第二メジャーID
+        excluded_course_codes: 適用された除外科目コードのリスト（昇順）
+
+    Returns:
+        str: ETag
+    """
+    from src.catalog import get_catalog
+
+    key = repr((API_PAYLOAD_VERSION, get_catalog().version, semester, major1_id, major2_id, excluded_course_codes))
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]
+
+
+class CourseIndex:
+    """
+    科目の情報の一覧と、科目から添字への対応（科目の重複排除に使用）
+
+    メジャー種別と履修区分は組み合わせによって変わるため、時間割コードとの組で重複排除する
+    （複数の結果で共有する場合、同じ科目でも組み合わせごとに別の要素となることがある）。
+    """
+
+    def __init__(self):
+        self.courses = []
+        self._index_by_key = {}
+
+    def get(self, item):
+        """
+        科目の添字を取得する（初めて現れた科目は一覧に追加）
+
+        Args:
+            item: 科目の表示用データ
+
+        Returns:
+            int: coursesの添字
+        """
+        key = (item['timetable_code'], item.get('major_type'), item.get('course_category_id'))
+        index = self._index_by_key.get(key)
+        if index is None:
+            index = len(self.courses)
+            self._index_by_key[key] = index
+            self.courses.append({field: item[field] for field in API_COURSE_FIELDS if field in item})
+        return index
+
+
+def build_timetable_payload(semester, major1_id, major2_id, result_data, excluded_course_codes, course_index=None):
+    """
+    時間割結果からAPIのペイロードを作成する
+
+    Args:
+        semester: セメスタID
+        major1_id: 第一メジャーID
+        major2_id: 第二メジャーID
+        result_data: 時間割結果（get_timetable_resultの戻り値）
+        excluded_course_codes: 適用された除外科目コードのリスト（昇順）
+        course_index: 複数の結果で共有するCourseIndex（オプション）
+            指定した場合、科目の情報（courses）とデータセットのバージョンはペイロードに含めない
+
+    Returns:
+        dict: ペイロード
+            - courses: 科目の情報のリスト（時間割コード・メジャー種別・履修区分で重複排除）
+            - grid: grid[曜日ID - 1][時限 - 1] = 科目の添字のリスト
+            - intensive_courses: 集中講義の科目の添字のリスト
+            - conflicts: [{'day_id', 'period', 'courses': 科目の添字のリスト}]
+    """
+    from src.catalog import get_catalog
+
+    shared = course_index is not None
+    if not shared:
+        course_index = CourseIndex()
+    get_index = course_index.get
+
+    timetable = result_data['timetable']
+    grid = [
+        [[get_index(item) for item in timetable[day_id][period]] for period in sorted(timetable[day_id])]
+        for day_id in sorted(timetable)
+    ]
+    intensive_courses = [get_index(item) for item in result_data['intensive_courses']]
+    conflicts = [
+        {
+            'day_id': conflict['day_id'],
+            'period': conflict['period'],
+            'courses': [get_index(course) for course in conflict['courses']],
+        }
+        for conflict in result_data['conflicts']
+    ]
+
+    payload = {
+        'semester': semester,
+        'major1_id': major1_id,
+        'major2_id': major2_id,
+        'excluded': excluded_course_codes,
+        'grid': grid,
+        'intensive_courses': intensive_courses,
+        'conflicts': conflicts,
+        'credits': {
+            'major1': result_data['major1_credits'],
+            'shared': result_data['shared_credits'],
+            'major2': result_data['major2_credits'],
+            'others': result_data['others_credits'],
+            'info_app': result_data['info_app_credits'],
+            'total': result_data['total_credits'],
+        },
+    }
+    if not shared:
+        payload = {
+            'version': API_PAYLOAD_VERSION,
+            'dataset_version': get_catalog().version,
+            'courses': course_index.courses,
+            **payload,
+        }
+    return payload
+
+
+def get_timetable_payload(semester, major1_id, major2_id, excluded_course_codes):
+    """
+    時間割結果のペイロード（シリアライズ済み）とETagを取得する
+
+    Args:
+        semester: セメスタID
+        major1_id: 第一メジャーID
+        major2_id: 第二メジャーID
+        excluded_course_codes: 除外する科目コードのセット
+
+    Returns:
+        tuple: (ETag, JSONのバイト列を返す関数)
+            JSONは必要になった時点で作成する（条件付きGETで一致した場合は作成しない）
+    """
+    applied_codes = get_applied_excluded_course_codes(semester, major1_id, major2_id, excluded_course_codes)
+    etag = calculate_etag(semester, major1_id, major2_id, applied_codes)
+
+    def serialize():
+        body = _payload_cache.get(etag)
+        if body is None:
+            result_data = get_timetable_result(semester, major1_id, major2_id, set(applied_codes))
+            payload = build_timetable_payload(semester, major1_id, major2_id, result_data, applied_codes)
+            body = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+            _payload_cache.put(etag, body)
+        return body
+
+    return etag, serialize
+
+
+def make_json_response(body, status=200):
+    """JSONのバイト列からレスポンスを作成する"""
+    return Response(body, status=status, mimetype='application/json')
+
+
+@app.route('/api/v1/timetable')
+def api_timetable():
+    """
+    時間割結果をJSONで返すAPI
+
+    クエリパラメータ: semester, major1_id, major2_id, excluded（カンマ区切り、任意）
+    ETagを返し、If-None-Matchが一致する場合は304を返す。
+    """
+    semester = request.args.get('semester', type=int)
+    major1_id = request.args.get('major1_id', type=int)
+    major2_id = request.args.get('major2_id', type=int)
+
+    if not all([semester, major1_id, major2_id]):
+        return {
+            'status': 'error',
+            'message': 'semester, major1_id, major2_id are required'
+        }, 400
+
+    if not is_major_combination(semester, major1_id, major2_id):
+        return {
+            'status': 'error',
+            'message': 'unknown semester or major combination'
+        }, 400
+
+    excluded_course_codes = parse_excluded_course_codes(request.args.get('excluded', ''))
+    etag, serialize = get_timetable_payload(semester, major1_id, major2_id, excluded_course_codes)
+
+    # 条件付きGET（ETagが一致する場合は本文を作成しない）
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = make_json_response(serialize())
+
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+def parse_batch_item(item):
+    """
+    一括APIの1件分の指定を検証して変換する
+
+    Args:
+        item: {'semester', 'major1_id', 'major2_id', 'excluded'（任意、リストまたはカンマ区切り）}
+
+    Returns:
+        tuple: (セメスタID, 第一メジャーID, 第二メジャーID, 除外する科目コードのセット)
+
+    Raises:
+        ValueError: 指定が不正な場合
+    """
+    if not isinstance(item, dict):
+        raise ValueError('each item must be an object')
+
+    ids = []
+    for name in ['semester', 'major1_id', 'major2_id']:
+        value = item.get(name)
+        if isinstance(value, bool) or not isinstance(value, int) or value <= 0:
+            raise ValueError(f'{name} must be a positive integer')
+        ids.append(value)
+
+    if not is_major_combination(*ids):
+        raise ValueError('unknown semester or major combination')
+
+    excluded = item.get('excluded') or []
+    if isinstance(excluded, str):
+        excluded_course_codes = parse_excluded_course_codes(excluded)
+    elif isinstance(excluded, list) and all(isinstance(code, str) for code in excluded):
+        excluded_course_codes = set(excluded)
+        excluded_course_codes.discard('')
+    else:
+        raise ValueError('excluded must be a list of timetable codes or a comma-separated string')
+
+    return (*ids, excluded_course_codes)
+
+
+@app.route('/api/v1/timetables:batch', methods=['POST'])
+def api_timetables_batch():
+    """
+    複数の組み合わせの時間割結果をまとめてJSONで返すAPI
+
+    リクエスト: {"items": [{"semester", "major1_id", "major2_id", "excluded"}, ...]}
+    科目の情報は全件で共有する courses に1回だけ含め、各結果からは添字で参照する。
+    同じ組み合わせの除外なしの結果（科目の読み込み・重複グラフ）は全件で共有する。
+    """
+    from src.catalog import get_catalog
+
+    body = request.get_json(silent=True)
+    items = body.get('items') if isinstance(body, dict) else None
+    if not isinstance(items, list) or not items:
+        return {
+            'status': 'error',
+            'message': 'items must be a non-empty list'
+        }, 400
+
+    max_items = app.config.get('API_BATCH_MAX_ITEMS', 100)
+    if len(items) > max_items:
+        return {
+            'status': 'error',
+            'message': f'too many items (max {max_items})'
+        }, 400
+
+    try:
+        specs = [parse_batch_item(item) for item in items]
+    except ValueError as e:
+        return {
+            'status': 'error',
+            'message': str(e)
+        }, 400
+
+    course_index = CourseIndex()
+    payloads = {}  # 同じ指定の結果は1回だけ作成する
+    results = []
+    for semester, major1_id, major2_id, excluded_course_codes in specs:
+        applied_codes = get_applied_excluded_course_codes(semester, major1_id, major2_id, excluded_course_codes)
+        key = (semester, major1_id, major2_id, tuple(applied_codes))
+        payload = payloads.get(key)
+        if payload is None:
+            result_data = get_timetable_result(semester, major1_id, major2_id, set(applied_codes))
+            payload = build_timetable_payload(
+                semester, major1_id, major2_id, result_data, applied_codes, course_index=course_index
+            )
+            payloads[key] = payload
+        results.append(payload)
+
+    response = make_json_response(json.dumps({
+        'version': API_PAYLOAD_VERSION,
+        'dataset_version': get_catalog().version,
+        'courses': course_index.courses,
+        'results': results,
+    }, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+    response.headers['Cache-Control'] = 'no-store'
+    return response
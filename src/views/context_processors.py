@@ -3,7 +3,7 @@
 コンテキストプロセッサー
 Context Processors
 """
-from flask import request, redirect
+from flask import request, g
 from src import app
 from datetime import datetime
 from urllib.parse import urlencode
@@ -55,37 +55,122 @@ def order_query_params(params: dict, add_defaults: bool = False, default_lang: s
     return ordered
 
 
+# 言語・テーマの設定を保存するクッキー
+LANG_COOKIE_NAME = 'lang'
+THEME_COOKIE_NAME = 'theme'
+
+
+def resolve_lang_and_theme():
+    """
+    リクエストの言語とテーマを決定する
+
+    言語: クエリパラメータ → クッキー → Accept-Language → デフォルト
+    テーマ: クエリパラメータ → クッキー → デフォルト
+
+    Returns:
+        tuple: (言語, テーマ)
+    """
+    supported_languages = app.config.get('SUPPORTED_LANGUAGES', {})
+
+    lang = request.args.get('lang')
+    if lang not in supported_languages:
+        lang = request.cookies.get(LANG_COOKIE_NAME)
+    if lang not in supported_languages:
+        lang = request.accept_languages.best_match(list(supported_languages))
+    if lang not in supported_languages:
+        lang = app.config.get('DEFAULT_LANGUAGE', 'ja')
+
+    available_themes = app.config.get('AVAILABLE_THEMES', [])
+
+    theme = request.args.get('theme')
+    if theme not in available_themes:
+        theme = request.cookies.get(THEME_COOKIE_NAME)
+    if theme not in available_themes:
+        theme = app.config.get('DEFAULT_THEME_NAME', 'light')
+
+    return lang, theme
+
+
+def get_current_lang() -> str:
+    """現在のリクエストの言語を取得"""
+    if 'lang' not in g:
+        g.lang, g.theme = resolve_lang_and_theme()
+    return g.lang
+
+
+def get_current_theme() -> str:
+    """現在のリクエストのテーマを取得"""
+    if 'theme' not in g:
+        g.lang, g.theme = resolve_lang_and_theme()
+    return g.theme
+
+
 @app.before_request
 def ensure_lang_and_theme():
     """
-    全てのリクエストで言語とテーマのクエリパラメータを確認
-    ない場合はデフォルト値を追加してリダイレクト
+    全てのリクエストで言語とテーマを決定する（リダイレクトはしない）
+    クエリパラメータにない場合はクッキーとAccept-Languageから補完する
     """
     # 静的ファイルへのリクエストは無視
     if request.path.startswith('/static/'):
         return None
 
-    # POSTリクエストの場合はリダイレクトしない（フォームデータが失われるため）
-    if request.method == 'POST':
-        return None
+    g.lang, g.theme = resolve_lang_and_theme()
+    return None
 
-    # langまたはthemeがない場合は追加
-    needs_redirect = False
 
-    if 'lang' not in request.args:
-        needs_redirect = True
+def is_page_response(response) -> bool:
+    """
+    言語・テーマで内容が変わるHTMLページのレスポンスかどうかを判定する
 
-    if 'theme' not in request.args:
-        needs_redirect = True
+    JSON API・ZIP・NDJSONなどのレスポンスは言語・テーマに依存しないため対象外とする
+    （APIの304レスポンスは本文がなくmimetypeがtext/htmlになるため、パスでも判定する）。
 
-    # リダイレクトが必要な場合
-    if needs_redirect:
-        # 順序を保証し、デフォルト値を追加
-        ordered_args = order_query_params(dict(request.args), add_defaults=True)
-        query_string = urlencode(ordered_args)
-        return redirect(f"{request.path}?{query_string}")
+    Args:
+        response: レスポンス
 
-    return None
+    Returns:
+        bool: HTMLページのレスポンスの場合はTrue
+    """
+    if request.path.startswith(('/static/', '/api/')):
+        return False
+    return response.mimetype == 'text/html'
+
+
+@app.after_request
+def remember_lang_and_theme(response):
+    """
+    クエリパラメータで指定された言語とテーマをクッキーに保存する（HTMLページのみ）
+    クエリパラメータがない場合は、クッキーとAccept-Languageで内容が変わることを示す
+    """
+    if 'lang' not in g or not is_page_response(response):
+        return response
+
+    max_age = app.config.get('PREFERENCE_COOKIE_MAX_AGE', 365 * 24 * 60 * 60)
+
+    if request.args.get('lang') == g.lang and request.cookies.get(LANG_COOKIE_NAME) != g.lang:
+        response.set_cookie(LANG_COOKIE_NAME, g.lang, max_age=max_age, samesite='Lax')
+    if request.args.get('theme') == g.theme and request.cookies.get(THEME_COOKIE_NAME) != g.theme:
+        response.set_cookie(THEME_COOKIE_NAME, g.theme, max_age=max_age, samesite='Lax')
+
+    if 'lang' not in request.args or 'theme' not in request.args:
+        response.vary.update(['Cookie', 'Accept-Language'])
+
+    return response
+
+
+def get_canonical_url() -> str:
+    """
+    現在のページの正規化したURL（言語とテーマを含み、パラメータの順序を揃えたもの）を取得
+
+    Returns:
+        str: 正規化したURL
+    """
+    params = dict(request.args)
+    params['lang'] = get_current_lang()
+    params['theme'] = get_current_theme()
+    ordered_args = order_query_params(params)
+    return f"{request.base_url}?{urlencode(ordered_args)}"
 
 
 @app.context_processor
@@ -94,56 +179,88 @@ def inject_current_year():
     return {'current_year': datetime.now().year}
 
 
-@app.context_processor
-def inject_language():
-    """現在の言語とテーマをテンプレートで利用可能にする"""
-    from src.translations.ui_text import get_text
-    from src.translations.field_values import (
-        get_day_name, get_major_name, get_course_category_name,
-        get_offering_category_name, get_class_format_name, get_course_type_name,
-        get_semester_name
-    )
-    from flask import url_for as flask_url_for
-    from urllib.parse import urlencode
+def build_template_translations(lang: str) -> dict:
+    """
+    テンプレート用の翻訳関数を言語ごとに作成する（起動時に1回だけ実行）
 
-    # クエリパラメータから言語を取得（なければデフォルト）
-    current_lang = request.args.get('lang', app.config.get('DEFAULT_LANGUAGE', 'ja'))
-    assert isinstance(current_lang, str)
+    各関数は事前に作成した平坦な辞書（ui_text.TEXT_TABLES, field_values.MASTER_TABLES）を
+    参照するだけで、描画時に入れ子の辞書を辿らない。
 
-    # クエリパラメータからテーマを取得（なければデフォルト）
-    current_theme = request.args.get('theme', app.config.get('DEFAULT_THEME_NAME', 'light'))
+    Args:
+        lang: 言語 ('ja' or 'en')
+
+    Returns:
+        dict: テンプレート変数名 → 翻訳関数（および翻訳テーブル）
+    """
+    from src.translations.ui_text import get_text, get_text_table
+    from src.translations.field_values import get_master_tables
+
+    texts = get_text_table(lang)
+    masters = get_master_tables(lang)
+
+    def lookup(name):
+        table = masters.get(name, {})
+        return lambda master_id: table.get(master_id, str(master_id))
+
+    day_names = lookup('day')
+    day_short_names = lookup('day_short')
 
     def t(category, key):
         """翻訳テキストを取得"""
-        return get_text(category, key, current_lang)
+        text = texts.get((category, key))
+        return text if text is not None else get_text(category, key, lang)
 
     def translate_day(day_id, short=False):
         """曜日を翻訳"""
-        return get_day_name(day_id, current_lang, short)
+        return day_short_names(day_id) if short else day_names(day_id)
 
-    def translate_major(major_id):
-        """メジャーを翻訳"""
-        return get_major_name(major_id, current_lang)
+    return {
+        'texts': texts,
+        'master_names': masters,
+        't': t,
+        'translate_day': translate_day,
+        # メジャー・履修区分・開講区分・授業形態・授業種別・セメスタを翻訳
+        'translate_major': lookup('major'),
+        'translate_course_category': lookup('course_category'),
+        'translate_offering_category': lookup('offering_category'),
+        'translate_class_format': lookup('class_format'),
+        'translate_course_type': lookup('course_type'),
+        'translate_semester': lookup('semester'),
+    }
 
-    def translate_course_category(category_id):
-        """履修区分を翻訳"""
-        return get_course_category_name(category_id, current_lang)
 
-    def translate_offering_category(category_id):
-        """開講区分を翻訳"""
-        return get_offering_category_name(category_id, current_lang)
+def get_template_translations(lang: str) -> dict:
+    """
+    指定言語のテンプレート用の翻訳関数を取得（未作成の言語はその場で作成して保持）
 
-    def translate_class_format(format_id):
-        """授業形態を翻訳"""
-        return get_class_format_name(format_id, current_lang)
+    Args:
+        lang: 言語
+
+    Returns:
+        dict: テンプレート変数名 → 翻訳関数
+    """
+    translations = _template_translations.get(lang)
+    if translations is None:
+        translations = _template_translations.setdefault(lang, build_template_translations(lang))
+    return translations
 
-    def translate_course_type(type_id):
-        """授業種別を翻訳"""
-        return get_course_type_name(type_id, current_lang)
 
-    def translate_semester(semester_id):
-        """セメスタを翻訳"""
-        return get_semester_name(semester_id, current_lang)
+# 対応言語ごとの翻訳関数（モジュール読み込み時に作成）
+_template_translations = {
+    lang: build_template_translations(lang)
+    for lang in app.config.get('SUPPORTED_LANGUAGES', {})
+}
+
+
+@app.context_processor
+def inject_language():
+    """現在の言語とテーマをテンプレートで利用可能にする"""
+    from flask import url_for as flask_url_for
+    from urllib.parse import urlencode
+
+    # 言語とテーマを取得（クエリパラメータ → クッキー → Accept-Language → デフォルト）
+    current_lang = get_current_lang()
+    current_theme = get_current_theme()
 
     def url_for(endpoint, **values):
         """
@@ -163,6 +280,10 @@ def inject_language():
         """
         # 現在のクエリパラメータをコピーして更新
         all_params = dict(request.args)
+        # 言語とテーマは検証済みの値を使う（不正な値をリンクに引き継がない）
+        for key, value in [('lang', current_lang), ('theme', current_theme)]:
+            if key in all_params:
+                all_params[key] = value
         all_params.update(new_params)
 
         # 順序を保証し、デフォルト値を追加（念のため）
@@ -177,14 +298,9 @@ def inject_language():
         'current_language': current_lang,
         'current_theme': current_theme,
         'supported_languages': app.config.get('SUPPORTED_LANGUAGES', {}),
-        't': t,
-        'translate_day': translate_day,
-        'translate_major': translate_major,
-        'translate_course_category': translate_course_category,
-        'translate_offering_category': translate_offering_category,
-        'translate_class_format': translate_class_format,
-        'translate_course_type': translate_course_type,
-        'translate_semester': translate_semester,
+        'available_themes': app.config.get('AVAILABLE_THEMES', []),
+        **get_template_translations(current_lang),
         'url_for': url_for,
         'update_query_params': update_query_params,
+        'canonical_url': get_canonical_url(),
     }
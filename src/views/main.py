@@ -5,49 +5,81 @@ Main Routes
 """
 from flask import render_template, request, redirect, url_for
 from src import app
+from src.cache import LRUCache
 from pathlib import Path
+import threading
 
 # 単位計算に必要なEnumをインポート（トップレベルのインポートに追加）
 from src.translations.field_values import CourseCategoryEnum
 
 
-def get_instructor_name(course):
+def get_course_codes(courses):
     """
-    科目の担当教員名を取得する（複数担当教員の場合は「他」を返す）
+    科目リストから時間割コードのセットを作成する（所属判定をO(1)で行うため）
 
     Args:
-        course: 科目オブジェクト
+        courses: 科目のリスト
 
     Returns:
-        str: 担当教員名または「他」
+        set: 時間割コードのセット
+    """
+    return {course.timetable_code for course in courses}
+
+
+def merge_courses(*course_lists):
     """
-    name = course.main_instructor.instructor_name
-    if course.has_multiple_instructors == 1:
-        name += ' 他'
-    return name if course.main_instructor else ''
+    複数の科目リストを時間割コードで重複排除しながら統合する（先に現れた順を保持）
 
+    Args:
+        *course_lists: 科目のリスト
 
-def get_major_type(course, major1_courses, major2_courses, others_courses, info_app_courses):
+    Returns:
+        list: 統合した科目のリスト
+    """
+    merged = {}
+    for courses in course_lists:
+        for course in courses:
+            merged.setdefault(course.timetable_code, course)
+    return list(merged.values())
+
+
+def get_shared_courses_by_title(shared_courses):
+    """
+    共有科目を科目名から引けるようにする（同名の科目が複数ある場合は先の科目）
+
+    Args:
+        shared_courses: 共有科目リスト
+
+    Returns:
+        dict: 科目名 → 共有科目
+    """
+    shared_by_title = {}
+    for course in shared_courses:
+        shared_by_title.setdefault(course.course_title, course)
+    return shared_by_title
+
+
+def get_major_type(course, major1_codes, major2_codes, others_codes, info_app_codes):
     """
     科目がどのメジャーに属するかを判定する
 
     Args:
         course: 科目オブジェクト
-        major1_courses: 第一メジャーの科目リスト
-        major2_courses: 第二メジャーの科目リスト
-        others_courses: その他メジャーの科目リスト
-        info_app_courses: 情報応用科目リスト
+        major1_codes: 第一メジャーの科目の時間割コードのセット
+        major2_codes: 第二メジャーの科目の時間割コードのセット
+        others_codes: その他メジャーの科目の時間割コードのセット
+        info_app_codes: 情報応用科目の時間割コードのセット
 
     Returns:
         str: major_type ('major1', 'major2', 'others', 'info_app')
     """
-    if course in major1_courses:
+    if course.timetable_code in major1_codes:
         return 'major1'
-    elif course in major2_courses:
+    elif course.timetable_code in major2_codes:
         return 'major2'
-    elif course in others_courses:
+    elif course.timetable_code in others_codes:
         return 'others'
-    elif course in info_app_courses:
+    elif course.timetable_code in info_app_codes:
         return 'info_app'
     else:
         return 'others'
@@ -81,11 +113,34 @@ def get_course_category_id(course, major_type, major1_id, major2_id):
         return None
 
     # 所属メジャーから履修区分IDを取得
-    for affiliated in course.affiliated_majors:
-        if affiliated.major_id == target_major_id:
-            return affiliated.course_category_id
+    return course.get_course_category_id(target_major_id)
+
 
-    return None
+def build_intensive_course_item(course, major_type, course_category_id):
+    """
+    集中講義（時間割表に載らない科目）の表示用データを作成する
+
+    Args:
+        course: 科目レコード
+        major_type: メジャータイプ
+        course_category_id: 履修区分ID
+
+    Returns:
+        dict: 集中講義の表示用データ
+    """
+    return {
+        'timetable_code': course.timetable_code,
+        'course_title': course.course_title,
+        'instructor_name': course.instructor_name,
+        'major_type': major_type,
+        'offering_category_id': course.offering_category_id,
+        'credits': course.credits,
+        'classroom_name': course.classroom_name,
+        'syllabus_url': course.syllabus_url,
+        'class_format_name': course.class_format_name,
+        'course_type_name': course.course_type_name,
+        'course_category_id': course_category_id
+    }
 
 
 def build_timetable_from_courses(courses, major1_courses, major2_courses,
@@ -93,8 +148,11 @@ def build_timetable_from_courses(courses, major1_courses, major2_courses,
     """
     科目リストから時間割データを構築する
 
+    同じ曜日・時限に同名の科目が複数ある場合も全て配置する。
+    表示用の時間割はdedupe_timetable_cellsで同名の科目を除いて作成する。
+
     Args:
-        courses: 科目リスト
+        courses: 科目レコードのリスト
         major1_courses: 第一メジャーの科目リスト
         major2_courses: 第二メジャーの科目リスト
         others_courses: その他メジャーの科目リスト
@@ -103,8 +161,8 @@ def build_timetable_from_courses(courses, major1_courses, major2_courses,
         major2_id: 第二メジャーID
 
     Returns:
-        tuple: (timetable, intensive_courses)
-            - timetable: 時間割データ（辞書形式）
+        tuple: (timetable_candidates, intensive_courses)
+            - timetable_candidates: 時間割データ（辞書形式、同名科目の重複を含む）
             - intensive_courses: 集中講義リスト
     """
     # 時間割を曜日・時限ごとに整理
@@ -117,108 +175,97 @@ def build_timetable_from_courses(courses, major1_courses, major2_courses,
     # 集中講義・実験実習などのスケジュールがない科目を別途管理
     intensive_courses = []
 
+    # メジャーごとの時間割コードのセット
+    major_codes = (
+        get_course_codes(major1_courses), get_course_codes(major2_courses),
+        get_course_codes(others_courses), get_course_codes(info_app_courses),
+    )
+
     for course in courses:
+        major_type = get_major_type(course, *major_codes)
+        course_category_id = get_course_category_id(course, major_type, major1_id, major2_id)
+
         if course.schedules:
             has_regular_schedule = False
-            for schedule in course.schedules:
-                day_id = schedule.day_id
-                period = schedule.period
-
+            for day_id, period in course.schedules:
                 if day_id in range(1, 6):
                     if period >= 1 and period <= 6:
                         has_regular_schedule = True
-                        instructor_name = get_instructor_name(course)
-                        major_type = get_major_type(course, major1_courses, major2_courses,
-                                                    others_courses, info_app_courses)
-
-                        already_exists = any(
-                            item['course_title'] == course.course_title
-                            for item in timetable[day_id][period]
-                        )
-
-                        if not already_exists:
-                            classroom_names = ', '.join([
-                                cc.classroom.classroom_name
-                                for cc in course.course_classrooms
-                            ]) if course.course_classrooms else ''
-
-                            course_category_id = get_course_category_id(course, major_type, major1_id, major2_id)
-
-                            timetable[day_id][period].append({
-                                'timetable_code': course.timetable_code,
-                                'course_title': course.course_title,
-                                'instructor_name': instructor_name,
-                                'major_type': major_type,
-                                'offering_category_id': course.offering_category_id,
-                                'credits': course.credits,
-                                'classroom_name': classroom_names,
-                                'syllabus_url': course.syllabus_url or '',
-                                'course_category_id': course_category_id
-                            })
+
+                        timetable[day_id][period].append({
+                            'timetable_code': course.timetable_code,
+                            'course_title': course.course_title,
+                            'instructor_name': course.instructor_name,
+                            'major_type': major_type,
+                            'offering_category_id': course.offering_category_id,
+                            'credits': course.credits,
+                            'classroom_name': course.classroom_name,
+                            'syllabus_url': course.syllabus_url,
+                            'course_category_id': course_category_id
+                        })
 
             if not has_regular_schedule:
-                instructor_name = get_instructor_name(course)
-                major_type = get_major_type(course, major1_courses, major2_courses,
-                                            others_courses, info_app_courses)
-
-                classroom_names = ', '.join([
-                    cc.classroom.classroom_name
-                    for cc in course.course_classrooms
-                ]) if course.course_classrooms else ''
-
-                course_category_id = get_course_category_id(course, major_type, major1_id, major2_id)
-
-                intensive_courses.append({
-                    'timetable_code': course.timetable_code,
-                    'course_title': course.course_title,
-                    'instructor_name': instructor_name,
-                    'major_type': major_type,
-                    'offering_category_id': course.offering_category_id,
-                    'credits': course.credits,
-                    'classroom_name': classroom_names,
-                    'syllabus_url': course.syllabus_url or '',
-                    'class_format_name': course.class_format.class_format_name if course.class_format else '',
-                    'course_type_name': course.course_type.course_type_name if course.course_type else '',
-                    'course_category_id': course_category_id
-                })
+                intensive_courses.append(build_intensive_course_item(course, major_type, course_category_id))
         else:
-            instructor_name = get_instructor_name(course)
-            major_type = get_major_type(course, major1_courses, major2_courses,
-                                        others_courses, info_app_courses)
-
-            classroom_names = ', '.join([
-                cc.classroom.classroom_name
-                for cc in course.course_classrooms
-            ]) if course.course_classrooms else ''
-
-            course_category_id = get_course_category_id(course, major_type, major1_id, major2_id)
-
-            intensive_courses.append({
-                'timetable_code': course.timetable_code,
-                'course_title': course.course_title,
-                'instructor_name': instructor_name,
-                'major_type': major_type,
-                'offering_category_id': course.offering_category_id,
-                'credits': course.credits,
-                'classroom_name': classroom_names,
-                'syllabus_url': course.syllabus_url or '',
-                'class_format_name': course.class_format.class_format_name if course.class_format else '',
-                'course_type_name': course.course_type.course_type_name if course.course_type else '',
-                'course_category_id': course_category_id
-            })
+            intensive_courses.append(build_intensive_course_item(course, major_type, course_category_id))
 
     return timetable, intensive_courses
 
 
-def export_timetable_to_markdown(semester, major1_id, major2_id, timetable,
-                                  semester_name, major1_name, major2_name, fiscal_year, lang='ja'):
+def dedupe_timetable_cells(timetable_candidates):
     """
-    時間割データをMarkdownファイルとして出力する関数
+    各曜日・時限から同名の科目を除き、表示用の時間割を作成する（先に配置された科目を優先）
+
+    Args:
+        timetable_candidates: 時間割データ（同名科目の重複を含む）
+
+    Returns:
+        dict: 時間割データ（辞書形式）
+    """
+    timetable = {}
+    for day_id, periods in timetable_candidates.items():
+        timetable[day_id] = {}
+        for period, items in periods.items():
+            titles = set()
+            cell = []
+            for item in items:
+                if item['course_title'] not in titles:
+                    titles.add(item['course_title'])
+                    cell.append(item)
+            timetable[day_id][period] = cell
+    return timetable
+
+
+# Markdownの出力形式のバージョン（出力内容を変えた場合は上げる）
+MARKDOWN_TEMPLATE_VERSION = 1
+
+# 出力済みの時間割のマニフェスト（docs/timetables/ 内）
+TIMETABLE_MANIFEST_FILENAME = 'manifest.json'
+
+
+def get_timetables_dir():
+    """
+    時間割のMarkdownファイルの出力先ディレクトリを取得（存在しない場合は作成）
+
+    Returns:
+        Path: 出力先ディレクトリ
+    """
+    base_dir = Path(__file__).resolve().parent.parent.parent
+    docs_dir = base_dir / "docs" / "timetables"
+    docs_dir.mkdir(parents=True, exist_ok=True)
+    return docs_dir
+
+
+def get_timetable_filename(semester, major1_id, major2_id, lang='ja'):
+    """時間割のMarkdownファイル名を生成"""
+    return f"timetable_sem{semester}_major1-{major1_id}_major2-{major2_id}_{lang}.md"
+
+
+def render_timetable_markdown(timetable, semester_name, major1_name, major2_name, fiscal_year, lang='ja'):
+    """
+    時間割データからMarkdownの内容を生成する関数
 
     Args:
-        semester: セメスタID
-        major1_id: 第一メジャーID
-        major2_id: 第二メジャーID
         timetable: 時間割データ（辞書形式）
         semester_name: セメスタ名
         major1_name: 第一メジャー名
@@ -227,20 +274,10 @@ def export_timetable_to_markdown(semester, major1_id, major2_id, timetable,
         lang: 言語 ('ja' or 'en')
 
     Returns:
-        str: 出力されたファイルパス
+        str: Markdownの内容
     """
     from src.translations.field_values import DAY_MASTER
 
-    # ファイル名を生成
-    filename = f"timetable_sem{semester}_major1-{major1_id}_major2-{major2_id}_{lang}.md"
-
-    # docsディレクトリのパスを取得
-    base_dir = Path(__file__).resolve().parent.parent.parent
-    docs_dir = base_dir / "docs"/ "timetables"
-    docs_dir.mkdir(exist_ok=True)
-
-    filepath = docs_dir / filename
-
     # Markdown内容を生成
     content = []
 
@@ -266,227 +303,403 @@ def export_timetable_to_markdown(semester, major1_id, major2_id, timetable,
             else:
                 content.append(f"| {day_name} | {period} | |")
 
-    # ファイルに書き込み
-    with open(filepath, 'w', encoding='utf-8') as f:
-        f.write('\n'.join(content))
+    return '\n'.join(content)
+
+
+def get_default_file_mode():
+    """
+    通常の書き込みで作成されるファイルのパーミッション（0o666からumaskを除いたもの）を取得する
+
+    Returns:
+        int: パーミッション
+    """
+    import os
+
+    # umaskはプロセス全体の設定のため、可能な場合は変更せずに読み取る（Linux）
+    try:
+        with open('/proc/self/status', encoding='ascii') as f:
+            for line in f:
+                if line.startswith('Umask:'):
+                    return 0o666 & ~int(line.split()[1], 8)
+    except OSError:
+        pass
+
+    umask = os.umask(0o022)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+def write_file_atomic(filepath, content):
+    """
+    ファイルを一時ファイルに書き込んでから置き換える（書き込み途中の内容が読まれないように）
+
+    Args:
+        filepath: 書き込み先のパス
+        content: 書き込む内容（文字列）
+    """
+    import os
+    import tempfile
+
+    filepath = Path(filepath)
+    # mkstempは0600で作成するため、既存のファイルのパーミッション（なければ通常の作成時と同じもの）に合わせる
+    try:
+        mode = filepath.stat().st_mode & 0o777
+    except FileNotFoundError:
+        mode = get_default_file_mode()
+
+    fd, temp_path = tempfile.mkstemp(dir=filepath.parent, prefix=f".{filepath.name}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.chmod(temp_path, mode)
+        os.replace(temp_path, filepath)
+    except BaseException:
+        Path(temp_path).unlink(missing_ok=True)
+        raise
+
+
+def export_timetable_to_markdown(semester, major1_id, major2_id, timetable,
+                                  semester_name, major1_name, major2_name, fiscal_year, lang='ja'):
+    """
+    時間割データをMarkdownファイルとして出力する関数
+
+    Args:
+        semester: セメスタID
+        major1_id: 第一メジャーID
+        major2_id: 第二メジャーID
+        timetable: 時間割データ（辞書形式）
+        semester_name: セメスタ名
+        major1_name: 第一メジャー名
+        major2_name: 第二メジャー名
+        fiscal_year: 年度
+        lang: 言語 ('ja' or 'en')
+
+    Returns:
+        str: 出力されたファイルパス
+    """
+    filepath = get_timetables_dir() / get_timetable_filename(semester, major1_id, major2_id, lang)
+
+    # ファイルに書き込み（一時ファイルを経由して置き換える）
+    content = render_timetable_markdown(timetable, semester_name, major1_name, major2_name, fiscal_year, lang)
+    write_file_atomic(filepath, content)
 
     return str(filepath)
 
 
-def export_all_timetables():
+def get_combination_input_hash(semester, major1_id, major2_id, lang='ja'):
     """
-    全ての可能な組み合わせ(semester × major1 × major2)の時間割をMarkdownファイルとして出力する関数
+    組み合わせの時間割の出力に使う入力のハッシュを計算する
+
+    出力形式のバージョン・組み合わせ・言語・年度と、組み合わせに含まれる
+    科目レコードの内容から計算するため、変更のあった組み合わせのみ値が変わる。
+
+    Args:
+        semester: セメスタID
+        major1_id: 第一メジャーID
+        major2_id: 第二メジャーID
+        lang: 言語 ('ja' or 'en')
 
     Returns:
-        list: 出力されたファイルパスのリスト
+        str: 入力のハッシュ（16進表記）
     """
-    from src.models import MajorMaster
-    from src.translations.field_values import SEMESTERS, MajorEnum, get_semester_name, get_major_name
-    from src.query import get_courses_by_semester_and_major
+    import hashlib
+    from src.catalog import get_catalog
+    from src.translations.field_values import MajorEnum, get_semester_name, get_major_name
+
+    catalog = get_catalog()
+    courses = merge_courses(*[
+        catalog.get_courses_by_semester_and_major(semester, major_id)
+        for major_id in [major1_id, major2_id, MajorEnum.OTHERS, MajorEnum.INFO_APP]
+    ])
+
+    fiscal_year_dict = app.config.get('FISCAL_YEAR', {})
+    digest = hashlib.sha256()
+    digest.update(repr((
+        MARKDOWN_TEMPLATE_VERSION, semester, major1_id, major2_id, lang,
+        get_semester_name(semester, lang), get_major_name(major1_id, lang), get_major_name(major2_id, lang),
+        fiscal_year_dict.get(lang, fiscal_year_dict.get('ja', '')),
+    )).encode('utf-8'))
+    for course in courses:
+        digest.update(repr(course).encode('utf-8'))
+
+    return digest.hexdigest()
+
+
+def load_timetable_manifest():
+    """
+    出力済みの時間割のマニフェストを読み込む
+
+    Returns:
+        dict: ファイル名 → {'hash', 'semester', 'major1_id', 'major2_id', 'lang'}（ない場合は空）
+    """
+    import json
+
+    manifest_path = get_timetables_dir() / TIMETABLE_MANIFEST_FILENAME
+    try:
+        with open(manifest_path, encoding='utf-8') as f:
+            return json.load(f).get('files', {})
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def save_timetable_manifest(files):
+    """
+    出力済みの時間割のマニフェストを保存する
+
+    Args:
+        files: ファイル名 → {'hash', 'semester', 'major1_id', 'major2_id', 'lang'}
+    """
+    import json
+
+    content = json.dumps({
+        'template_version': MARKDOWN_TEMPLATE_VERSION,
+        'files': dict(sorted(files.items())),
+    }, ensure_ascii=False, indent=2)
+    write_file_atomic(get_timetables_dir() / TIMETABLE_MANIFEST_FILENAME, content)
+
+
+def export_timetable_combination(semester, major1_id, major2_id, lang='ja'):
+    """
+    1つの組み合わせの時間割を/resultと同じ構築処理で作成し、Markdownファイルとして出力する関数
+
+    Args:
+        semester: セメスタID
+        major1_id: 第一メジャーID
+        major2_id: 第二メジャーID
+        lang: 言語 ('ja' or 'en')
+
+    Returns:
+        str: 出力されたファイルパス
+    """
+    from src.translations.field_values import get_semester_name, get_major_name
+
+    # 名前を取得
+    semester_name = get_semester_name(semester, lang)
+    major1_name = get_major_name(major1_id, lang)
+    major2_name = get_major_name(major2_id, lang)
+
+    # 年度情報を取得
+    fiscal_year_dict = app.config.get('FISCAL_YEAR', {})
+    fiscal_year = fiscal_year_dict.get(lang, fiscal_year_dict.get('ja', ''))
+
+    result_data = build_timetable_result(semester, major1_id, major2_id)
+
+    return export_timetable_to_markdown(
+        semester, major1_id, major2_id, result_data['timetable'],
+        semester_name, major1_name, major2_name, fiscal_year, lang
+    )
+
+
+def init_export_worker():
+    """出力用のワーカープロセスの初期化（カタログを読み込む）"""
+    from src.catalog import get_catalog
+    get_catalog()
+
+
+def print_export_progress(current, total, combination, filepath):
+    """
+    出力の進捗を標準出力に表示する（export_all_timetablesの既定の進捗表示）
+
+    Args:
+        current: 完了した組み合わせの数
+        total: 組み合わせの総数
+        combination: (セメスタ, 第一メジャーID, 第二メジャーID, 言語)
+        filepath: 出力されたファイルパス
+    """
+    semester, major1_id, major2_id, _ = combination
+    print(f"処理中 ({current}/{total}): セメスタ={semester}, 第一メジャー={major1_id}, 第二メジャー={major2_id}")
+    print(f"  → {filepath} を出力しました")
 
-    exported_files = []
 
-    # 「その他」と「情報応用科目」を除外したメジャーを取得
-    majors = MajorMaster.query.filter(
-        MajorMaster.major_id.notin_([MajorEnum.OTHERS, MajorEnum.INFO_APP])
-    ).all()
+# 一括出力の排他制御（マニフェストの更新が重ならないように）
+_export_lock = threading.Lock()
 
-    major_ids = [major.major_id for major in majors]
 
-    # 全ての組み合わせをループ（同じメジャー同士を除く）
-    # 4セメスタ × 3! (順列) = 4 × 6 = 24
-    total_combinations = len(SEMESTERS) * len(major_ids) * (len(major_ids) - 1)
-    current = 0
+def export_all_timetables(workers=None, progress=print_export_progress, languages=('ja',), force=False):
+    """
+    全ての可能な組み合わせ(semester × major1 × major2)の時間割をMarkdownファイルとして出力する関数
+
+    docs/timetables/ のマニフェストに記録した入力のハッシュが変わっていない組み合わせは
+    出力を省略し、どの組み合わせにも該当しなくなったファイルは削除する。
+    ワーカー数が2以上の場合は、組み合わせをProcessPoolExecutorで並列に出力する。
+    スレッドを持つサーバープロセスをそのままforkしないよう、ワーカーはforkserver（使えない場合はspawn）で起動する。
+
+    Args:
+        workers: ワーカープロセス数（Noneの場合は設定値EXPORT_WORKERS、1以下の場合は逐次出力）
+        progress: 組み合わせごとに呼び出す進捗通知関数
+                  (完了数, 総数, (セメスタ, 第一メジャーID, 第二メジャーID, 言語), ファイルパス)
+        languages: 出力する言語のリスト
+        force: Trueの場合は変更の有無に関わらず全て出力する
 
-    for semester in SEMESTERS.keys():
-        for major1_id in major_ids:
-            for major2_id in major_ids:
-                # 同じメジャー同士の組み合わせを除外
-                if major1_id == major2_id:
-                    continue
+    Returns:
+        list: 出力対象のファイルパスのリスト（組み合わせ順、出力を省略したものを含む）
+    """
+    from src.catalog import get_catalog
+
+    if workers is None:
+        workers = app.config.get('EXPORT_WORKERS', 1)
+
+    # 全ての組み合わせ（同じメジャー同士を除く）
+    combinations = [
+        (semester, major1_id, major2_id, lang)
+        for semester, major1_id, major2_id in get_major_combinations()
+        for lang in languages
+    ]
+    total = len(combinations)
+    exported_files = [None] * total
+
+    # 入力のハッシュの計算に使うため、先に読み込んでおく（ワーカープロセスは初期化時に各自で読み込む）
+    get_catalog()
+
+    with _export_lock:
+        docs_dir = get_timetables_dir()
+        previous_manifest = load_timetable_manifest()
+        manifest = {}
+
+        # 入力が変わった組み合わせのみ出力する
+        pending = []
+        current = 0
+        for index, combination in enumerate(combinations):
+            semester, major1_id, major2_id, lang = combination
+            filename = get_timetable_filename(semester, major1_id, major2_id, lang)
+            manifest[filename] = {
+                'hash': get_combination_input_hash(semester, major1_id, major2_id, lang),
+                'semester': semester,
+                'major1_id': major1_id,
+                'major2_id': major2_id,
+                'lang': lang,
+            }
+            exported_files[index] = str(docs_dir / filename)
+
+            unchanged = (
+                not force
+                and previous_manifest.get(filename, {}).get('hash') == manifest[filename]['hash']
+                and (docs_dir / filename).exists()
+            )
+            if unchanged:
+                current += 1
+                if progress:
+                    progress(current, total, combination, exported_files[index])
+            else:
+                pending.append(index)
 
+        if workers <= 1 or len(pending) <= 1:
+            for index in pending:
+                export_timetable_combination(*combinations[index])
                 current += 1
-                print(f"処理中 ({current}/{total_combinations}): セメスタ={semester}, 第一メジャー={major1_id}, 第二メジャー={major2_id}")
-
-                # 言語設定（日本語のみ）
-                for lang in ['ja']:
-                    # 名前を取得
-                    semester_name = get_semester_name(semester, lang)
-                    major1_name = get_major_name(major1_id, lang)
-                    major2_name = get_major_name(major2_id, lang)
-
-                    # 年度情報を取得
-                    fiscal_year_dict = app.config.get('FISCAL_YEAR', {})
-                    fiscal_year = fiscal_year_dict.get(lang, fiscal_year_dict.get('ja', ''))
-
-                    # 第一メジャーと第二メジャーの科目を取得
-                    major1_courses = get_courses_by_semester_and_major(semester, major1_id)
-                    major2_courses = get_courses_by_semester_and_major(semester, major2_id)
-
-                    # その他メジャーと情報応用科目も取得
-                    others_courses = get_courses_by_semester_and_major(semester, MajorEnum.OTHERS)
-                    info_app_courses = get_courses_by_semester_and_major(semester, MajorEnum.INFO_APP)
-
-                    # 全メジャーの科目を統合（重複排除）
-                    all_courses = major1_courses.copy()
-                    for course in major2_courses:
-                        if course not in all_courses:
-                            all_courses.append(course)
-                    for course in others_courses:
-                        if course not in all_courses:
-                            all_courses.append(course)
-                    for course in info_app_courses:
-                        if course not in all_courses:
-                            all_courses.append(course)
-
-                    # 時間割を曜日・時限ごとに整理
-                    timetable = {}
-                    for day_id in range(1, 6):
-                        timetable[day_id] = {}
-                        for period in range(1, 7):
-                            timetable[day_id][period] = []
-
-                    # 集中講義・実験実習などのスケジュールがない科目を別途管理
-                    intensive_courses = []
-
-                    for course in all_courses:
-                        if course.schedules:
-                            has_regular_schedule = False
-                            for schedule in course.schedules:
-                                day_id = schedule.day_id
-                                period = schedule.period
-
-                                if day_id in range(1, 6) and period >= 1 and period <= 6:
-                                    has_regular_schedule = True
-                                    instructor_name = get_instructor_name(course)
-
-                                    if course in major1_courses:
-                                        major_type = 'major1'
-                                    elif course in major2_courses:
-                                        major_type = 'major2'
-                                    elif course in others_courses:
-                                        major_type = 'others'
-                                    elif course in info_app_courses:
-                                        major_type = 'info_app'
-                                    else:
-                                        major_type = 'others'
-
-                                    already_exists = any(
-                                        item['course_title'] == course.course_title
-                                        for item in timetable[day_id][period]
-                                    )
-
-                                    if not already_exists:
-                                        classroom_names = ', '.join([
-                                            cc.classroom.classroom_name
-                                            for cc in course.course_classrooms
-                                        ]) if course.course_classrooms else ''
-
-                                        timetable[day_id][period].append({
-                                            'timetable_code': course.timetable_code,
-                                            'course_title': course.course_title,
-                                            'instructor_name': instructor_name,
-                                            'major_type': major_type,
-                                            'offering_category_id': course.offering_category_id,
-                                            'credits': course.credits,
-                                            'classroom_name': classroom_names,
-                                            'syllabus_url': course.syllabus_url or ''
-                                        })
-
-                            if not has_regular_schedule:
-                                instructor_name = get_instructor_name(course)
-
-                                if course in major1_courses:
-                                    major_type = 'major1'
-                                elif course in major2_courses:
-                                    major_type = 'major2'
-                                elif course in others_courses:
-                                    major_type = 'others'
-                                elif course in info_app_courses:
-                                    major_type = 'info_app'
-                                else:
-                                    major_type = 'others'
-
-                                classroom_names = ', '.join([
-                                    cc.classroom.classroom_name
-                                    for cc in course.course_classrooms
-                                ]) if course.course_classrooms else ''
-
-                                intensive_courses.append({
-                                    'timetable_code': course.timetable_code,
-                                    'course_title': course.course_title,
-                                    'instructor_name': instructor_name,
-                                    'major_type': major_type,
-                                    'offering_category_id': course.offering_category_id,
-                                    'credits': course.credits,
-                                    'classroom_name': classroom_names,
-                                    'syllabus_url': course.syllabus_url or '',
-                                    'class_format_name': course.class_format.class_format_name if course.class_format else '',
-                                    'course_type_name': course.course_type.course_type_name if course.course_type else ''
-                                })
-                        else:
-                            instructor_name = get_instructor_name(course)
-
-                            if course in major1_courses:
-                                major_type = 'major1'
-                            elif course in major2_courses:
-                                major_type = 'major2'
-                            elif course in others_courses:
-                                major_type = 'others'
-                            elif course in info_app_courses:
-                                major_type = 'info_app'
-                            else:
-                                major_type = 'others'
-
-                            classroom_names = ', '.join([
-                                cc.classroom.classroom_name
-                                for cc in course.course_classrooms
-                            ]) if course.course_classrooms else ''
-
-                            intensive_courses.append({
-                                'timetable_code': course.timetable_code,
-                                'course_title': course.course_title,
-                                'instructor_name': instructor_name,
-                                'major_type': major_type,
-                                'offering_category_id': course.offering_category_id,
-                                'credits': course.credits,
-                                'classroom_name': classroom_names,
-                                'syllabus_url': course.syllabus_url or '',
-                                'class_format_name': course.class_format.class_format_name if course.class_format else '',
-                                'course_type_name': course.course_type.course_type_name if course.course_type else ''
-                            })
-
-                    # 共有科目を検出
-                    shared_courses = [course for course in major1_courses if course in major2_courses]
-
-                    # 時間割の major_type を更新
-                    for day_id in range(1, 6):
-                        for period in range(1, 6):
-                            for course_item in timetable[day_id][period]:
-                                for course in shared_courses:
-                                    if course.course_title == course_item['course_title']:
-                                        course_item['major_type'] = 'shared'
-                                        break
-
-                    for course_item in intensive_courses:
-                        for course in shared_courses:
-                            if course.course_title == course_item['course_title']:
-                                course_item['major_type'] = 'shared'
-                                break
-
-                    # Markdownファイルとして出力
-                    filepath = export_timetable_to_markdown(
-                        semester, major1_id, major2_id, timetable,
-                        semester_name, major1_name, major2_name, fiscal_year, lang
-                    )
-
-                    exported_files.append(filepath)
-                    print(f"  → {filepath} を出力しました")
-
-    print(f"\n完了！合計 {len(exported_files)} ファイルを出力しました。")
+                if progress:
+                    progress(current, total, combinations[index], exported_files[index])
+        else:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor, as_completed
+
+            start_method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context(start_method),
+                initializer=init_export_worker,
+            ) as executor:
+                futures = {
+                    executor.submit(export_timetable_combination, *combinations[index]): index
+                    for index in pending
+                }
+                for future in as_completed(futures):
+                    index = futures[future]
+                    future.result()
+                    current += 1
+                    if progress:
+                        progress(current, total, combinations[index], exported_files[index])
+
+        # どの組み合わせにも該当しなくなったファイルを削除
+        removed_files = []
+        for path in docs_dir.glob('timetable_sem*.md'):
+            if path.name not in manifest:
+                path.unlink()
+                removed_files.append(path.name)
+
+        save_timetable_manifest(manifest)
+
+    print(f"\n完了！合計 {total} ファイル（出力 {len(pending)}、変更なし {total - len(pending)}、削除 {len(removed_files)}）")
     return exported_files
 
 
+def build_timetable_export_data(semester, major1_id, major2_id, result_data,
+                                semester_name, major1_name, major2_name, fiscal_year, lang='ja'):
+    """
+    時間割結果からJSON出力用のデータを作成する関数
+
+    Args:
+        semester: セメスタID
+        major1_id: 第一メジャーID
+        major2_id: 第二メジャーID
+        result_data: 時間割結果（build_timetable_resultの戻り値）
+        semester_name: セメスタ名
+        major1_name: 第一メジャー名
+        major2_name: 第二メジャー名
+        fiscal_year: 年度
+        lang: 言語 ('ja' or 'en')
+
+    Returns:
+        dict: JSON出力用のデータ
+    """
+    return {
+        'semester': semester,
+        'semester_name': semester_name,
+        'major1_id': major1_id,
+        'major1_name': major1_name,
+        'major2_id': major2_id,
+        'major2_name': major2_name,
+        'fiscal_year': fiscal_year,
+        'lang': lang,
+        'timetable': result_data['timetable'],
+        'intensive_courses': result_data['intensive_courses'],
+        'major1_credits': result_data['major1_credits'],
+        'shared_credits': result_data['shared_credits'],
+        'major2_credits': result_data['major2_credits'],
+        'others_credits': result_data['others_credits'],
+        'info_app_credits': result_data['info_app_credits'],
+        'total_credits': result_data['total_credits'],
+    }
+
+
+def iter_timetable_export_entries(include_json=False, languages=('ja',)):
+    """
+    全ての組み合わせの時間割を (ファイル名, 内容) として1つずつ生成する（ファイルには書き込まない）
+
+    Args:
+        include_json: Trueの場合はMarkdownに加えてJSONも生成する
+        languages: 出力する言語のリスト
+
+    Yields:
+        tuple: (ファイル名, 内容)
+    """
+    import json
+    from src.translations.field_values import get_semester_name, get_major_name
+
+    fiscal_year_dict = app.config.get('FISCAL_YEAR', {})
+
+    for semester, major1_id, major2_id in get_major_combinations():
+        result_data = get_base_timetable_result(semester, major1_id, major2_id)
+
+        for lang in languages:
+            semester_name = get_semester_name(semester, lang)
+            major1_name = get_major_name(major1_id, lang)
+            major2_name = get_major_name(major2_id, lang)
+            fiscal_year = fiscal_year_dict.get(lang, fiscal_year_dict.get('ja', ''))
+
+            filename = get_timetable_filename(semester, major1_id, major2_id, lang)
+            yield filename, render_timetable_markdown(
+                result_data['timetable'], semester_name, major1_name, major2_name, fiscal_year, lang
+            )
+
+            if include_json:
+                export_data = build_timetable_export_data(
+                    semester, major1_id, major2_id, result_data,
+                    semester_name, major1_name, major2_name, fiscal_year, lang
+                )
+                yield filename[:-len('.md')] + '.json', json.dumps(export_data, ensure_ascii=False, indent=2)
+
+
 def calculate_credits(course_list, major_id):
     """
     指定された科目リストとメジャーIDに基づき、必修・選択単位を計算するヘルパー関数。
@@ -494,17 +707,13 @@ def calculate_credits(course_list, major_id):
     credits = {'required': 0, 'elective': 0}
     for course in course_list:
         # このメジャーにおける履修区分を取得
-        for affiliated in course.affiliated_majors:
-            if affiliated.major_id == major_id:
-                category_id = affiliated.course_category_id
-                credits_val = course.credits
-                # 必修または必履修
-                if category_id in [CourseCategoryEnum.REQUIRED, CourseCategoryEnum.MANDATORY]:
-                    credits['required'] += credits_val
-                # 選択または選択必修
-                elif category_id in [CourseCategoryEnum.ELECTIVE, CourseCategoryEnum.REQUIRED_ELECTIVE]:
-                    credits['elective'] += credits_val
-                break
+        category_id = course.get_course_category_id(major_id)
+        # 必修または必履修
+        if category_id in [CourseCategoryEnum.REQUIRED, CourseCategoryEnum.MANDATORY]:
+            credits['required'] += course.credits
+        # 選択または選択必修
+        elif category_id in [CourseCategoryEnum.ELECTIVE, CourseCategoryEnum.REQUIRED_ELECTIVE]:
+            credits['elective'] += course.credits
     return credits
 
 
@@ -522,75 +731,111 @@ def build_timetable_result(semester, major1_id, major2_id, excluded_course_codes
         dict: 時間割データと単位情報を含む辞書
     """
     from src.translations.field_values import MajorEnum
-    from src.query import get_courses_by_semester_and_major
+    from src.catalog import get_catalog
 
     if excluded_course_codes is None:
         excluded_course_codes = set()
 
-    # 科目を取得
-    major1_courses = get_courses_by_semester_and_major(semester, major1_id)
-    major2_courses = get_courses_by_semester_and_major(semester, major2_id)
-    others_courses = get_courses_by_semester_and_major(semester, MajorEnum.OTHERS)
-    info_app_courses = get_courses_by_semester_and_major(semester, MajorEnum.INFO_APP)
+    # 科目を取得（起動時に読み込んだカタログから参照）
+    catalog = get_catalog()
+    major1_courses = list(catalog.get_courses_by_semester_and_major(semester, major1_id))
+    major2_courses = list(catalog.get_courses_by_semester_and_major(semester, major2_id))
+    others_courses = list(catalog.get_courses_by_semester_and_major(semester, MajorEnum.OTHERS))
+    info_app_courses = list(catalog.get_courses_by_semester_and_major(semester, MajorEnum.INFO_APP))
 
     # 全メジャーの科目を統合（重複排除）
-    all_courses = major1_courses.copy()
-    for course in major2_courses:
-        if course not in all_courses:
-            all_courses.append(course)
-    for course in others_courses:
-        if course not in all_courses:
-            all_courses.append(course)
-    for course in info_app_courses:
-        if course not in all_courses:
-            all_courses.append(course)
+    all_courses = merge_courses(major1_courses, major2_courses, others_courses, info_app_courses)
 
     # 除外する科目を除いた科目リストを作成
     filtered_courses = [course for course in all_courses if course.timetable_code not in excluded_course_codes]
 
     # 時間割を構築
-    timetable, intensive_courses = build_timetable_from_courses(
+    timetable_candidates, intensive_courses = build_timetable_from_courses(
         filtered_courses, major1_courses, major2_courses, others_courses, info_app_courses,
         major1_id, major2_id
     )
 
     # 共有科目を検出
-    shared_courses = [course for course in major1_courses if course in major2_courses]
+    major2_codes = get_course_codes(major2_courses)
+    shared_courses = [course for course in major1_courses if course.timetable_code in major2_codes]
+    shared_by_title = get_shared_courses_by_title(shared_courses)
 
     # 時間割の major_type を更新：共有科目を 'shared' に変更
-    for day_id in range(1, 6):
-        for period in range(1, 6):
-            for course_item in timetable[day_id][period]:
-                for course in shared_courses:
-                    if course.course_title == course_item['course_title']:
-                        course_item['major_type'] = 'shared'
-                        # course_category_idも更新（sharedの場合はmajor1の履修区分を使用）
-                        course_item['course_category_id'] = get_course_category_id(course, 'shared', major1_id, major2_id)
-                        break
-
+    shared_items = [
+        course_item
+        for day_id in range(1, 6)
+        for period in range(1, 6)
+        for course_item in timetable_candidates[day_id][period]
+    ]
     # 集中講義の major_type も更新
-    for course_item in intensive_courses:
-        for course in shared_courses:
-            if course.course_title == course_item['course_title']:
-                course_item['major_type'] = 'shared'
-                # course_category_idも更新（sharedの場合はmajor1の履修区分を使用）
-                course_item['course_category_id'] = get_course_category_id(course, 'shared', major1_id, major2_id)
-                break
+    shared_items.extend(intensive_courses)
+
+    for course_item in shared_items:
+        course = shared_by_title.get(course_item['course_title'])
+        if course is not None:
+            course_item['major_type'] = 'shared'
+            # course_category_idも更新（sharedの場合はmajor1の履修区分を使用）
+            course_item['course_category_id'] = get_course_category_id(course, 'shared', major1_id, major2_id)
 
     # 単位数を計算
-    major1_courses_exclusive = [course for course in major1_courses if course not in shared_courses and course in filtered_courses]
+    credits = calculate_result_credits(
+        major1_courses, major2_courses, others_courses, info_app_courses, shared_courses,
+        major1_id, major2_id, excluded_course_codes
+    )
+
+    return {
+        'timetable': dedupe_timetable_cells(timetable_candidates),
+        'timetable_candidates': timetable_candidates,
+        'intensive_courses': intensive_courses,
+        **credits,
+        'all_courses': all_courses,
+        'major1_courses': major1_courses,
+        'major2_courses': major2_courses,
+        'others_courses': others_courses,
+        'info_app_courses': info_app_courses,
+        'shared_courses': shared_courses,
+    }
+
+
+def calculate_result_credits(major1_courses, major2_courses, others_courses, info_app_courses,
+                             shared_courses, major1_id, major2_id, excluded_course_codes):
+    """
+    メジャー区分ごとの単位数と合計単位数を計算する
+
+    Args:
+        major1_courses: 第一メジャーの科目リスト
+        major2_courses: 第二メジャーの科目リスト
+        others_courses: その他メジャーの科目リスト
+        info_app_courses: 情報応用科目リスト
+        shared_courses: 共有科目リスト
+        major1_id: 第一メジャーID
+        major2_id: 第二メジャーID
+        excluded_course_codes: 除外する科目コードのセット
+
+    Returns:
+        dict: 単位情報（major1_credits, shared_credits, major2_credits,
+              others_credits, info_app_credits, total_credits）
+    """
+    from src.translations.field_values import MajorEnum
+
+    shared_codes = get_course_codes(shared_courses)
+
+    def is_included(course):
+        return course.timetable_code not in excluded_course_codes
+
+    major1_courses_exclusive = [course for course in major1_courses if course.timetable_code not in shared_codes and is_included(course)]
     major1_credits = calculate_credits(major1_courses_exclusive, major1_id)
 
-    shared_courses_filtered = [course for course in shared_courses if course in filtered_courses]
+    shared_courses_filtered = [course for course in shared_courses if is_included(course)]
     shared_credits = calculate_credits(shared_courses_filtered, major1_id)
 
-    major2_courses_exclusive = [course for course in major2_courses if course not in shared_courses and course in filtered_courses]
+    major2_courses_exclusive = [course for course in major2_courses if course.timetable_code not in shared_codes and is_included(course)]
     major2_credits = calculate_credits(major2_courses_exclusive, major2_id)
 
-    others_courses_filtered = [course for course in others_courses if course in filtered_courses]
+    others_courses_filtered = [course for course in others_courses if is_included(course)]
     others_credits = calculate_credits(others_courses_filtered, MajorEnum.OTHERS)
 
-    info_app_courses_filtered = [course for course in info_app_courses if course in filtered_courses]
+    info_app_courses_filtered = [course for course in info_app_courses if is_included(course)]
     info_app_credits = calculate_credits(info_app_courses_filtered, MajorEnum.INFO_APP)
 
     total_credits = (
@@ -602,165 +847,414 @@ def build_timetable_result(semester, major1_id, major2_id, excluded_course_codes
     )
 
     return {
-        'timetable': timetable,
-        'intensive_courses': intensive_courses,
         'major1_credits': major1_credits,
         'shared_credits': shared_credits,
         'major2_credits': major2_credits,
         'others_credits': others_credits,
         'info_app_credits': info_app_credits,
         'total_credits': total_credits,
-        'all_courses': all_courses,
-        'major1_courses': major1_courses,
-        'major2_courses': major2_courses,
-        'others_courses': others_courses,
-        'info_app_courses': info_app_courses,
     }
 
 
-def detect_and_resolve_conflicts(timetable):
+def exclude_courses_from_result(base_result, major1_id, major2_id, excluded_course_codes):
+    """
+    除外なしの時間割結果から、指定した科目を除外した結果を導出する
+
+    build_timetable_result(..., excluded_course_codes) と同じ結果を、
+    科目の再取得や時間割の再構築を行わずに作成する。
+
+    Args:
+        base_result: 除外なしの時間割結果（build_timetable_resultの戻り値）
+        major1_id: 第一メジャーID
+        major2_id: 第二メジャーID
+        excluded_course_codes: 除外する科目コードのセット
+
+    Returns:
+        dict: 時間割データと単位情報を含む辞書
+    """
+    timetable_candidates = {
+        day_id: {
+            period: [item for item in items if item['timetable_code'] not in excluded_course_codes]
+            for period, items in periods.items()
+        }
+        for day_id, periods in base_result['timetable_candidates'].items()
+    }
+    intensive_courses = [
+        item for item in base_result['intensive_courses']
+        if item['timetable_code'] not in excluded_course_codes
+    ]
+
+    credits = calculate_result_credits(
+        base_result['major1_courses'], base_result['major2_courses'],
+        base_result['others_courses'], base_result['info_app_courses'],
+        base_result['shared_courses'], major1_id, major2_id, excluded_course_codes
+    )
+
+    return {
+        **base_result,
+        'timetable': dedupe_timetable_cells(timetable_candidates),
+        'timetable_candidates': timetable_candidates,
+        'intensive_courses': intensive_courses,
+        **credits,
+    }
+
+
+def get_excluded_course_details(base_result, excluded_course_codes):
+    """
+    除外された科目の情報（単位数・履修区分・開講曜限など）をカタログから取得する
+
+    Args:
+        base_result: 除外なしの時間割結果（build_timetable_resultの戻り値）
+        excluded_course_codes: 除外する科目コードのセット
+
+    Returns:
+        list: 除外された科目の情報のリスト（時間割コード順、カタログにない科目は含まない）
+    """
+    from src.catalog import get_catalog
+
+    catalog = get_catalog()
+
+    # 時間割上の表示用データ（メジャー区分・履修区分）を時間割コードで引けるようにする
+    items_by_code = {}
+    for periods in base_result['timetable_candidates'].values():
+        for items in periods.values():
+            for item in items:
+                items_by_code.setdefault(item['timetable_code'], item)
+    for item in base_result['intensive_courses']:
+        items_by_code.setdefault(item['timetable_code'], item)
+
+    excluded_courses = []
+    for timetable_code in sorted(excluded_course_codes):
+        course = catalog.get_course(timetable_code)
+        if course is None:
+            continue
+        item = items_by_code.get(timetable_code, {})
+        excluded_courses.append({
+            'timetable_code': course.timetable_code,
+            'course_title': course.course_title,
+            'credits': course.credits,
+            'major_type': item.get('major_type'),
+            'course_category_id': item.get('course_category_id'),
+            'offering_category_id': course.offering_category_id,
+            'schedules': [
+                (day_id, period) for day_id, period in course.schedules
+                if day_id in range(1, 6) and 1 <= period <= 6
+            ],
+        })
+
+    return excluded_courses
+
+
+def detect_and_resolve_conflicts(timetable, slots=None):
     """
     時間割の重複（同時履修不可）をチェックする関数
     重複の判断基準: 開講曜限が重なっており、かつクォーターも重なっているとき
 
     Args:
         timetable: 時間割データ（辞書形式）
+        slots: チェックする (曜日ID, 時限) のリスト（Noneの場合は全ての曜日・時限）
 
     Returns:
         list: 重複情報のリスト
     """
-    from src.translations.field_values import DAY_MASTER, OfferingCategoryEnum
+    from src.translations.field_values import DAY_MASTER
+    from src.conflicts import get_quarter_mask
 
     conflicts = []
 
-    # クォーターの重複を判定するヘルパー関数
-    def quarters_overlap(offering_cat1, offering_cat2):
-        """2つの開講区分のクォーターが重複するかチェック"""
-        # 各開講区分が含むクォーターを定義
-        quarters_map = {
-            OfferingCategoryEnum.FIRST_QUARTER: [1],       # 1Q
-            OfferingCategoryEnum.SECOND_QUARTER: [2],      # 2Q
-            OfferingCategoryEnum.THIRD_QUARTER: [3],       # 3Q
-            OfferingCategoryEnum.FOURTH_QUARTER: [4],      # 4Q
-            OfferingCategoryEnum.FIRST_SEMESTER: [1, 2],   # 前期 (1Q + 2Q)
-            OfferingCategoryEnum.SECOND_SEMESTER: [3, 4],  # 後期 (3Q + 4Q)
-            OfferingCategoryEnum.FULL_YEAR: [1, 2, 3, 4]   # 通年
-        }
-
-        quarters1 = quarters_map.get(offering_cat1, [])
-        quarters2 = quarters_map.get(offering_cat2, [])
-
-        # 共通のクォーターがあれば重複
-        return bool(set(quarters1) & set(quarters2))
+    if slots is None:
+        slots = [(day_id, period) for day_id in range(1, 6) for period in range(1, 7)]
 
     # 各曜日・時限をチェック
-    for day_id in range(1, 6):
-        for period in range(1, 7):
-            courses_in_slot = timetable.get(day_id, {}).get(period, [])
-
-            # 2つ以上の科目がある場合、クォーターの重複をチェック
-            if len(courses_in_slot) > 1:
-                # クォーターが重複する科目のペアを検出
-                conflicting_courses = []
-
-                for i, course1 in enumerate(courses_in_slot):
-                    for j, course2 in enumerate(courses_in_slot):
-                        if i < j:  # 重複チェックを避けるため
-                            offering_cat1 = course1.get('offering_category_id')
-                            offering_cat2 = course2.get('offering_category_id')
-
-                            # クォーターが重複している場合
-                            if quarters_overlap(offering_cat1, offering_cat2):
-                                # まだ追加されていない科目を追加
-                                if course1 not in conflicting_courses:
-                                    conflicting_courses.append(course1)
-                                if course2 not in conflicting_courses:
-                                    conflicting_courses.append(course2)
-
-                # クォーターが重複する科目が2つ以上ある場合のみ記録
-                if len(conflicting_courses) >= 2:
-                    conflict_entry = {
-                        'day_id': day_id,
-                        'day_name_ja': DAY_MASTER[day_id]['ja'],
-                        'day_name_en': DAY_MASTER[day_id]['en'],
-                        'period': period,
-                        'courses': [
-                            {
-                                'timetable_code': course['timetable_code'],
-                                'course_title': course['course_title'],
-                                'instructor_name': course['instructor_name'],
-                                'major_type': course['major_type'],
-                                'credits': course['credits'],
-                                'offering_category_id': course['offering_category_id']
-                            }
-                            for course in conflicting_courses
-                        ]
-                    }
-                    conflicts.append(conflict_entry)
+    for day_id, period in slots:
+        courses_in_slot = timetable.get(day_id, {}).get(period, [])
+
+        # 2つ以上の科目がある場合、クォーターの重複をチェック
+        if len(courses_in_slot) > 1:
+            # 各科目のクォーターマスク
+            masks = [get_quarter_mask(course.get('offering_category_id')) for course in courses_in_slot]
+
+            # クォーターが重複する科目のペアを検出（検出順を保持）
+            conflicting_courses = []
+            conflicting_flags = 0
+
+            for i in range(len(courses_in_slot)):
+                for j in range(i + 1, len(courses_in_slot)):
+                    # クォーターが重複している場合
+                    if masks[i] & masks[j]:
+                        # まだ追加されていない科目を追加
+                        for index in (i, j):
+                            if not conflicting_flags >> index & 1:
+                                conflicting_flags |= 1 << index
+                                conflicting_courses.append(courses_in_slot[index])
+
+            # クォーターが重複する科目が2つ以上ある場合のみ記録
+            if len(conflicting_courses) >= 2:
+                conflict_entry = {
+                    'day_id': day_id,
+                    'day_name_ja': DAY_MASTER[day_id]['ja'],
+                    'day_name_en': DAY_MASTER[day_id]['en'],
+                    'period': period,
+                    'courses': [
+                        {
+                            'timetable_code': course['timetable_code'],
+                            'course_title': course['course_title'],
+                            'instructor_name': course['instructor_name'],
+                            'major_type': course['major_type'],
+                            'credits': course['credits'],
+                            'offering_category_id': course['offering_category_id'],
+                            'course_category_id': course['course_category_id']
+                        }
+                        for course in conflicting_courses
+                    ]
+                }
+                conflicts.append(conflict_entry)
 
     return conflicts
 
 
-def save_conflicts_to_json(conflicts, semester, semester_name, major1_id, major1_name,
-                           major2_id, major2_name, fiscal_year):
+def detect_conflicts_with_graph(timetable, semester, courses):
     """
-    重複情報をJSONファイルに保存する関数
+    科目重複グラフ（インポート時に算出済み）を使って時間割の重複をチェックする
+
+    時間割に含まれる科目の間に重複の組がなければ時間割を走査せずに空リストを返し、
+    組がある場合はその曜日・時限のみをdetect_and_resolve_conflictsで確認する。
+
+    Args:
+        timetable: 時間割データ（辞書形式）
+        semester: セメスタID
+        courses: 時間割に含まれる科目レコードのリスト
+
+    Returns:
+        list: 重複情報のリスト（detect_and_resolve_conflictsと同じ形式）
+    """
+    from src.catalog import get_catalog
+    from src.conflicts import iter_slots
+
+    catalog = get_catalog()
+    course_codes = {course.timetable_code for course in courses}
+
+    # 重複する組が共有する曜日・時限を集める
+    slot_mask = 0
+    for course in courses:
+        for other_code in catalog.get_conflicting_courses(semester, course.timetable_code) & course_codes:
+            slot_mask |= course.slot_mask & catalog.courses[other_code].slot_mask
+
+    if not slot_mask:
+        return []
+
+    return detect_and_resolve_conflicts(timetable, slots=list(iter_slots(slot_mask)))
+
+
+# 時間割結果のキャッシュ
+# (セメスタ, 第一メジャーID, 第二メジャーID, データセットバージョン) → 除外なしの時間割結果
+# キャッシュした結果は全リクエストで共有するため、変更しないこと
+_result_cache = {}
+
+# 除外する科目を指定した時間割結果のキャッシュ（エントリ数と概算バイト数で上限を設ける）
+# (セメスタ, 第一メジャーID, 第二メジャーID, 除外する科目コード, データセットバージョン) → 時間割結果
+_excluded_result_cache = LRUCache(
+    max_entries=app.config.get('RESULT_CACHE_MAX_ENTRIES', 512),
+    max_bytes=app.config.get('RESULT_CACHE_MAX_BYTES', 64 * 1024 * 1024),
+)
+
+
+def get_major_combinations():
+    """
+    全ての基本の組み合わせ（semester × major1 × major2、同じメジャー同士を除く）を返す
+
+    Returns:
+        list: (セメスタ, 第一メジャーID, 第二メジャーID) のリスト
+    """
+    from src.translations.field_values import SEMESTERS, MAJOR_MASTER, MajorEnum
+
+    # 「その他」と「情報応用科目」を除外したメジャー
+    major_ids = [
+        major_id for major_id in MAJOR_MASTER.keys()
+        if major_id not in [MajorEnum.OTHERS, MajorEnum.INFO_APP]
+    ]
+
+    return [
+        (semester, major1_id, major2_id)
+        for semester in SEMESTERS.keys()
+        for major1_id in major_ids
+        for major2_id in major_ids
+        if major1_id != major2_id
+    ]
+
+
+def is_major_combination(semester, major1_id, major2_id):
+    """
+    基本の組み合わせ（get_major_combinationsに含まれるもの）かどうかを判定する
 
     Args:
-        conflicts: 重複情報のリスト
         semester: セメスタID
-        semester_name: セメスタ名
         major1_id: 第一メジャーID
-        major1_name: 第一メジャー名
         major2_id: 第二メジャーID
-        major2_name: 第二メジャー名
-        fiscal_year: 年度
 
     Returns:
-        str: 保存されたファイルパス（重複がない場合はNone）
+        bool: 基本の組み合わせの場合はTrue
     """
-    if not conflicts:
-        return None
+    return (semester, major1_id, major2_id) in get_major_combinations()
 
-    import json
-    from pathlib import Path
 
-    # 出力ディレクトリを作成
-    base_dir = Path(__file__).resolve().parent.parent.parent
-    conflicts_dir = base_dir / "docs" / "conflicts"
-    conflicts_dir.mkdir(exist_ok=True)
+def get_base_timetable_result(semester, major1_id, major2_id):
+    """
+    除外なしの時間割結果（重複情報を含む）をキャッシュから取得する（なければ構築）
 
-    # ファイル名を生成
-    conflict_filename = f"conflicts_sem{semester}_major1-{major1_id}_major2-{major2_id}.json"
-    conflict_filepath = conflicts_dir / conflict_filename
+    Args:
+        semester: セメスタID
+        major1_id: 第一メジャーID
+        major2_id: 第二メジャーID
 
-    # 重複する時間割コードのリストを作成
-    conflict_codes = set()
-    for conflict in conflicts:
-        for course in conflict['courses']:
-            conflict_codes.add(course['timetable_code'])
+    Returns:
+        dict: build_timetable_resultの戻り値に重複情報（conflicts）を加えた辞書
+    """
+    from src.catalog import get_catalog
+
+    key = (semester, major1_id, major2_id, get_catalog().version)
+    result_data = _result_cache.get(key)
+    if result_data is None:
+        result_data = build_timetable_result(semester, major1_id, major2_id)
+        result_data['conflicts'] = detect_conflicts_with_graph(
+            result_data['timetable'], semester, result_data['all_courses']
+        )
+        # キャッシュするのは基本の組み合わせのみ（任意の値でキャッシュが増え続けないようにする）
+        if is_major_combination(semester, major1_id, major2_id):
+            _result_cache[key] = result_data
+    return result_data
 
-    # JSON形式で保存
-    conflict_data = {
-        'semester': semester,
-        'semester_name': semester_name,
-        'major1_id': major1_id,
-        'major1_name': major1_name,
-        'major2_id': major2_id,
-        'major2_name': major2_name,
-        'fiscal_year': fiscal_year,
-        'conflict_summary': {
-            'total_conflicts': len(conflicts),
-            'total_conflict_courses': len(conflict_codes),
-            'conflict_codes_list': sorted(list(conflict_codes))
-        },
-        'conflicts': conflicts
+
+def get_timetable_result(semester, major1_id, major2_id, excluded_course_codes=None):
+    """
+    時間割結果（重複情報を含む）を取得する
+
+    除外する科目がある場合は、キャッシュした除外なしの結果から導出し、LRUキャッシュに保持する。
+
+    Args:
+        semester: セメスタID
+        major1_id: 第一メジャーID
+        major2_id: 第二メジャーID
+        excluded_course_codes: 除外する科目コードのセット（オプション）
+
+    Returns:
+        dict: 時間割データ、単位情報、重複情報を含む辞書
+    """
+    base_result = get_base_timetable_result(semester, major1_id, major2_id)
+
+    # 時間割に含まれる科目のみが除外の対象
+    excluded_course_codes = {
+        course.timetable_code for course in base_result['all_courses']
+        if course.timetable_code in (excluded_course_codes or ())
+    }
+    if not excluded_course_codes:
+        return base_result
+
+    from src.catalog import get_catalog
+
+    key = (semester, major1_id, major2_id, frozenset(excluded_course_codes), get_catalog().version)
+    result_data = _excluded_result_cache.get(key)
+    if result_data is None:
+        result_data = exclude_courses_from_result(base_result, major1_id, major2_id, excluded_course_codes)
+        result_data['conflicts'] = detect_conflicts_with_graph(
+            result_data['timetable'], semester,
+            [course for course in base_result['all_courses'] if course.timetable_code not in excluded_course_codes]
+        )
+        _excluded_result_cache.put(key, result_data)
+    return result_data
+
+
+def get_result_cache_stats():
+    """
+    時間割結果キャッシュの統計情報を取得する
+
+    Returns:
+        dict: 除外なしの結果と除外指定ありの結果それぞれのキャッシュ統計
+    """
+    return {
+        'base': {'entries': len(_result_cache)},
+        'excluded': _excluded_result_cache.stats(),
     }
 
-    with open(conflict_filepath, 'w', encoding='utf-8') as f:
-        json.dump(conflict_data, f, ensure_ascii=False, indent=2)
 
-    return str(conflict_filepath)
+def warm_result_cache():
+    """
+    全ての基本の組み合わせの時間割結果を事前に構築する（起動時に実行）
+
+    Returns:
+        int: キャッシュした組み合わせの数
+    """
+    from src.catalog import get_catalog
+
+    # 古いデータセットの結果を破棄
+    version = get_catalog().version
+    for key in list(_result_cache.keys()):
+        if key[3] != version:
+            _result_cache.pop(key, None)
+    _excluded_result_cache.clear()
+
+    combinations = get_major_combinations()
+    for semester, major1_id, major2_id in combinations:
+        get_base_timetable_result(semester, major1_id, major2_id)
+
+    return len(combinations)
+
+
+def iter_alternative_timetables(semester, major1_id, major2_id):
+    """
+    重複のない時間割（重複する科目の極大な組み合わせ）を合計単位数の多い順に1つずつ返す
+
+    除外なしの時間割結果の重複情報から重複グラフを作成し、
+    全ての組み合わせを作らずに遅延評価で列挙する。
+
+    Args:
+        semester: セメスタID
+        major1_id: 第一メジャーID
+        major2_id: 第二メジャーID
+
+    Yields:
+        dict: 選択した科目・除外する科目・単位情報を含む辞書
+    """
+    from src.solver import build_conflict_graph, iter_maximal_independent_sets
+
+    base_result = get_base_timetable_result(semester, major1_id, major2_id)
+    items, neighbors = build_conflict_graph(base_result['conflicts'])
+
+    def calculate_total_credits(excluded_course_codes):
+        return calculate_result_credits(
+            base_result['major1_courses'], base_result['major2_courses'],
+            base_result['others_courses'], base_result['info_app_courses'],
+            base_result['shared_courses'], major1_id, major2_id, excluded_course_codes
+        )
+
+    # 各科目の単位数への寄与（除外した場合に減る単位数）
+    base_total_credits = base_result['total_credits']
+    weights = [
+        base_total_credits - calculate_total_credits({item['timetable_code']})['total_credits']
+        for item in items
+    ]
+
+    for selected_weight, selected in iter_maximal_independent_sets(weights, neighbors):
+        selected_items = [item for index, item in enumerate(items) if selected >> index & 1]
+        excluded_course_codes = {
+            item['timetable_code'] for index, item in enumerate(items)
+            if not selected >> index & 1
+        }
+        credits = calculate_total_credits(excluded_course_codes)
+
+        yield {
+            'selected_courses': [
+                {
+                    'timetable_code': item['timetable_code'],
+                    'course_title': item['course_title'],
+                    'credits': item['credits'],
+                    'major_type': item['major_type'],
+                }
+                for item in selected_items
+            ],
+            'excluded_course_codes': sorted(excluded_course_codes),
+            **credits,
+        }
 
 
 @app.route('/export-timetables')
@@ -780,6 +1274,139 @@ def export_timetables_route():
         }, 500
 
 
+@app.route('/export-timetables.zip')
+def export_timetables_zip_route():
+    """
+    時間割を全てZIPとしてストリーミングで返すルート（サーバーにはファイルを書き込まない）
+
+    クエリパラメータ: json=1 の場合はMarkdownに加えてJSONも含める
+    """
+    from flask import Response
+    from src.zipstream import iter_zip_stream
+
+    include_json = request.args.get('json', '') in ('1', 'true', 'yes')
+
+    return Response(
+        iter_zip_stream(iter_timetable_export_entries(include_json=include_json)),
+        mimetype='application/zip',
+        headers={'Content-Disposition': 'attachment; filename=timetables.zip'}
+    )
+
+
+@app.route('/export-jobs', methods=['POST'])
+def create_export_job_route():
+    """時間割の一括出力をバックグラウンドジョブとして登録するルート"""
+    from src.jobs import get_job_manager, ExportJobLimitError
+
+    # ワーカープロセス数は1〜設定値（EXPORT_WORKERS）の範囲に制限する
+    workers = request.args.get('workers', type=int)
+    if workers is not None:
+        workers = min(max(workers, 1), app.config.get('EXPORT_WORKERS', 1))
+
+    try:
+        job = get_job_manager().submit(workers=workers)
+    except ExportJobLimitError as e:
+        return {
+            'status': 'error',
+            'message': str(e)
+        }, 429
+
+    return {
+        'status': 'success',
+        'job_id': job['job_id'],
+        'job': job,
+        'status_url': url_for('export_job_route', job_id=job['job_id']),
+    }, 202
+
+
+@app.route('/export-jobs/<job_id>')
+def export_job_route(job_id):
+    """一括出力ジョブの進捗を返すルート"""
+    from src.jobs import get_job_manager
+
+    job = get_job_manager().get(job_id)
+    if job is None:
+        return {
+            'status': 'error',
+            'message': 'job not found'
+        }, 404
+
+    return job, 200
+
+
+@app.route('/export-jobs/<job_id>/artifact')
+def export_job_artifact_route(job_id):
+    """一括出力ジョブの成果物（ZIP）をダウンロードするルート"""
+    from flask import send_file
+    from src.jobs import get_job_manager, get_artifact_path, JOB_SUCCEEDED
+
+    job = get_job_manager().get(job_id)
+    if job is None:
+        return {
+            'status': 'error',
+            'message': 'job not found'
+        }, 404
+
+    if job['status'] != JOB_SUCCEEDED:
+        return {
+            'status': 'error',
+            'message': f"job is {job['status']}",
+            'job': job
+        }, 409
+
+    return send_file(
+        get_artifact_path(job_id),
+        mimetype='application/zip',
+        as_attachment=True,
+        download_name=f"timetables_{job_id}.zip"
+    )
+
+
+@app.route('/cache-stats')
+def cache_stats_route():
+    """時間割結果キャッシュの統計情報を返すルート"""
+    return get_result_cache_stats(), 200
+
+
+@app.route('/alternatives')
+def alternatives_route():
+    """
+    重複のない時間割の候補を合計単位数の多い順にNDJSON形式でストリーミングするルート
+
+    クエリパラメータ: semester, major1_id, major2_id, offset（既定0）, limit（既定・上限は設定値）
+    """
+    import json
+    from itertools import islice
+    from flask import Response, stream_with_context
+
+    semester = request.args.get('semester', type=int)
+    major1_id = request.args.get('major1_id', type=int)
+    major2_id = request.args.get('major2_id', type=int)
+
+    if not all([semester, major1_id, major2_id]):
+        return {
+            'status': 'error',
+            'message': 'semester, major1_id, major2_id are required'
+        }, 400
+
+    if not is_major_combination(semester, major1_id, major2_id):
+        return {
+            'status': 'error',
+            'message': 'unknown semester or major combination'
+        }, 400
+
+    max_limit = app.config.get('ALTERNATIVES_MAX_LIMIT', 100)
+    offset = max(request.args.get('offset', 0, type=int), 0)
+    limit = min(max(request.args.get('limit', app.config.get('ALTERNATIVES_DEFAULT_LIMIT', 20), type=int), 0), max_limit)
+
+    def generate():
+        alternatives = iter_alternative_timetables(semester, major1_id, major2_id)
+        for rank, alternative in enumerate(islice(alternatives, offset, offset + limit), start=offset + 1):
+            yield json.dumps({'rank': rank, **alternative}, ensure_ascii=False) + '\n'
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+
 @app.route('/', methods=['GET', 'POST'])
 def index():
     """ホームページ - 時間割選択"""
@@ -817,8 +1444,10 @@ def result():
     """時間割結果ページ"""
     from src.translations.field_values import get_semester_name, get_major_name
 
-    # 現在の言語を取得（クエリパラメータから）
-    current_lang = request.args.get('lang', app.config.get('DEFAULT_LANGUAGE', 'ja'))
+    from src.views.context_processors import get_current_lang
+
+    # 現在の言語を取得（クエリパラメータ → クッキー → Accept-Language → デフォルト）
+    current_lang = get_current_lang()
 
     # 型チェック: current_langは常にstrであることを保証
     assert isinstance(current_lang, str)
@@ -834,8 +1463,11 @@ def result():
     # 空文字列を除去
     excluded_courses.discard('')
 
-    # データがない場合はホーム画面にリダイレクト
-    if not all([semester, major1_id, major2_id]):
+    # 重複を自動で解決するか
+    auto_resolve = request.args.get('auto_resolve', '') in ('1', 'true', 'yes')
+
+    # データがない場合・存在しない組み合わせの場合はホーム画面にリダイレクト
+    if not all([semester, major1_id, major2_id]) or not is_major_combination(semester, major1_id, major2_id):
         return redirect(url_for('index'))
 
     # 型チェック後、semester, major1_id, major2_idはNoneではないことが保証されている
@@ -850,14 +1482,28 @@ def result():
     fiscal_year_dict = app.config.get('FISCAL_YEAR', {})
     fiscal_year = fiscal_year_dict.get(current_lang, fiscal_year_dict.get('ja', ''))
 
-    # 時間割と単位情報を構築（除外する科目を指定）
-    result_data = build_timetable_result(semester, major1_id, major2_id, excluded_courses)
+    # 時間割と単位情報を取得（除外する科目を指定）
+    result_data = get_timetable_result(semester, major1_id, major2_id, excluded_courses)
 
     # 時間割の重複チェック
-    conflicts = detect_and_resolve_conflicts(result_data['timetable'])
+    conflicts = result_data['conflicts']
+
+    # 重複を自動で解決する場合は、目的関数が最大となる組み合わせ以外の科目を除外
+    if auto_resolve:
+        from src.solver import resolve_conflicts
+        objective = app.config.get('AUTO_RESOLVE_OBJECTIVE', ('required', 'credits', 'major1'))
+
+        while conflicts:
+            resolved_courses = resolve_conflicts(conflicts, objective) - excluded_courses
+            if not resolved_courses:
+                break
+            excluded_courses |= resolved_courses
+            result_data = get_timetable_result(semester, major1_id, major2_id, excluded_courses)
+            conflicts = result_data['conflicts']
 
-    # 重複情報をJSONファイルに保存（検証用）
-    save_conflicts_to_json(
+    # 重複情報を重複ログに記録（検証用、書き込みはバックグラウンドで行う）
+    from src.conflict_log import log_conflicts
+    log_conflicts(
         conflicts, semester, semester_name,
         major1_id, major1_name, major2_id, major2_name,
         fiscal_year
@@ -879,15 +1525,12 @@ def result():
             if result_data['timetable'][day_id][period]:  # 授業がある場合
                 max_period = max(max_period, period)
 
-    # 除外された科目の情報を取得
-    excluded_course_names = []
+    # 除外された科目の情報を取得（カタログから一括で参照）
+    excluded_course_details = []
     if excluded_courses:
-        from src.models import Course
-        from src import db
-        for timetable_code in excluded_courses:
-            course = db.session.query(Course).filter_by(timetable_code=timetable_code).first()
-            if course:
-                excluded_course_names.append(course.course_title)
+        excluded_course_details = get_excluded_course_details(
+            get_base_timetable_result(semester, major1_id, major2_id), excluded_courses
+        )
 
     return render_template(
         'result.html',
@@ -907,7 +1550,7 @@ def result():
         info_app_credits=result_data['info_app_credits'],
         total_credits=result_data['total_credits'],
         max_period=max_period,
-        excluded_course_names=excluded_course_names,
+        excluded_courses=excluded_course_details,
     )
 
 
@@ -919,19 +1562,16 @@ def choose():
     major1_id = request.form.get('major1_id', type=int)
     major2_id = request.form.get('major2_id', type=int)
 
-    # データがない場合はホーム画面にリダイレクト
-    if not all([semester, major1_id, major2_id]):
+    # データがない場合・存在しない組み合わせの場合はホーム画面にリダイレクト
+    if not all([semester, major1_id, major2_id]) or not is_major_combination(semester, major1_id, major2_id):
         return redirect(url_for('index'))
 
     # 型チェック後、semester, major1_id, major2_idはNoneではないことが保証されている
     assert semester is not None and major1_id is not None and major2_id is not None
 
     # 重複を再検出して、ユーザーが選択しなかった科目（除外する科目）を特定
-    # 一時的にexcluded_course_codes=Noneで時間割を構築
-    temp_result = build_timetable_result(semester, major1_id, major2_id)
-
-    # 重複を検出
-    conflicts_redetected = detect_and_resolve_conflicts(temp_result['timetable'])
+    # 除外なしの時間割結果（キャッシュ済み）の重複情報を使用
+    conflicts_redetected = get_base_timetable_result(semester, major1_id, major2_id)['conflicts']
 
     # ユーザーが選択した優先科目を取得
     selected_courses = []
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+ZIPのストリーミング生成
+Streaming ZIP Generation
+
+ファイルに書き出さずに、ZIPのバイト列をエントリごとに順に生成する。
+出力先をシークできないストリームとして扱うため、各エントリはデータ記述子付きで
+書き込まれ、メモリに保持するのは1エントリ分のデータと中央ディレクトリのみとなる。
+"""
+
+import io
+import time
+import zipfile
+
+
+class _ZipStreamBuffer(io.RawIOBase):
+    """ZipFileの書き込み先（書き込まれたバイト列を取り出すまで保持する）"""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def seekable(self):
+        return False
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def pop(self) -> bytes:
+        """書き込まれたバイト列を取り出して破棄する"""
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def iter_zip_stream(entries, compression=zipfile.ZIP_DEFLATED):
+    """
+    (ファイル名, 内容) を順に受け取り、ZIPのバイト列を順に返す
+
+    Args:
+        entries: (ZIP内のファイル名, 内容（strまたはbytes）) のイテラブル
+        compression: 圧縮方式
+
+    Yields:
+        bytes: ZIPのバイト列の断片
+    """
+    buffer = _ZipStreamBuffer()
+    date_time = time.localtime()[:6]
+
+    with zipfile.ZipFile(buffer, mode='w', compression=compression) as zf:
+        for name, content in entries:
+            info = zipfile.ZipInfo(name, date_time=date_time)
+            info.compress_type = compression
+            info.external_attr = 0o644 << 16
+            zf.writestr(info, content)
+
+            data = buffer.pop()
+            if data:
+                yield data
+
+    # 中央ディレクトリ
+    data = buffer.pop()
+    if data:
+        yield data
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""テスト共通設定（リポジトリのルートをインポートパスに追加し、合成したカタログを提供する）"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.catalog import CourseRecord, build_catalog, set_catalog  # noqa: E402
+from src.conflicts import get_quarter_mask, get_slot_mask  # noqa: E402
+from src.translations.field_values import CourseCategoryEnum, MajorEnum, OfferingCategoryEnum  # noqa: E402
+
+SEMESTER = 5
+
+
+def make_record(code, schedules, course_categories):
+    """合成した科目レコードを作成する"""
+    offering_category_id = OfferingCategoryEnum.FIRST_SEMESTER
+    return CourseRecord(
+        timetable_code=code,
+        course_title=f"科目{code}",
+        credits=2,
+        syllabus_url='',
+        offering_category_id=offering_category_id,
+        instructor_name='教員',
+        classroom_name='教室',
+        class_format_name='',
+        course_type_name='',
+        schedules=tuple(schedules),
+        semesters=(SEMESTER,),
+        course_categories=tuple(course_categories),
+        slot_mask=get_slot_mask(schedules),
+        quarter_mask=get_quarter_mask(offering_category_id),
+    )
+
+
+@pytest.fixture
+def catalog():
+    """データベースを使わずに合成したカタログ（テスト後は次回参照時に再読み込みする状態に戻す）"""
+    # IS・NCの両方に所属し、メジャーごとに履修区分が異なる科目を含める
+    catalog = build_catalog([
+        make_record('A001', [(1, 1)], [(MajorEnum.IS, CourseCategoryEnum.REQUIRED),
+                                       (MajorEnum.NC, CourseCategoryEnum.ELECTIVE)]),
+        make_record('A002', [(1, 2)], [(MajorEnum.IS, CourseCategoryEnum.REQUIRED)]),
+        make_record('A003', [(2, 1)], [(MajorEnum.NC, CourseCategoryEnum.REQUIRED_ELECTIVE)]),
+        make_record('A004', [], [(MajorEnum.NC, CourseCategoryEnum.ELECTIVE)]),
+    ])
+    set_catalog(catalog)
+    try:
+        yield catalog
+    finally:
+        set_catalog(None)
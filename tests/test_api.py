@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+時間割JSON APIのテスト（データベースを使わずに合成したカタログで実行）
+"""
+
+import pytest
+
+from conftest import SEMESTER
+from src import app
+from src.translations.field_values import CourseCategoryEnum, MajorEnum
+
+
+@pytest.fixture
+def client(catalog):
+    return app.test_client()
+
+
+def expand_courses(courses, result):
+    """結果の時間割表・集中講義を (時間割コード, メジャー種別, 履修区分ID) に展開する"""
+    def expand(index):
+        course = courses[index]
+        return course['timetable_code'], course['major_type'], course['course_category_id']
+
+    grid = [[[expand(index) for index in cell] for cell in day] for day in result['grid']]
+    intensive_courses = [expand(index) for index in result['intensive_courses']]
+    return grid, intensive_courses
+
+
+def test_batch_keeps_per_combination_course_metadata(client):
+    """メジャーを入れ替えた組み合わせでも、各結果の科目のメジャー種別・履修区分が単独取得と一致する"""
+    items = [
+        {'semester': SEMESTER, 'major1_id': MajorEnum.IS, 'major2_id': MajorEnum.NC},
+        {'semester': SEMESTER, 'major1_id': MajorEnum.NC, 'major2_id': MajorEnum.IS},
+    ]
+    response = client.post('/api/v1/timetables:batch', json={'items': items})
+    assert response.status_code == 200
+    batch = response.get_json()
+
+    for item, result in zip(items, batch['results']):
+        single = client.get(
+            f"/api/v1/timetable?semester={item['semester']}"
+            f"&major1_id={item['major1_id']}&major2_id={item['major2_id']}"
+        ).get_json()
+        assert expand_courses(batch['courses'], result) == expand_courses(single['courses'], single)
+
+    # 両方のメジャーに所属する科目は、組み合わせごとに第一メジャーの履修区分になる
+    first, second = (expand_courses(batch['courses'], result)[0][0][0] for result in batch['results'])
+    assert first == [('A001', 'shared', CourseCategoryEnum.REQUIRED)]
+    assert second == [('A001', 'shared', CourseCategoryEnum.ELECTIVE)]
+
+
+def test_unknown_combination_is_rejected_and_not_cached(client):
+    """存在しない組み合わせは400を返し、時間割結果のキャッシュにも残らない"""
+    from src.views.main import _result_cache
+
+    size = len(_result_cache)
+    for semester in range(100, 110):
+        response = client.get(f"/api/v1/timetable?semester={semester}&major1_id=1&major2_id=2")
+        assert response.status_code == 400
+    assert client.get('/alternatives?semester=100&major1_id=1&major2_id=2').status_code == 400
+    assert client.get('/result?semester=100&major1_id=1&major2_id=2').status_code == 302
+
+    response = client.post('/api/v1/timetables:batch', json={'items': [
+        {'semester': SEMESTER, 'major1_id': MajorEnum.IS, 'major2_id': MajorEnum.IS},
+    ]})
+    assert response.status_code == 400
+    assert len(_result_cache) == size
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""
+LRUキャッシュのテスト
+"""
+
+import sys
+
+from src.cache import LRUCache, estimate_size
+
+
+def test_evicts_least_recently_used_entry():
+    """エントリ数の上限を超えた場合は最も長く参照されていないエントリを破棄する"""
+    cache = LRUCache(max_entries=2, sizeof=lambda value: 1)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1  # aを最近使用したものにする
+
+    cache.put('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+    assert len(cache) == 2
+
+
+def test_evicts_by_bytes():
+    """概算バイト数の上限を超えた場合は古いエントリから破棄し、上限を超える値はキャッシュしない"""
+    cache = LRUCache(max_entries=10, max_bytes=10, sizeof=len)
+    cache.put('a', 'xxxx')
+    cache.put('b', 'xxxx')
+    cache.put('c', 'xxxx')
+    assert cache.get('a') is None
+    assert cache.stats()['bytes'] == 8
+
+    cache.put('d', 'x' * 11)
+    assert cache.get('d') is None
+    assert cache.stats()['entries'] == 2
+
+
+def test_put_replaces_existing_entry_size():
+    """同じキーへの登録は古い値のバイト数を差し引く"""
+    cache = LRUCache(max_entries=10, max_bytes=100, sizeof=len)
+    cache.put('a', 'x' * 50)
+    cache.put('a', 'x' * 10)
+    assert cache.stats()['bytes'] == 10
+    assert cache.get('a') == 'x' * 10
+
+
+def test_counts_hits_misses_and_evictions():
+    """ヒット・ミス・破棄の回数を記録し、clearでは統計を保持する"""
+    cache = LRUCache(max_entries=1, sizeof=lambda value: 1)
+    cache.put('a', 1)
+    cache.get('a')
+    cache.get('b', 'default')
+    cache.put('b', 2)
+    cache.clear()
+
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['evictions']) == (1, 1, 1)
+    assert (stats['entries'], stats['bytes']) == (0, 0)
+
+
+def test_estimate_size_counts_shared_objects_once():
+    """中身まで辿って合計し、同じオブジェクトは1回だけ数える"""
+    item = 'x' * 100
+    assert estimate_size([item]) == sys.getsizeof([item]) + sys.getsizeof(item)
+    assert estimate_size([item, item]) == sys.getsizeof([item, item]) + sys.getsizeof(item)
+
+    value = {'key': (1, item)}
+    expected = sys.getsizeof(value) + sys.getsizeof('key') + sys.getsizeof((1, item)) \
+        + sys.getsizeof(1) + sys.getsizeof(item)
+    assert estimate_size(value) == expected
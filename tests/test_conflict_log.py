@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+重複ログの書き込み（ローテーション・キューが一杯の場合の破棄）のテスト
+"""
+
+import json
+import threading
+
+from src.conflict_log import ConflictLogWriter
+
+
+def read_records(path):
+    if not path.exists():
+        return []
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line)['index'] for line in f]
+
+
+def test_rotates_when_file_exceeds_max_bytes(tmp_path):
+    """上限サイズを超える場合はローテーションし、保持数を超えた古いファイルは削除する"""
+    path = tmp_path / 'conflicts.jsonl'
+    record_size = len(json.dumps({'index': 0, 'padding': 'x' * 100}) + '\n')
+    writer = ConflictLogWriter(path, max_bytes=record_size * 3, backup_count=2, batch_size=1, flush_interval=0)
+
+    for index in range(10):
+        assert writer.write({'index': index, 'padding': 'x' * 100})
+        writer.flush(timeout=5)
+
+    assert writer.written == 10
+    assert read_records(path) == [9]
+    assert read_records(path.with_name('conflicts.jsonl.1')) == [6, 7, 8]
+    assert read_records(path.with_name('conflicts.jsonl.2')) == [3, 4, 5]
+    assert not path.with_name('conflicts.jsonl.3').exists()
+    assert path.stat().st_size <= record_size * 3
+
+
+def test_rotation_without_backups_discards_old_records(tmp_path):
+    """保持数が0の場合は古いファイルを残さない"""
+    path = tmp_path / 'conflicts.jsonl'
+    writer = ConflictLogWriter(path, max_bytes=1, backup_count=0, batch_size=1, flush_interval=0)
+
+    for index in range(3):
+        writer.write({'index': index})
+        writer.flush(timeout=5)
+
+    assert read_records(path) == [2]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['conflicts.jsonl', 'conflicts.jsonl.lock']
+
+
+def test_drops_records_when_queue_is_full(tmp_path, monkeypatch):
+    """キューが一杯の場合は記録を破棄し、複数のスレッドから破棄しても件数を失わない"""
+    writer = ConflictLogWriter(tmp_path / 'conflicts.jsonl', max_queue=1)
+    # 書き込みスレッドを起動しない（キューから取り出されない状態にする）
+    monkeypatch.setattr(writer, '_ensure_thread', lambda: None)
+
+    assert writer.write({'index': 0})
+    assert not writer.write({'index': 1})
+    assert writer.dropped == 1
+
+    threads = [
+        threading.Thread(target=lambda: [writer.write({'index': index}) for index in range(2000)])
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert writer.dropped == 1 + 8 * 2000
+    assert writer.written == 0
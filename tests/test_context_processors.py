@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""
+言語・テーマの決定のテスト
+"""
+
+from conftest import SEMESTER
+from src import app
+from src.translations.field_values import MajorEnum
+from src.views.context_processors import (
+    LANG_COOKIE_NAME, THEME_COOKIE_NAME, get_canonical_url, resolve_lang_and_theme,
+)
+
+
+def test_unknown_theme_falls_back_to_default():
+    """設定にないテーマはクエリパラメータ・クッキーのどちらで指定されてもデフォルトになる"""
+    default_theme = app.config['DEFAULT_THEME_NAME']
+
+    with app.test_request_context('/?theme=%22%3E%3Cscript%3E'):
+        assert resolve_lang_and_theme()[1] == default_theme
+        assert 'script' not in get_canonical_url()
+
+    with app.test_request_context('/', headers={'Cookie': f'{THEME_COOKIE_NAME}=unknown'}):
+        assert resolve_lang_and_theme()[1] == default_theme
+
+    with app.test_request_context('/?theme=dark'):
+        assert resolve_lang_and_theme()[1] == 'dark'
+
+
+def test_unknown_theme_is_not_saved_to_cookie():
+    """設定にないテーマはクッキーに保存しない"""
+    client = app.test_client()
+    response = client.get('/result?semester=100&major1_id=1&major2_id=2&lang=en&theme=unknown')
+    assert response.mimetype == 'text/html'
+    set_cookie = response.headers.getlist('Set-Cookie')
+    assert any(cookie.startswith(LANG_COOKIE_NAME + '=en') for cookie in set_cookie)
+    assert not any(cookie.startswith(THEME_COOKIE_NAME + '=') for cookie in set_cookie)
+
+
+def test_preferences_apply_only_to_html_pages(catalog, monkeypatch):
+    """JSON API・ZIPのレスポンスにはクッキーを保存せず、Vary: Cookie, Accept-Language も付けない"""
+    from src.views import main
+
+    monkeypatch.setattr(main, 'get_major_combinations', lambda: [(SEMESTER, MajorEnum.IS, MajorEnum.NC)])
+    client = app.test_client()
+
+    response = client.get('/result?semester=100&major1_id=1&major2_id=2')
+    assert {'Cookie', 'Accept-Language'} <= set(response.vary)
+
+    url = f'/api/v1/timetable?semester={SEMESTER}&major1_id={MajorEnum.IS}&major2_id={MajorEnum.NC}'
+    response = client.get(url + '&lang=en&theme=dark')
+    not_modified = client.get(url, headers={'If-None-Match': response.headers['ETag']})
+    assert not_modified.status_code == 304
+    archive = client.get('/export-timetables.zip?lang=en')
+
+    for response in [response, not_modified, archive]:
+        assert 'Set-Cookie' not in response.headers
+        assert not response.vary
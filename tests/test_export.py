@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+時間割の一括出力（マニフェストによる差分出力）のテスト（一時ディレクトリに出力する）
+"""
+
+import pytest
+
+from conftest import SEMESTER
+from src.translations.field_values import MajorEnum
+from src.views import main
+
+COMBINATIONS = [(SEMESTER, MajorEnum.IS, MajorEnum.NC), (SEMESTER, MajorEnum.NC, MajorEnum.IS)]
+
+
+@pytest.fixture
+def output_dir(catalog, tmp_path, monkeypatch):
+    """出力先を一時ディレクトリにし、組み合わせを2件に絞る"""
+    monkeypatch.setattr(main, 'get_timetables_dir', lambda: tmp_path)
+    monkeypatch.setattr(main, 'get_major_combinations', lambda: list(COMBINATIONS))
+    return tmp_path
+
+
+@pytest.fixture
+def exported(monkeypatch):
+    """実際に出力した組み合わせを記録する"""
+    calls = []
+    export_timetable_combination = main.export_timetable_combination
+
+    def record(*combination):
+        calls.append(combination)
+        return export_timetable_combination(*combination)
+
+    monkeypatch.setattr(main, 'export_timetable_combination', record)
+    return calls
+
+
+def export():
+    return main.export_all_timetables(workers=1, progress=None)
+
+
+def test_unchanged_combinations_are_skipped(output_dir, exported):
+    """入力が変わっていない組み合わせは出力を省略し、ファイルがない組み合わせは出力し直す"""
+    files = export()
+    assert len(exported) == 2
+    assert sorted(path.name for path in output_dir.glob('*.md')) == sorted(
+        main.get_timetable_filename(*combination) for combination in COMBINATIONS
+    )
+    assert (output_dir / main.TIMETABLE_MANIFEST_FILENAME).exists()
+
+    exported.clear()
+    assert export() == files
+    assert exported == []
+
+    (output_dir / main.get_timetable_filename(*COMBINATIONS[0])).unlink()
+    export()
+    assert exported == [(*COMBINATIONS[0], 'ja')]
+
+
+def test_orphaned_files_are_deleted(output_dir, exported):
+    """どの組み合わせにも該当しなくなった時間割のファイルは削除し、それ以外のファイルは残す"""
+    orphan = output_dir / main.get_timetable_filename(8, MajorEnum.IS, MajorEnum.NC)
+    orphan.write_text('# old\n', encoding='utf-8')
+    other = output_dir / 'README.md'
+    other.write_text('# keep\n', encoding='utf-8')
+
+    export()
+    assert not orphan.exists()
+    assert other.exists()
+
+
+def test_template_version_change_forces_rewrite(output_dir, exported, monkeypatch):
+    """出力形式のバージョンが変わった場合は全ての組み合わせを出力し直す"""
+    export()
+    exported.clear()
+
+    monkeypatch.setattr(main, 'MARKDOWN_TEMPLATE_VERSION', main.MARKDOWN_TEMPLATE_VERSION + 1)
+    export()
+    assert len(exported) == 2
+
+
+def test_force_rewrites_everything(output_dir, exported):
+    """force=Trueの場合は変更の有無に関わらず全て出力する"""
+    export()
+    exported.clear()
+
+    main.export_all_timetables(workers=1, progress=None, force=True)
+    assert len(exported) == 2
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""
+一括出力ジョブのテスト（出力処理は一時ディレクトリにファイルを書く関数に置き換える）
+"""
+
+import io
+import threading
+import time
+import uuid
+import zipfile
+from datetime import datetime, timedelta
+
+import pytest
+
+from src import app
+from src import jobs
+from src.jobs import ExportJobManager, JOB_FAILED, JOB_RUNNING, JOB_SUCCEEDED, load_job, save_job
+
+
+@pytest.fixture
+def job_dir(tmp_path, monkeypatch):
+    monkeypatch.setitem(app.config, 'EXPORT_JOB_DIR', str(tmp_path / 'jobs'))
+    return tmp_path / 'jobs'
+
+
+@pytest.fixture
+def export(tmp_path, monkeypatch):
+    """export_all_timetables の代わりに2件のファイルを書き出す（release を待ってから終了する）"""
+    release = threading.Event()
+    release.set()
+
+    def fake_export_all_timetables(workers=None, progress=None):
+        release.wait(timeout=10)
+        paths = []
+        for index in range(2):
+            path = tmp_path / f"timetable_{index}.md"
+            path.write_text(f"# {index}\n", encoding='utf-8')
+            paths.append(str(path))
+            progress(index + 1, 2, (1, 1, 2, 'ja'), str(path))
+        return paths
+
+    monkeypatch.setattr('src.views.main.export_all_timetables', fake_export_all_timetables)
+    return release
+
+
+def use_manager(monkeypatch, **kwargs):
+    manager = ExportJobManager(**kwargs)
+    monkeypatch.setattr(jobs, '_job_manager', manager)
+    return manager
+
+
+def wait_for_job(client, job_id):
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        job = client.get(f'/export-jobs/{job_id}').get_json()
+        if job['status'] in [JOB_SUCCEEDED, JOB_FAILED]:
+            return job
+        time.sleep(0.01)
+    raise AssertionError('job did not finish')
+
+
+def make_finished_job(finished_at, status=JOB_SUCCEEDED):
+    job = {
+        'job_id': uuid.uuid4().hex,
+        'status': status,
+        'created_at': finished_at,
+        'started_at': finished_at,
+        'finished_at': finished_at,
+        'completed': 0,
+        'total': 0,
+        'files': [],
+        'error': None,
+        'owner': None,
+    }
+    save_job(job)
+    jobs.get_artifact_path(job['job_id']).write_bytes(b'')
+    return job['job_id']
+
+
+def test_job_succeeds_and_artifact_is_downloadable(job_dir, export, monkeypatch):
+    """登録すると202を返し、完了後は進捗と成果物（ZIP）を取得できる"""
+    use_manager(monkeypatch)
+    client = app.test_client()
+
+    response = client.post('/export-jobs')
+    assert response.status_code == 202
+    job_id = response.get_json()['job_id']
+    assert response.get_json()['status_url'] == f'/export-jobs/{job_id}'
+
+    job = wait_for_job(client, job_id)
+    assert job['status'] == JOB_SUCCEEDED
+    assert (job['completed'], job['total']) == (2, 2)
+    assert job['files'] == ['timetable_0.md', 'timetable_1.md']
+
+    response = client.get(f'/export-jobs/{job_id}/artifact')
+    assert response.status_code == 200
+    with zipfile.ZipFile(io.BytesIO(response.data)) as zf:
+        assert zf.testzip() is None
+        assert zf.namelist() == ['timetable_0.md', 'timetable_1.md']
+
+
+def test_pending_limit_returns_429(job_dir, export, monkeypatch):
+    """実行待ち・実行中のジョブが上限に達している場合は429を返す"""
+    use_manager(monkeypatch, max_pending=1)
+    client = app.test_client()
+    export.clear()
+
+    response = client.post('/export-jobs')
+    assert response.status_code == 202
+    job_id = response.get_json()['job_id']
+    # 実行中のジョブの成果物はまだ取得できない
+    assert client.get(f'/export-jobs/{job_id}/artifact').status_code == 409
+    assert client.post('/export-jobs').status_code == 429
+
+    export.set()
+    assert wait_for_job(client, job_id)['status'] == JOB_SUCCEEDED
+    response = client.post('/export-jobs')
+    assert response.status_code == 202
+    wait_for_job(client, response.get_json()['job_id'])
+
+
+def test_unknown_job_returns_404(job_dir, monkeypatch):
+    """存在しないジョブID・不正な形式のジョブIDは404を返す"""
+    use_manager(monkeypatch)
+    client = app.test_client()
+
+    for job_id in [uuid.uuid4().hex, 'not-a-job', '..%2F..%2Fapp']:
+        assert client.get(f'/export-jobs/{job_id}').status_code == 404
+        assert client.get(f'/export-jobs/{job_id}/artifact').status_code == 404
+
+
+def test_interrupted_jobs_are_marked_failed(job_dir, export, monkeypatch):
+    """実行者のプロセスが終了したジョブは失敗として記録し、実行者が生存しているジョブは変更しない"""
+    orphaned = {
+        'job_id': uuid.uuid4().hex, 'status': JOB_RUNNING, 'created_at': jobs.now(),
+        'started_at': jobs.now(), 'finished_at': None, 'completed': 0, 'total': None,
+        'files': [], 'error': None,
+        'owner': {'pid': 2 ** 22 + 1, 'boot_id': jobs.get_boot_id(), 'started': None},
+    }
+    alive = dict(orphaned, job_id=uuid.uuid4().hex, owner=jobs.get_current_owner())
+    save_job(orphaned)
+    save_job(alive)
+
+    manager = use_manager(monkeypatch)
+    wait_for_job(app.test_client(), manager.submit()['job_id'])
+
+    assert load_job(orphaned['job_id'])['status'] == JOB_FAILED
+    assert load_job(orphaned['job_id'])['error'] == 'interrupted'
+    assert load_job(alive['job_id'])['status'] == JOB_RUNNING
+
+
+def test_finished_jobs_are_purged_on_submit(job_dir, export, monkeypatch):
+    """完了したジョブのうち、保持期間を過ぎたものと保持数を超えた古いものは登録時に削除する"""
+    manager = use_manager(monkeypatch, max_finished=2, max_age=60 * 60)
+    current = datetime.now()
+
+    expired = make_finished_job((current - timedelta(hours=2)).isoformat(timespec='seconds'))
+    oldest = make_finished_job((current - timedelta(minutes=3)).isoformat(timespec='seconds'), status=JOB_FAILED)
+    kept = [
+        make_finished_job((current - timedelta(minutes=minutes)).isoformat(timespec='seconds'))
+        for minutes in [2, 1]
+    ]
+
+    job_id = manager.submit()['job_id']
+    wait_for_job(app.test_client(), job_id)
+
+    for removed in [expired, oldest]:
+        assert load_job(removed) is None
+        assert not jobs.get_artifact_path(removed).exists()
+    for job_id in kept + [job_id]:
+        assert load_job(job_id) is not None
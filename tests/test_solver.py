@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""
+重複の自動解決（分枝限定法・極大な組み合わせの列挙）のテスト
+
+小さなランダムグラフで全ての組み合わせを調べた結果と比較する。
+"""
+
+import random
+from itertools import islice
+
+import pytest
+
+from src.solver import (
+    calculate_weights,
+    iter_maximal_independent_sets,
+    max_weight_independent_set,
+    resolve_conflicts,
+    validate_objective,
+)
+from src.translations.field_values import CourseCategoryEnum, OfferingCategoryEnum
+
+
+def random_graph(rng, size, density):
+    """ランダムな重複グラフ（各科目と重複する科目のビットマスクのリスト）と重みを作成する"""
+    neighbors = [0] * size
+    for index1 in range(size):
+        for index2 in range(index1 + 1, size):
+            if rng.random() < density:
+                neighbors[index1] |= 1 << index2
+                neighbors[index2] |= 1 << index1
+    weights = [rng.randint(1, 10) for _ in range(size)]
+    return weights, neighbors
+
+
+def is_independent(neighbors, mask):
+    return all(not (neighbors[index] & mask) for index in range(len(neighbors)) if mask >> index & 1)
+
+
+def is_maximal(neighbors, mask):
+    return all(
+        mask >> index & 1 or neighbors[index] & mask
+        for index in range(len(neighbors))
+    )
+
+
+def mask_weight(weights, mask):
+    return sum(weight for index, weight in enumerate(weights) if mask >> index & 1)
+
+
+def brute_force_maximal_sets(weights, neighbors):
+    """全ての極大な組み合わせ (重みの合計, ビットマスク) を列挙する"""
+    return [
+        (mask_weight(weights, mask), mask)
+        for mask in range(1 << len(neighbors))
+        if is_independent(neighbors, mask) and is_maximal(neighbors, mask)
+    ]
+
+
+@pytest.mark.parametrize('seed', range(30))
+def test_max_weight_independent_set_is_optimal(seed):
+    """分枝限定法の結果は重複がなく、重みの合計が全探索の最大値と一致する"""
+    rng = random.Random(seed)
+    weights, neighbors = random_graph(rng, rng.randint(1, 12), rng.choice([0.2, 0.4, 0.7]))
+
+    selected = max_weight_independent_set(weights, neighbors, (1 << len(neighbors)) - 1)
+
+    assert is_independent(neighbors, selected)
+    assert mask_weight(weights, selected) == max(weight for weight, _ in brute_force_maximal_sets(weights, neighbors))
+
+
+@pytest.mark.parametrize('seed', range(30))
+def test_iter_maximal_independent_sets_enumerates_all_in_order(seed):
+    """極大な組み合わせを重みの合計の大きい順に、重複なく全て列挙する"""
+    rng = random.Random(seed)
+    weights, neighbors = random_graph(rng, rng.randint(1, 10), rng.choice([0.2, 0.4, 0.7]))
+
+    enumerated = list(iter_maximal_independent_sets(weights, neighbors))
+    totals = [weight for weight, _ in enumerated]
+
+    assert totals == sorted(totals, reverse=True)
+    assert all(weight == mask_weight(weights, mask) for weight, mask in enumerated)
+    assert sorted(enumerated) == sorted(brute_force_maximal_sets(weights, neighbors))
+
+
+def test_iter_maximal_independent_sets_is_lazy():
+    """全て列挙できない大きさでも、先頭から必要な分だけ取り出せる（先頭は最大の組み合わせ）"""
+    rng = random.Random(0)
+    weights, neighbors = random_graph(rng, 40, 0.1)
+    optimal = max_weight_independent_set(weights, neighbors, (1 << len(neighbors)) - 1)
+
+    top = list(islice(iter_maximal_independent_sets(weights, neighbors), 5))
+    assert top[0][0] == mask_weight(weights, optimal)
+    assert len({mask for _, mask in top}) == 5
+    assert all(is_independent(neighbors, mask) and is_maximal(neighbors, mask) for _, mask in top)
+
+
+def test_calculate_weights_prioritizes_objective_order():
+    """上位の評価項目の差は、下位の評価項目の合計よりも優先される"""
+    items = [
+        {'credits': 1, 'course_category_id': CourseCategoryEnum.REQUIRED, 'major_type': 'others'},
+        {'credits': 4, 'course_category_id': CourseCategoryEnum.ELECTIVE, 'major_type': 'major1'},
+        {'credits': 4, 'course_category_id': CourseCategoryEnum.ELECTIVE, 'major_type': 'major1'},
+    ]
+    weights = calculate_weights(items, ('required', 'credits', 'major1'))
+    assert weights[0] > weights[1] + weights[2]
+
+    weights = calculate_weights(items, ('credits', 'required', 'major1'))
+    assert weights[0] < weights[1]
+
+
+def make_course(code, credits, course_category_id=CourseCategoryEnum.ELECTIVE):
+    return {
+        'timetable_code': code,
+        'credits': credits,
+        'course_category_id': course_category_id,
+        'major_type': 'major1',
+        'offering_category_id': OfferingCategoryEnum.FIRST_SEMESTER,
+    }
+
+
+def test_resolve_conflicts_keeps_required_course():
+    """必修の単位を優先して科目を残し、目的関数を変えると単位数を優先する"""
+    required = make_course('R', 1, CourseCategoryEnum.REQUIRED)
+    elective1 = make_course('E1', 4)
+    elective2 = make_course('E2', 2)
+    conflicts = [
+        {'day_id': 1, 'period': 1, 'courses': [required, elective1]},
+        {'day_id': 1, 'period': 2, 'courses': [elective1, elective2]},
+    ]
+    assert resolve_conflicts(conflicts) == {'E1'}
+    assert resolve_conflicts(conflicts, ('credits',)) == {'R', 'E2'}
+
+
+def test_resolve_conflicts_ignores_different_quarters():
+    """同じ曜日・時限でもクォーターが重ならない科目は重複として扱わない"""
+    first = dict(make_course('Q1', 1), offering_category_id=OfferingCategoryEnum.FIRST_QUARTER)
+    second = dict(make_course('Q2', 1), offering_category_id=OfferingCategoryEnum.SECOND_QUARTER)
+    assert resolve_conflicts([{'day_id': 1, 'period': 1, 'courses': [first, second]}]) == set()
+
+
+def test_validate_objective_rejects_unknown_names():
+    """未知の評価項目名はValueErrorになる"""
+    validate_objective(('required', 'credits', 'major1'))
+    with pytest.raises(ValueError, match='credit'):
+        validate_objective(('required', 'credit'))
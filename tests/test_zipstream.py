@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""
+ZIPのストリーミング生成のテスト
+"""
+
+import io
+import json
+import zipfile
+
+from conftest import SEMESTER
+from src import app
+from src.translations.field_values import MajorEnum
+from src.views import main
+from src.zipstream import iter_zip_stream
+
+
+def test_streamed_archive_is_valid_zip():
+    """エントリごとに断片を返し、連結すると全エントリを含む正しいZIPになる"""
+    entries = [
+        ('a.md', '# 時間割\n'),
+        ('b.bin', bytes(range(256)) * 100),
+        ('empty.txt', ''),
+    ]
+    chunks = list(iter_zip_stream(entries))
+    assert len(chunks) > len(entries)
+
+    with zipfile.ZipFile(io.BytesIO(b''.join(chunks))) as zf:
+        assert zf.testzip() is None
+        assert zf.namelist() == ['a.md', 'b.bin', 'empty.txt']
+        assert zf.read('a.md').decode('utf-8') == '# 時間割\n'
+        assert zf.read('b.bin') == bytes(range(256)) * 100
+        assert zf.read('empty.txt') == b''
+
+
+def test_export_zip_route_streams_all_timetables(catalog, monkeypatch):
+    """/export-timetables.zip は全ての組み合わせの時間割（json=1 の場合はJSONも）を含む"""
+    combinations = [(SEMESTER, MajorEnum.IS, MajorEnum.NC), (SEMESTER, MajorEnum.NC, MajorEnum.IS)]
+    monkeypatch.setattr(main, 'get_major_combinations', lambda: list(combinations))
+    client = app.test_client()
+
+    response = client.get('/export-timetables.zip?json=1')
+    assert response.status_code == 200
+    assert response.mimetype == 'application/zip'
+    assert response.is_streamed
+
+    with zipfile.ZipFile(io.BytesIO(response.data)) as zf:
+        assert zf.testzip() is None
+        markdown_names = [main.get_timetable_filename(*combination) for combination in combinations]
+        assert zf.namelist() == [
+            name for markdown_name in markdown_names
+            for name in [markdown_name, markdown_name[:-len('.md')] + '.json']
+        ]
+        assert '科目A001' in zf.read(markdown_names[0]).decode('utf-8')
+        export_data = json.loads(zf.read(markdown_names[1][:-len('.md')] + '.json'))
+        assert (export_data['semester'], export_data['major1_id'], export_data['major2_id']) == combinations[1]
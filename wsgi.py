@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+"""
+本番用のWSGIエントリーポイント（gunicorn）
+Production WSGI Entry Point
+
+gunicornのマスタープロセスで読み込む（preload_app）。フォーク前に
+読み取り専用の科目カタログと時間割結果のキャッシュを構築し、gc.freeze() で
+GCの対象外にすることで、コピーオンライトのページをワーカー間で共有したままにする。
+
+使い方:
+    gunicorn -c gunicorn.conf.py
+"""
+
+import gc
+
+from src import app
+
+
+def warm_app():
+    """
+    フォーク前に科目カタログと時間割結果のキャッシュを構築し、GCの対象外にする
+
+    Returns:
+        int: キャッシュした組み合わせの数
+    """
+    from src.views.main import warm_result_cache
+
+    count = warm_result_cache()
+
+    # 起動時に作成したオブジェクトを永続世代に移し、ワーカーでのGCによるページの複製を防ぐ
+    gc.collect()
+    gc.freeze()
+    return count
+
+
+warm_app()